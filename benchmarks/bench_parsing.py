@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'analyse HTML des scrapers PONS et Glosbe.
+
+Compare, sur les pages enregistrées dans benchmarks/fixtures/, l'analyse
+d'origine (arbre complet, html.parser) et l'analyse actuelle (filtre des
+seules balises utiles, analyseur HTML_PARSER), et vérifie que les deux
+donnent le même résultat.
+
+  python benchmarks/bench_parsing.py [-n 50]
+  python benchmarks/bench_parsing.py --enregistrer Haus   # rafraîchir les pages (réseau)
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import traducteur  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+PAGES = {
+    'pons': (traducteur.parse_pons_html, "https://en.pons.com/translate/german-french/{word}"),
+    'glosbe': (traducteur.parse_glosbe_html, "https://glosbe.com/de/fr/{word}"),
+}
+
+
+def fixture_path(source, word):
+    return FIXTURES / f"{source}_{word.lower()}_de_fr.html"
+
+
+def save_fixtures(word):
+    http = traducteur.get_http_client()
+    for source, (_, url) in PAGES.items():
+        r = http.get(url.format(word=traducteur.requests.utils.quote(word)))
+        r.raise_for_status()
+        if source == 'pons':
+            r.encoding = r.apparent_encoding or 'utf-8'
+        fixture_path(source, word).write_text(r.text, encoding='utf-8')
+        print(f"  {source}: {len(r.text)} caractères enregistrés")
+
+
+def timed(func, html, runs, **kwargs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(html, **kwargs)
+        durations.append(time.perf_counter() - start)
+    return result, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--runs', type=int, default=30)
+    parser.add_argument('--mot', default='Haus')
+    parser.add_argument('--enregistrer', metavar='MOT', help="télécharger les pages de ce mot")
+    args = parser.parse_args()
+
+    if args.enregistrer:
+        save_fixtures(args.enregistrer)
+        return 0
+
+    print(f"Analyseur actuel : {traducteur.HTML_PARSER}  ({args.runs} passes)\n")
+    print(f"{'page':<8} {'ko':>6} {'origine (ms)':>14} {'actuel (ms)':>13} {'gain':>7}  identique")
+    failed = False
+    for source, (parse, _) in PAGES.items():
+        path = fixture_path(source, args.mot)
+        html = path.read_text(encoding='utf-8')
+        baseline, base_times = timed(parse, html, args.runs, parser='html.parser', strain=False)
+        current, cur_times = timed(parse, html, args.runs)
+        base_ms = statistics.median(base_times) * 1000
+        cur_ms = statistics.median(cur_times) * 1000
+        same = baseline == current
+        failed |= not same
+        print(f"{source:<8} {len(html) / 1024:>6.0f} {base_ms:>14.2f} {cur_ms:>13.2f} "
+              f"{base_ms / cur_ms:>6.1f}×  {'oui' if same else 'NON'}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
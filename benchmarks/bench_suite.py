@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite de benchmarks hors ligne de Traducteur Pro.
+
+Les sources (Google, Linguee, PONS, Glosbe) reçoivent un transport HTTP
+injecté qui rejoue les réponses enregistrées dans benchmarks/fixtures/,
+avec une latence réseau simulée optionnelle. Les historiques sont générés
+(1k, 10k, 100k entrées par défaut) dans une base temporaire.
+
+Mesures : traduire_mot (cache froid / chaud), traduire_phrase, analyse des
+scrapers, detect_language, dictionnaire hors ligne, recherche dans
+l'historique, sélection des mots à réviser. Pour chacune : percentiles de latence et débit.
+
+  python benchmarks/bench_suite.py                       # tout mesurer
+  python benchmarks/bench_suite.py --tailles 1000,10000 --latence-ms 40
+  python benchmarks/bench_suite.py --enregistrer-reference   # écrit baseline.json
+  python benchmarks/bench_suite.py --comparer                # échoue si régression
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import traducteur  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES = BENCH_DIR / "fixtures"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+
+# Une mesure est une régression si son p50 dépasse la référence de plus de 25 %
+REGRESSION_TOLERANCE = 0.25
+
+# Le transport rejoué ne doit pas être freiné par les limiteurs de débit
+NO_LIMITS = {name: {'rate': 1e6, 'burst': 1e6} for name in traducteur.SOURCE_LIMITS}
+
+
+# ─────────────────────────────────────────────────────────────
+# Transport HTTP rejouant les pages enregistrées
+# ─────────────────────────────────────────────────────────────
+
+class FixtureResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.content = text.encode('utf-8')
+        self.encoding = 'utf-8'
+        self.apparent_encoding = 'utf-8'
+        self.headers = {'Content-Length': str(len(self.content))}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FixtureTransport:
+    """Remplace HttpClient : même méthode get(), réponses lues sur disque."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = 0
+        self._pages = {
+            'pons': (FIXTURES / "pons_haus_de_fr.html").read_text(encoding='utf-8'),
+            'glosbe': (FIXTURES / "glosbe_haus_de_fr.html").read_text(encoding='utf-8'),
+            'linguee': (FIXTURES / "linguee_haus_de_fr.html").read_text(encoding='utf-8'),
+        }
+        self._google = json.loads((FIXTURES / "google_de_fr.json").read_text(encoding='utf-8'))
+
+    def _google_page(self, text):
+        lines = [self._google.get(line, line[::-1]) for line in text.split('\n')]
+        return f'<html><body><div class="result-container">{chr(10).join(lines)}</div></body></html>'
+
+    def get(self, url, params=None, **kwargs):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        host = urlparse(url).netloc
+        if 'translate.google' in host:
+            return FixtureResponse(self._google_page((params or {}).get('q', '')))
+        for name, page in self._pages.items():
+            if name in host:
+                return FixtureResponse(page)
+        return FixtureResponse('', 404)
+
+
+# ─────────────────────────────────────────────────────────────
+# Mesure
+# ─────────────────────────────────────────────────────────────
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def measure(name, func, runs, setup=None):
+    """Exécute `func` `runs` fois (après `setup` éventuel) ; retourne les statistiques en ms."""
+    durations = []
+    for i in range(runs):
+        arg = setup(i) if setup else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(arg) if setup else func()
+            durations.append(time.perf_counter() - start)
+    durations.sort()
+    total = sum(durations)
+    stats = {
+        'runs': runs,
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p90_ms': percentile(durations, 90) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+        'mean_ms': statistics.fmean(durations) * 1000,
+        'ops_per_s': runs / total if total else 0.0,
+    }
+    print(f"  {name:<38} p50 {stats['p50_ms']:>9.3f} ms   p90 {stats['p90_ms']:>9.3f} ms   "
+          f"p99 {stats['p99_ms']:>9.3f} ms   {stats['ops_per_s']:>9.1f} op/s")
+    return stats
+
+
+# ─────────────────────────────────────────────────────────────
+# Données synthétiques
+# ─────────────────────────────────────────────────────────────
+
+SYLLABLES = ['ge', 'hen', 'ber', 'ma', 'son', 'lau', 'fen', 'stra', 'tion', 'ré', 'chat', 'kat',
+             'ze', 'hau', 'un', 'ter', 'wohn', 'bau', 'mé', 'lo', 'ri', 'ca', 'vé', 'ü', 'ö', 'ß']
+
+
+def synthetic_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def synthetic_history(n, seed=0):
+    """Génère `n` entrées d'historique réalistes (sens, exemples, scores, échéances)."""
+    rng = random.Random(seed)
+    now = int(time.time())
+    seen = set()
+    for i in range(n):
+        word = synthetic_word(rng)
+        while word in seen:
+            word += rng.choice(SYLLABLES)
+        seen.add(word)
+        src, tgt = ('de', 'fr') if i % 3 else ('fr', 'de')
+        result = {
+            'main_translation': synthetic_word(rng),
+            'all_translations': [synthetic_word(rng) for _ in range(rng.randint(1, 5))],
+            'senses': [{'meaning': synthetic_word(rng), 'translation': synthetic_word(rng)}
+                       for _ in range(rng.randint(0, 3))],
+            'examples': [{'original': ' '.join(synthetic_word(rng) for _ in range(8)),
+                          'translation': ' '.join(synthetic_word(rng) for _ in range(8))}
+                         for _ in range(rng.randint(0, 4))],
+            'src': src,
+            'tgt': tgt,
+        }
+        entry = traducteur.make_history_entry(word, result)
+        entry['lookup_count'] = rng.randint(1, 30)
+        entry['revision_score'] = rng.randint(0, 5)
+        entry['next_revision'] = now + rng.randint(-30, 30) * traducteur.DAY
+        yield entry
+
+
+SENTENCES = [
+    "Der Hund und die Katze schlafen im Haus.",
+    "Das alte Haus steht am Ende der Straße.",
+    "Le chien et le chat dorment dans la maison.",
+    "Nous avons mangé une très bonne tarte aux pommes.",
+    "Ich habe heute keine Zeit für einen langen Spaziergang.",
+    "Elle est partie sans dire au revoir à personne.",
+    "Kannst du mir bitte das Salz geben?",
+    "Maison",
+]
+
+
+# ─────────────────────────────────────────────────────────────
+# Scénarios
+# ─────────────────────────────────────────────────────────────
+
+def bench_engine(results, runs, latency):
+    print(f"\n▶ Moteur (transport rejoué, latence simulée {latency * 1000:.0f} ms)")
+    transport = FixtureTransport(latency)
+
+    def fresh_engine(_):
+        return traducteur.TraducteurPro(cache=traducteur.LookupCache(path=':memory:'), http=transport,
+                                        limits=NO_LIMITS, dictionaries={})
+
+    results['traduire_mot.cold'] = measure(
+        "traduire_mot (cache vide)", lambda engine: engine.traduire_mot('Haus', 'de', 'fr'),
+        runs, setup=fresh_engine)
+
+    results['traduire_mot.quick'] = measure(
+        "traduire_mot (palier principal seul)",
+        lambda engine: engine.traduire_mot('Haus', 'de', 'fr', sections=()), runs, setup=fresh_engine)
+
+    results['traduire_mot_flux.principal'] = measure(
+        "traduire_mot_flux (1re étape)",
+        lambda engine: next(engine.traduire_mot_flux('Haus', 'de', 'fr')), runs, setup=fresh_engine)
+
+    warm = fresh_engine(None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        warm.traduire_mot('Haus', 'de', 'fr')
+    results['traduire_mot.warm'] = measure(
+        "traduire_mot (cache chaud)", lambda: warm.traduire_mot('Haus', 'de', 'fr'), runs * 10)
+
+    results['traduire_phrase.cold'] = measure(
+        "traduire_phrase (cache vide)",
+        lambda engine: engine.traduire_phrase(SENTENCES[0], 'de', 'fr'), runs, setup=fresh_engine)
+
+
+def bench_scrapers(results, runs):
+    print("\n▶ Analyse HTML des scrapers")
+    pages = {name: (FIXTURES / f"{name}_haus_de_fr.html").read_text(encoding='utf-8')
+             for name in ('pons', 'glosbe', 'linguee')}
+    results['parse.pons'] = measure("parse_pons_html", lambda: traducteur.parse_pons_html(pages['pons']), runs)
+    results['parse.glosbe'] = measure(
+        "parse_glosbe_html", lambda: traducteur.parse_glosbe_html(pages['glosbe']), runs)
+    results['parse.linguee.html'] = measure(
+        "parse_linguee_html", lambda: traducteur.parse_linguee_html(pages['linguee']), runs)
+    transport = FixtureTransport()
+    linguee = traducteur.LingueeSource(
+        http=transport, guard=traducteur.SourceGuard('linguee', **NO_LIMITS['linguee']))
+    results['parse.linguee'] = measure(
+        "LingueeSource.get_translations", lambda: linguee.get_translations('Haus', 'de', 'fr'), runs)
+
+
+def bench_detection(results, runs):
+    print("\n▶ Détection de langue")
+    batch = SENTENCES * 125
+    results['detect_language'] = measure(
+        f"detect_language ×{len(batch)}", lambda: [traducteur.detect_language(s) for s in batch], runs)
+    results['detect_languages'] = measure(
+        f"detect_languages (lot de {len(batch)})", lambda: traducteur.detect_languages(batch), runs)
+
+
+def bench_dictionary(results, runs, size=100_000):
+    print(f"\n▶ Dictionnaire hors ligne : {size} entrées")
+    rng = random.Random(2)
+    words = list(dict.fromkeys(synthetic_word(rng) for _ in range(size)))
+    entries = [(w, '', [synthetic_word(rng), synthetic_word(rng)]) for w in words]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.idx"
+        start = time.perf_counter()
+        traducteur.OfflineDictionary.build(entries, path)
+        results['dictionary.build'] = {'runs': 1, 'p50_ms': (time.perf_counter() - start) * 1000}
+        print(f"  {'construction de l index':<38} {results['dictionary.build']['p50_ms']:>13.1f} ms")
+        dictionary = traducteur.OfflineDictionary(path)
+        try:
+            results['dictionary.lookup'] = measure(
+                "lookup", lambda w: dictionary.lookup(w), runs * 100, setup=lambda i: rng.choice(words))
+            results['dictionary.prefix'] = measure(
+                "prefix (10 mots)", lambda w: dictionary.prefix(w[:3], 10), runs * 10,
+                setup=lambda i: rng.choice(words))
+        finally:
+            dictionary.close()
+
+
+def bench_history(results, sizes, runs):
+    rng = random.Random(1)
+    for size in sizes:
+        print(f"\n▶ Historique synthétique : {size} entrées")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = traducteur.HistoryStore(path=Path(tmp) / "bench.db", legacy_json=None, legacy_stats=None)
+            start = time.perf_counter()
+            store.upsert_many(synthetic_history(size, seed=size))
+            print(f"  (création de la base : {time.perf_counter() - start:.2f} s)")
+
+            start = time.perf_counter()
+            index = traducteur.SearchIndex.build(store.iter_rows())
+            results[f'search.build.{size}'] = {'runs': 1, 'p50_ms': (time.perf_counter() - start) * 1000}
+            print(f"  {'construction de l index':<38} {results[f'search.build.{size}']['p50_ms']:>13.1f} ms")
+
+            words = [e['word'] for e in store.weakest(150)]
+            for kind, label, queries in (
+                    ('exact', "recherche exacte", words[:50]),
+                    ('prefix', "recherche par préfixe (3 lettres)", [w[:3] for w in words[50:100]]),
+                    ('fuzzy', "recherche approximative (1 faute)",
+                     [traducteur.fold(w)[:-1] + 'x' for w in words[100:150]])):
+                results[f'search.{kind}.{size}'] = measure(
+                    label, lambda q: index.search(q), runs * 10,
+                    setup=lambda i, queries=queries: queries[i % len(queries)])
+
+            now = int(time.time())
+            results[f'revision.select.{size}'] = measure(
+                "sélection des 15 mots à réviser", lambda: store.due(now, 15) or store.weakest(10), runs * 10)
+
+            entries = list(synthetic_history(50, seed=rng.randint(0, 10 ** 6)))
+            saved = traducteur._history_stores.get(None)
+            traducteur._history_stores[None] = store
+            try:
+                results[f'history.add.{size}'] = measure(
+                    "add_to_history", lambda e: traducteur.add_to_history(
+                        e['word'], {'src': e['src_lang'], 'tgt': e['tgt_lang']}),
+                    len(entries), setup=lambda i: entries[i])
+            finally:
+                traducteur._history_stores[None] = saved
+
+
+# ─────────────────────────────────────────────────────────────
+# Référence et comparaison
+# ─────────────────────────────────────────────────────────────
+
+def compare(results, baseline):
+    regressions = []
+    print(f"\n▶ Comparaison avec {BASELINE_FILE.name} (tolérance {REGRESSION_TOLERANCE:.0%})")
+    for name, stats in results.items():
+        ref = baseline.get('results', {}).get(name)
+        if not ref or not ref.get('p50_ms'):
+            continue
+        ratio = stats['p50_ms'] / ref['p50_ms']
+        flag = "RÉGRESSION" if ratio > 1 + REGRESSION_TOLERANCE else ""
+        print(f"  {name:<30} {ref['p50_ms']:>10.3f} → {stats['p50_ms']:>10.3f} ms  ({ratio:>5.2f}×) {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne de Traducteur Pro")
+    parser.add_argument('-n', '--runs', type=int, default=20)
+    parser.add_argument('--tailles', default='1000,10000,100000',
+                        help="tailles d'historique synthétique, séparées par des virgules")
+    parser.add_argument('--latence-ms', type=float, default=0.0,
+                        help="latence réseau simulée par requête rejouée")
+    parser.add_argument('--sortie', type=Path, help="écrire les résultats JSON dans ce fichier")
+    parser.add_argument('--enregistrer-reference', action='store_true',
+                        help=f"enregistrer les résultats comme référence ({BASELINE_FILE.name})")
+    parser.add_argument('--comparer', action='store_true',
+                        help="comparer à la référence et échouer en cas de régression")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in re.split(r'[,\s]+', args.tailles) if s]
+    results = {}
+    bench_engine(results, args.runs, args.latence_ms / 1000)
+    bench_scrapers(results, args.runs)
+    bench_detection(results, args.runs)
+    bench_dictionary(results, args.runs)
+    bench_history(results, sizes, args.runs)
+
+    report = {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'html_parser': traducteur.HTML_PARSER,
+        'results': results,
+    }
+    if args.sortie:
+        args.sortie.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.enregistrer_reference:
+        BASELINE_FILE.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nRéférence enregistrée : {BASELINE_FILE}")
+    if args.comparer:
+        if not BASELINE_FILE.exists():
+            print(f"\nAucune référence ({BASELINE_FILE.name}) : lancer avec --enregistrer-reference.")
+            return 2
+        regressions = compare(results, json.loads(BASELINE_FILE.read_text(encoding='utf-8')))
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) : {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
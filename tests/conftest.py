@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import traducteur  # noqa: E402
+from bench_suite import NO_LIMITS, FixtureTransport  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Historique vide, sans import des anciens fichiers JSON."""
+    return traducteur.HistoryStore(tmp_path / "historique.db", legacy_json=None, legacy_stats=None)
+
+
+@pytest.fixture
+def default_store(store, monkeypatch):
+    """`store` installé comme historique par défaut (get_history_store())."""
+    monkeypatch.setitem(traducteur._history_stores, None, store)
+    return store
+
+
+@pytest.fixture
+def engine():
+    """Moteur hors ligne : réponses des sources rejouées depuis benchmarks/fixtures."""
+    return traducteur.TraducteurPro(cache=traducteur.LookupCache(path=':memory:'), http=FixtureTransport(),
+                                    limits=NO_LIMITS, dictionaries={}, verbose=False)
+
+
+def history_entry(word, src='de', tgt='fr', **fields):
+    """Entrée d'historique minimale pour `word`."""
+    entry = traducteur.make_history_entry(word, {
+        'main_translation': f"{word.lower()}-fr",
+        'all_translations': [f"{word.lower()}-fr"],
+        'src': src,
+        'tgt': tgt,
+    })
+    entry.update(fields)
+    return entry
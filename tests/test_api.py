@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import history_entry
+from traducteur import SERVER_MAX_BODY, SERVER_MAX_LIMIT, APIServer
+
+
+def http(server, raw):
+    """Envoie une requête brute à `server` ; retourne (statut, en-têtes, corps)."""
+    async def exchange():
+        server._semaphore = asyncio.Semaphore(server.max_concurrent)
+        listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw.encode('latin-1'))
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return response
+
+    head, _, body = asyncio.run(exchange()).partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def get(server, target):
+    return http(server, f"GET {target} HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+
+@pytest.fixture
+def server(engine, default_store):
+    return APIServer(traducteur=engine, max_concurrent=2)
+
+
+@pytest.mark.parametrize('value', ['abc', '0', '-3', '2.5'])
+def test_invalid_limit_is_a_bad_request(server, value):
+    for route in ('/api/recherche?q=haus&', '/api/revision?'):
+        status, _, body = get(server, f"{route}limite={value}")
+        assert status == 400
+        assert 'limite' in json.loads(body)['error']
+
+
+def test_limit_is_clamped(server, default_store):
+    default_store.upsert_many(history_entry(f"Wort{i}", next_revision=0) for i in range(SERVER_MAX_LIMIT + 5))
+    status, _, body = get(server, f"/api/revision?limite={10 * SERVER_MAX_LIMIT}")
+    assert status == 200
+    assert len(json.loads(body)['cards']) == SERVER_MAX_LIMIT
+
+
+def post(server, target, payload):
+    body = json.dumps(payload).encode()
+    return http(server, f"POST {target} HTTP/1.1\r\nConnection: close\r\n"
+                        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                        + body.decode('latin-1'))
+
+
+def test_stale_review_is_a_conflict(server, default_store):
+    default_store.upsert(history_entry('Haus'))
+    version = default_store.get('Haus', 'de')['version']
+    answer = {'word': 'Haus', 'src': 'de', 'answer': 'haus-fr', 'version': version}
+
+    status, _, body = post(server, '/api/revision', answer)
+    assert status == 200
+    assert json.loads(body)['entry']['version'] == version + 1
+
+    status, _, body = post(server, '/api/revision', answer)
+    assert status == 409
+    assert default_store.get('Haus', 'de')['times_correct'] == 1
+
+
+def sse_events(body):
+    """Décode un corps chunked de Server-Sent Events en [(événement, données)]."""
+    data = b''
+    while True:
+        size, _, body = body.partition(b'\r\n')
+        size = int(size, 16)
+        if size == 0:
+            break
+        data, body = data + body[:size], body[size + 2:]
+    events = []
+    for block in data.decode('utf-8').split('\n\n'):
+        if block:
+            name, payload = block.split('\n')
+            events.append((name[len('event: '):], json.loads(payload[len('data: '):])))
+    return events
+
+
+def test_word_stream_event_order(server):
+    status, headers, body = get(server, '/api/mot/flux?q=Haus&src=de&tgt=fr')
+    assert status == 200
+    assert headers['Content-Type'].startswith('text/event-stream')
+    assert headers['Transfer-Encoding'] == 'chunked'
+
+    events = sse_events(body)
+    names = [name for name, _ in events]
+    assert names[0] == 'principal'
+    assert names[-1] == 'fin'
+    assert sorted(names[1:names.index('synonymes')]) == ['glosbe', 'linguee', 'pons']
+    assert names.index('synonymes') == len(names) - 2
+    assert events[0][1]['word'] == 'Haus'
+    final = events[-1][1]
+    assert final['main_translation'] == events[0][1]['main_translation']
+    for name, payload in events[1:-1]:
+        for section, value in payload.items():
+            assert section in final
+
+
+def test_word_stream_needs_a_word(server):
+    status, headers, body = get(server, '/api/mot/flux?src=de')
+    assert status == 400
+    assert 'Transfer-Encoding' not in headers
+
+
+@pytest.mark.parametrize('length', ['abc', '-1', '+5', '1_0', '2.0', '²'])
+def test_invalid_content_length_is_a_bad_request(server, length):
+    status, _, body = http(server, f"POST /api/langue HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}")
+    assert status == 400
+    assert 'Content-Length' in json.loads(body)['error']
+
+
+def test_oversized_body_is_refused(server):
+    status, _, _ = http(server, f"POST /api/langue HTTP/1.1\r\nContent-Length: {SERVER_MAX_BODY + 1}\r\n\r\n")
+    assert status == 413
@@ -0,0 +1,34 @@
+import re
+
+from traducteur import display_word_progressive
+
+ANSI = re.compile(r'\x1b\[[0-9;]*m')
+
+
+def steps(result):
+    result.update(main_translation='maison', all_translations=['maison'])
+    yield 'principal', ('main_translation', 'all_translations'), result
+    result['senses'] = [{'meaning': 'Gebäude', 'translation': 'maison'}]
+    yield 'pons', ('senses', 'phrases'), result
+    # Glosbe fusionne une traduction de plus dans la liste déjà affichée
+    result['all_translations'] = ['maison', 'foyer']
+    yield 'glosbe', ('all_translations', 'definitions', 'examples'), result
+    result['all_translations'] = ['maison', 'foyer', 'domicile']
+    result['synonyms_tgt'] = ['foyer', 'domicile']
+    yield 'fin', (), result
+
+
+def word_result():
+    return {'word': 'Haus', 'lemma': 'Haus', 'main_translation': '?', 'all_translations': [],
+            'senses': [], 'phrases': [], 'definitions': [], 'examples': [], 'synonyms_src': [],
+            'synonyms_tgt': [], 'timed_out': [], 'unavailable': [], 'offline': False,
+            'src': 'de', 'tgt': 'fr'}
+
+
+def test_later_translations_are_printed(capsys):
+    display_word_progressive(steps(word_result()))
+    out = ANSI.sub('', capsys.readouterr().out)
+    listing = [line.split()[1] for line in out.splitlines()
+               if line.strip().startswith(('●', '○'))]
+    assert listing == ['maison', 'foyer', 'domicile']
+    assert out.index('Significations') < out.index('foyer')
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+import traducteur
+from traducteur import translate_document
+
+LINES = [f"Satz Nummer {i}." for i in range(12)]
+
+
+@pytest.fixture
+def interrupted(engine, tmp_path, monkeypatch):
+    """Traduction de `source` arrêtée après quelques morceaux, point de reprise écrit."""
+    monkeypatch.setattr(traducteur, 'CHECKPOINT_EVERY', 2)
+    source, output = tmp_path / "texte.txt", tmp_path / "texte.fr.txt"
+    source.write_text('\n'.join(LINES) + '\n', encoding='utf-8')
+    calls = []
+
+    def translate(text, src, tgt):
+        calls.append(text)
+        if len(calls) == 6:     # une seule fois : la reprise va jusqu'au bout
+            raise RuntimeError("arrêt")
+        return f"[{tgt}] {text}"
+    monkeypatch.setattr(engine.google, 'translate', translate)
+    with pytest.raises(RuntimeError):
+        translate_document(engine, source, output, 'de', 'fr', workers=1)
+    assert output.with_name(output.name + '.checkpoint').exists()
+    return source, output
+
+
+def test_resume_same_run(engine, interrupted):
+    source, output = interrupted
+    summary = translate_document(engine, source, output, 'de', 'fr', workers=1)
+    assert summary['resumed_from'] == 4
+    assert output.read_text(encoding='utf-8').splitlines() == [f"[fr] {line}" for line in LINES]
+
+
+def test_other_direction_starts_over(engine, interrupted):
+    source, output = interrupted
+    summary = translate_document(engine, source, output, 'fr', 'de', workers=1)
+    assert summary['resumed_from'] == 0
+    assert output.read_text(encoding='utf-8').splitlines() == [f"[de] {line}" for line in LINES]
+
+
+def test_edited_input_starts_over(engine, interrupted):
+    source, output = interrupted
+    lines = ["Ein neuer Anfang."] + LINES
+    source.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    summary = translate_document(engine, source, output, 'de', 'fr', workers=1)
+    assert summary['resumed_from'] == 0
+    assert output.read_text(encoding='utf-8').splitlines() == [f"[fr] {line}" for line in lines]
+
+
+def test_touched_input_starts_over(engine, interrupted):
+    source, output = interrupted
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert translate_document(engine, source, output, 'de', 'fr', workers=1)['resumed_from'] == 0
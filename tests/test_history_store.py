@@ -0,0 +1,263 @@
+import json
+import random
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from datetime import date
+
+import pytest
+
+import traducteur
+from conftest import history_entry
+from traducteur import ConflictError, HistoryStore, save_reviews, to_epoch
+
+
+def make_v1_database(path, entries):
+    """Base au format de la première version du store (schéma 1)."""
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE history (
+            id INTEGER PRIMARY KEY,
+            word TEXT NOT NULL,
+            word_key TEXT NOT NULL,
+            src_lang TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX idx_history_key ON history(word_key, src_lang);
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        PRAGMA user_version = 1;
+    """)
+    conn.executemany("INSERT INTO history (word, word_key, src_lang, data) VALUES (?, ?, ?, ?)",
+                     [(e['word'], HistoryStore.key(e['word']), e['src_lang'], json.dumps(e)) for e in entries])
+    conn.commit()
+    conn.close()
+
+
+def test_migration_from_v1(tmp_path):
+    path = tmp_path / "v1.db"
+    make_v1_database(path, [
+        history_entry('Haus', lookup_count=4, times_correct=1, times_incorrect=3, revision_score=2,
+                      next_revision='2024-01-02T00:00:00'),
+        history_entry('Baum', lookup_count=1, times_correct=2),
+        history_entry('maison', src='fr', tgt='de'),
+    ])
+
+    store = HistoryStore(path, legacy_json=None, legacy_stats=None)
+
+    assert store._conn.execute("PRAGMA user_version").fetchone()[0] == HistoryStore.SCHEMA_VERSION
+    assert len(store) == 3
+    house = store.get('haus', 'de')
+    assert house['lookup_count'] == 4
+    assert house['next_revision'] == to_epoch('2024-01-02T00:00:00')
+    record = {r.word: r for r in store.records()}['Haus']
+    assert (record.main_translation, record.tgt_lang, record.lookup_count) == ('haus-fr', 'fr', 4)
+    assert store.due(2 ** 40, 10)[0]['word'] in ('Haus', 'Baum', 'maison')
+    summary = store.stats_summary()
+    assert summary['words'] == 3
+    assert summary['difficult_count'] == 1
+    assert {e['word'] for e in store.iter_changes()} == {'Haus', 'Baum', 'maison'}
+
+
+def test_migration_is_idempotent(tmp_path):
+    path = tmp_path / "v1.db"
+    make_v1_database(path, [history_entry('Haus')])
+    HistoryStore(path, legacy_json=None, legacy_stats=None)
+    store = HistoryStore(path, legacy_json=None, legacy_stats=None)
+    assert len(store) == 1
+    assert store.stats_summary()['words'] == 1
+
+
+def test_every_write_gets_a_new_sequence(store):
+    store.upsert(history_entry('Haus'))
+    store.upsert(history_entry('Baum'))
+    first = store.last_change()
+    house = store.get('Haus', 'de')
+    house['lookup_count'] += 1
+    store.upsert(house)
+
+    assert store.last_change() == first + 1
+    assert [e['word'] for e in store.iter_changes(since=first)] == ['Haus']
+
+
+def test_sequence_lookup_uses_an_index(store):
+    plan = store._conn.execute("EXPLAIN QUERY PLAN SELECT MAX(updated_seq) FROM history").fetchall()
+    assert 'idx_history_seq' in ' '.join(str(row) for row in plan)
+
+
+def test_stale_version_is_refused(store):
+    store.upsert(history_entry('Haus'))
+    mine, theirs = store.get('Haus', 'de'), store.get('Haus', 'de')
+    theirs['lookup_count'] = 7
+    store.upsert(theirs)
+
+    mine['lookup_count'] = 2
+    with pytest.raises(ConflictError) as conflict:
+        store.upsert(mine)
+    assert conflict.value.version == mine['version']
+    assert store.get('Haus', 'de')['lookup_count'] == 7
+
+
+def test_write_bumps_the_version(store):
+    store.upsert(history_entry('Haus'))
+    entry = store.get('Haus', 'de')
+    version = entry['version']
+    store.upsert(entry)
+    assert entry['version'] == version + 1
+    store.upsert(entry)
+    assert store.get('Haus', 'de')['version'] == version + 2
+
+
+def test_unversioned_write_wins(store):
+    store.upsert(history_entry('Haus'))
+    store.upsert(history_entry('Haus', lookup_count=9))
+    assert store.get('Haus', 'de')['lookup_count'] == 9
+
+
+def test_review_is_reapplied_on_conflict(store):
+    store.upsert(history_entry('Haus', times_correct=0, revision_score=0))
+    card = store.get('Haus', 'de')
+    other = store.get('Haus', 'de')
+    traducteur.apply_review(other, True, 1000)
+    store.upsert(other)
+
+    traducteur.apply_review(card, True, 1000)
+    save_reviews(store, [(card, True)], 1000)
+    entry = store.get('Haus', 'de')
+    assert entry['times_correct'] == 2
+    assert entry['revision_score'] == 2
+
+
+@pytest.fixture
+def users(tmp_path, monkeypatch):
+    """Historiques d'utilisateurs dans tmp_path, deux ouverts au plus."""
+    monkeypatch.setattr(traducteur, 'USERS_DIR', tmp_path)
+    monkeypatch.setattr(traducteur, 'USERS_OPEN_MAX', 2)
+    monkeypatch.setattr(traducteur, '_history_stores', OrderedDict())
+    monkeypatch.setattr(traducteur, '_history_leases', Counter())
+
+
+def test_user_stores_are_evicted_and_closed(users):
+    alice = traducteur.get_history_store('alice')
+    alice.upsert(history_entry('Haus'))
+    traducteur.get_history_store('bob')
+    assert traducteur.get_history_store('alice') is alice     # alice redevient la plus récente
+
+    traducteur.get_history_store('carol')
+    assert list(traducteur._history_stores) == ['alice', 'carol']
+    bob = traducteur.get_history_store('bob')
+    assert list(traducteur._history_stores) == ['carol', 'bob']
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(alice)
+
+    alice = traducteur.get_history_store('alice')
+    assert alice.get('Haus', 'de') is not None
+    assert len(bob) == 0
+
+
+def test_store_in_use_is_not_closed_by_eviction(users):
+    opened, evicted = threading.Event(), threading.Event()
+    seen = []
+
+    def handler():
+        with traducteur.history_store('alice') as store:
+            store.upsert(history_entry('Haus'))
+            opened.set()
+            evicted.wait(5)
+            # D'autres utilisateurs ont été servis entre-temps
+            store.upsert(history_entry('Baum'))
+            seen.append((len(store), traducteur.get_history_store('alice') is store))
+
+    worker = threading.Thread(target=handler)
+    worker.start()
+    opened.wait(5)
+    for name in ('bob', 'carol', 'dave'):
+        traducteur.get_history_store(name)
+    assert 'alice' in traducteur._history_stores
+    evicted.set()
+    worker.join(5)
+
+    assert seen == [(2, True)]
+    # Le bail rendu, le surplus est évincé (alice a servi en dernier)
+    assert list(traducteur._history_stores) == ['dave', 'alice']
+    assert len(traducteur.get_history_store('alice')) == 2
+
+
+def recomputed_levels(store):
+    """(score_buckets, mots difficiles) recalculés depuis les lignes de l'historique."""
+    rows = store._conn.execute("SELECT revision_score, times_correct, times_incorrect FROM history").fetchall()
+    buckets = {}
+    for score, _, _ in rows:
+        buckets[score] = buckets.get(score, 0) + 1
+    return buckets, sum(incorrect > correct for _, correct, incorrect in rows)
+
+
+def test_aggregates_follow_every_write(store):
+    rng = random.Random(7)
+    words = [f"Wort{i}" for i in range(40)]
+    store.upsert_many(history_entry(word, lookup_count=1) for word in words)
+    for _ in range(300):
+        word = rng.choice(words)
+        entry = store.get(word, 'de')
+        if entry is None:
+            store.upsert(history_entry(word, lookup_count=1))
+        elif rng.random() < 0.1:
+            with store.transaction():
+                store._conn.execute("DELETE FROM history WHERE word_key=?", (store.key(word),))
+        else:
+            entry['revision_score'] = rng.randint(0, 5)
+            entry['times_correct'] += rng.randint(0, 2)
+            entry['times_incorrect'] += rng.randint(0, 2)
+            entry['lookup_count'] += rng.randint(0, 1)
+            store.upsert(entry)
+
+        summary = store.stats_summary()
+        buckets, difficult = recomputed_levels(store)
+        assert summary['score_buckets'] == buckets
+        assert summary['difficult_count'] == difficult
+        assert summary['words'] == len(store)
+
+
+def test_activity_counts_todays_lookups_and_answers(store):
+    store.upsert_many(history_entry(f"Wort{i}", lookup_count=1) for i in range(10))
+    for i in range(0, 10, 2):
+        entry = store.get(f"Wort{i}", 'de')
+        entry.update(lookup_count=3, times_correct=entry['times_correct'] + 2,
+                     times_incorrect=entry['times_incorrect'] + 1)
+        store.upsert(entry)
+
+    totals = store._conn.execute(
+        "SELECT COUNT(*), SUM(lookup_count), SUM(times_correct), SUM(times_incorrect) FROM history").fetchone()
+    assert store.activity('day') == [(date.today().isoformat(), *totals)]
+
+
+def test_aggregates_rebuilt_on_migration(tmp_path):
+    path = tmp_path / "v1.db"
+    make_v1_database(path, [
+        history_entry('Haus', lookup_count=4, times_correct=1, times_incorrect=3, revision_score=2,
+                      date_added='2024-03-01T10:00:00'),
+        history_entry('Baum', lookup_count=1, times_correct=2, revision_score=2,
+                      date_added='2024-03-01T18:00:00'),
+        history_entry('Katze', lookup_count=2, revision_score=5, date_added='2024-03-04T09:00:00'),
+    ])
+    store = HistoryStore(path, legacy_json=None, legacy_stats=None)
+
+    summary = store.stats_summary()
+    assert (summary['score_buckets'], summary['difficult_count']) == recomputed_levels(store)
+    assert summary['mastered_count'] == 1
+    assert store.activity('day') == [('2024-03-04', 1, 2, 0, 0), ('2024-03-01', 2, 5, 3, 3)]
+
+
+def test_migration_from_v6(tmp_path):
+    path = tmp_path / "v6.db"
+    store = HistoryStore(path, legacy_json=None, legacy_stats=None)
+    store.upsert(history_entry('Haus', revision_score=3))
+    store._conn.execute("DROP INDEX idx_history_seq")
+    store._conn.execute("PRAGMA user_version = 6")
+    store.close()
+
+    store = HistoryStore(path, legacy_json=None, legacy_stats=None)
+    assert store._conn.execute("PRAGMA user_version").fetchone()[0] == HistoryStore.SCHEMA_VERSION
+    assert store.get('Haus', 'de')['revision_score'] == 3
+    assert store.stats_summary()['score_buckets'] == {3: 1}
+    assert store._conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_history_seq'").fetchone()
@@ -0,0 +1,41 @@
+import traducteur
+from conftest import FixtureTransport
+from traducteur import IMPORT_MAX_WAIT, LookupCache, SourceGuard, TraducteurPro, import_engine, import_vocabulary
+
+WORDS = [(f"Wort{i}", None) for i in range(12)]
+
+
+def throttled_engine(rate, max_wait):
+    limits = {name: {'rate': rate, 'burst': 1, 'max_wait': max_wait} for name in traducteur.SOURCE_LIMITS}
+    return TraducteurPro(cache=LookupCache(path=':memory:'), http=FixtureTransport(), limits=limits,
+                         dictionaries={}, verbose=False)
+
+
+def test_incomplete_results_are_not_stored_and_are_retried(engine, default_store):
+    engine.pons.guard = SourceGuard('pons', rate=1e-3, burst=1, max_wait=0)
+    engine.pons.guard.bucket.acquire(0)
+    summary = import_vocabulary(engine, WORDS, workers=3)
+    assert (summary['added'], summary['incomplete'], summary['failures']) == (0, len(WORDS), 0)
+    assert len(default_store) == 0
+
+    engine.pons.guard = SourceGuard('pons', rate=1e6, burst=1e6)
+    summary = import_vocabulary(engine, WORDS, workers=3)
+    assert (summary['added'], summary['skipped'], summary['incomplete']) == (len(WORDS), 0, 0)
+    assert all(entry['senses'] for entry in default_store.all())
+
+
+def test_waiting_for_the_limiter_completes_every_word(default_store):
+    refused = import_vocabulary(throttled_engine(rate=0.01, max_wait=0), WORDS, workers=6)
+    assert refused['incomplete'] + refused['failures'] > 0
+    assert len(default_store) == refused['added'] < len(WORDS)
+
+    summary = import_vocabulary(throttled_engine(rate=100.0, max_wait=5), WORDS, workers=6)
+    assert summary['incomplete'] == 0 and summary['failures'] == 0
+    assert len(default_store) == len(WORDS)
+
+
+def test_import_engine_waits_for_tokens():
+    engine = import_engine(workers=2, cache=LookupCache(path=':memory:'), http=FixtureTransport())
+    for source in (engine.google, engine.linguee, engine.pons, engine.glosbe):
+        assert source.guard.max_wait == IMPORT_MAX_WAIT
+    assert engine.deadline > IMPORT_MAX_WAIT
@@ -0,0 +1,65 @@
+import pytest
+
+from conftest import history_entry
+from traducteur import Lemmatizer, OfflineDictionary
+
+
+@pytest.mark.parametrize('word, src, known', [
+    ('mes', 'fr', 'mer'),
+    ('portes', 'fr', 'porter'),
+    ('verse', 'fr', 'vers'),
+    ('arbeiten', 'de', 'Arbeit'),
+])
+def test_history_is_not_a_lexicon(engine, store, word, src, known):
+    store.upsert(history_entry(known, src=src, tgt='de' if src == 'fr' else 'fr'))
+    assert engine.lemme(word, src, 'de' if src == 'fr' else 'fr') == word
+
+
+@pytest.mark.parametrize('word, lemma', [('ging', 'gehen'), ('gegangen', 'gehen'), ('bin', 'sein')])
+def test_irregular_forms_without_dictionary(engine, word, lemma):
+    assert engine.lemme(word, 'de', 'fr') == lemma
+
+
+def test_suffix_rules_need_a_lexicon():
+    lemmatizer = Lemmatizer()
+    assert lemmatizer.lemma('chevaux', 'fr') == 'chevaux'
+    assert lemmatizer.lemma('chevaux', 'fr', {'cheval': 'cheval'}.get) == 'cheval'
+    assert lemmatizer.lemma('allons', 'fr') == 'aller'
+
+
+def test_suffix_rules_checked_against_the_dictionary(engine, tmp_path):
+    path = tmp_path / "fr-de.idx"
+    OfflineDictionary.build([
+        ('cheval', '', ['Pferd']),
+        ('mer', '', ['Meer']),
+        ('mes', '', ['meine']),
+        ('porte', '', ['Tür']),
+        ('portes', 'porte', []),
+    ], path)
+    engine.dictionaries = {('fr', 'de'): OfflineDictionary(path)}
+
+    assert engine.lemme('chevaux', 'fr', 'de') == 'cheval'
+    assert engine.lemme('mes', 'fr', 'de') == 'mes'
+    assert engine.lemme('portes', 'fr', 'de') == 'porte'
+    assert engine.lemme('verse', 'fr', 'de') == 'verse'
+
+
+@pytest.mark.parametrize('word, src', [
+    ('Fahrt', 'de'), ('fahrt', 'de'), ('Waren', 'de'), ('waren', 'de'), ('Taten', 'de'), ('Würde', 'de'),
+    ('avions', 'fr'), ('allée', 'fr'), ('allées', 'fr'), ('parti', 'fr'), ('sommes', 'fr'),
+    ('mets', 'fr'), ('venue', 'fr'), ('du', 'fr'), ('alle', 'de'),
+])
+def test_nouns_are_not_rewritten(engine, word, src):
+    assert engine.lemme(word, src, 'fr' if src == 'de' else 'de') == word
+
+
+def test_capitalised_german_is_a_noun():
+    lemmatizer = Lemmatizer()
+    assert lemmatizer.lemma('ging', 'de') == 'gehen'
+    assert lemmatizer.lemma('Ging', 'de') == 'Ging'
+    assert lemmatizer.lemma('Allons', 'fr') == 'aller'
+
+
+def test_noun_lookup_keeps_its_word(engine):
+    result = engine.traduire_mot('Fahrt', 'de', 'fr', sections=())
+    assert result['lemma'] == 'Fahrt'
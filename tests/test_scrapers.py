@@ -0,0 +1,11 @@
+from conftest import ROOT
+from traducteur import parse_linguee_html
+
+FIXTURES = ROOT / "benchmarks" / "fixtures"
+
+
+def test_linguee_filtered_parse_matches_full_parse():
+    html = (FIXTURES / "linguee_haus_de_fr.html").read_text(encoding='utf-8')
+    translations = parse_linguee_html(html)
+    assert translations[:3] == ['maison', 'domicile', 'foyer']
+    assert translations == parse_linguee_html(html, parser='html.parser', strain=False)
@@ -0,0 +1,64 @@
+import pytest
+
+from traducteur import SearchIndex, get_lemmatizer
+
+
+def build(*words, lemmatizer=None):
+    return SearchIndex.build(
+        ((i, {'word': word, 'main_translation': '', 'translations': []}) for i, word in enumerate(words)),
+        lemmatizer)
+
+
+def found(index, query):
+    return [i for i, _ in index.search(query)]
+
+
+def test_exact_and_accent_insensitive():
+    index = build('Haus', 'Straße', 'über')
+    assert found(index, 'haus') == [0]
+    assert found(index, 'strasse') == [1]
+    assert found(index, 'UBER') == [2]
+
+
+def test_prefix():
+    index = build('Hausaufgabe', 'Haustür', 'Baum')
+    assert sorted(found(index, 'haus')) == [0, 1]
+
+
+def test_fuzzy_only_without_exact_or_prefix_hit():
+    index = build('Haus', 'Hals')
+    # « hals » est à une faute de « haus », mais la correspondance exacte suffit
+    assert found(index, 'haus') == [0]
+    assert sorted(found(index, 'hous')) == [0]
+    assert sorted(found(index, 'halt')) == [1]
+    assert sorted(found(index, 'haxs')) == [0, 1]
+
+
+def test_fuzzy_finds_a_typo_among_frequent_trigrams():
+    # Des milliers de termes partagent « ung » : la liste est ignorée, pas parcourue
+    words = [f"{prefix}ung" for prefix in ('hoffn', 'zeit', 'mein', 'acht', 'lies')]
+    words += [f"w{i:05d}ung" for i in range(3 * SearchIndex.FUZZY_SCAN_LIMIT)]
+    index = build(*words)
+    assert found(index, 'hoffnxxx') == []           # trois fautes : rien
+    assert 0 in found(index, 'hofnung')
+    assert 1 in found(index, 'zietung')
+
+
+def test_remove_and_reindex():
+    index = build('Haus', 'Baum')
+    index.remove(0)
+    assert found(index, 'haus') == []
+    index.add(0, {'word': 'Hausboot', 'main_translation': 'péniche', 'translations': []})
+    assert found(index, 'peniche') == [0]
+
+
+def test_irregular_form_finds_its_lemma():
+    index = build('gehen', 'aller', 'Gehege', lemmatizer=get_lemmatizer())
+    assert found(index, 'ging') == [0]
+    assert found(index, 'allons') == [1]
+
+
+@pytest.mark.parametrize('word, other', [('mes', 'mer'), ('portes', 'porter'), ('verse', 'vers')])
+def test_suffix_rules_do_not_expand_queries(word, other):
+    index = build(other, word, lemmatizer=get_lemmatizer())
+    assert found(index, word) == [1]
@@ -0,0 +1,150 @@
+import time
+
+import pytest
+import requests
+
+from conftest import NO_LIMITS, FixtureTransport
+from traducteur import (CircuitBreaker, LookupCache, Metrics, PONSSource, SourceGuard, SourceUnavailable,
+                        TraducteurPro)
+
+COOLDOWN = 0.05
+
+
+class Response:
+    def __init__(self, status_code=200, text=''):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = {}
+
+
+def failing(exc):
+    def fetch(*args, **kwargs):
+        raise exc
+    return fetch
+
+
+def ok(*args, **kwargs):
+    return Response()
+
+
+def guard(**kwargs):
+    options = dict(rate=1e6, burst=1e6, retries=0, threshold=2, cooldown=COOLDOWN)
+    options.update(kwargs)
+    return SourceGuard('test', **options)
+
+
+def test_breaker_opens_after_threshold_then_probes_once():
+    breaker = CircuitBreaker(threshold=2, cooldown=COOLDOWN)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    time.sleep(COOLDOWN)
+    assert breaker.state == 'half-open'
+    assert breaker.allow()          # la requête d'essai
+    assert not breaker.allow()      # une seule à la fois
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(threshold=1, cooldown=COOLDOWN)
+    breaker.record_failure()
+    time.sleep(COOLDOWN)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    time.sleep(COOLDOWN)
+    assert breaker.state == 'half-open'
+
+
+def test_network_errors_open_the_breaker():
+    g = guard()
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            g.call(failing(requests.ConnectionError()))
+    with pytest.raises(SourceUnavailable):
+        g.call(ok)
+
+
+@pytest.mark.parametrize('exc', [requests.TooManyRedirects(), ValueError("réponse illisible")])
+def test_unexpected_error_during_probe_does_not_wedge_the_breaker(exc):
+    g = guard(threshold=1)
+    with pytest.raises(requests.ConnectionError):
+        g.call(failing(requests.ConnectionError()))
+    time.sleep(COOLDOWN)
+
+    with pytest.raises(type(exc)):
+        g.call(failing(exc))            # requête d'essai : échec inattendu
+    assert g.breaker.state == 'open'
+
+    time.sleep(COOLDOWN)
+    assert g.call(ok).status_code == 200
+    assert g.breaker.state == 'closed'
+
+
+def test_server_errors_are_retried_then_count_once():
+    calls = []
+
+    def flaky(*args, **kwargs):
+        calls.append(1)
+        return Response(503 if len(calls) < 3 else 200)
+
+    g = guard(retries=2, backoff=0.001)
+    assert g.call(flaky).status_code == 200
+    assert len(calls) == 3 and g.breaker.failures == 0
+
+
+def test_rate_limit_refusal_is_not_a_source_failure():
+    g = guard(rate=0.001, burst=1, max_wait=0)
+    g.call(ok)
+    with pytest.raises(SourceUnavailable):
+        g.call(ok)
+    assert g.breaker.state == 'closed' and g.breaker.failures == 0
+
+
+class Transport:
+    def get(self, url, **kwargs):
+        return Response(200, '<html></html>')
+
+
+def test_source_reports_refusal_instead_of_an_empty_result():
+    source = PONSSource(http=Transport(), guard=guard(rate=0.001, burst=1, max_wait=0))
+    assert source.lookup('Haus') == {'senses': [], 'phrases': []}
+    with pytest.raises(SourceUnavailable):
+        source.lookup('Baum')
+
+
+def test_engine_lists_throttled_sources_as_unavailable(engine):
+    engine.pons.guard = guard(rate=0.001, burst=1, max_wait=0)
+    engine.pons.guard.bucket.acquire(0)
+    result = engine.traduire_mot('Haus', 'de', 'fr', sections=('senses',))
+    assert result['unavailable'] == ['pons']
+    assert result['main_translation'] == 'Maison'
+
+    *_, (step, _, streamed) = engine.traduire_mot_flux('Baum', 'de', 'fr', synonyms=False)
+    assert step == 'fin' and streamed['unavailable'] == ['pons']
+
+
+def test_sentence_reports_a_paused_google(engine):
+    engine.google.guard = guard(rate=0.001, burst=1, max_wait=0)
+    engine.google.guard.bucket.acquire(0)
+    result = engine.traduire_phrase("Das Haus ist alt", 'de', 'fr', interactive=False)
+    assert result['translation'] is None
+    assert result['unavailable'] == ['google']
+
+
+def test_one_refusal_is_counted_once():
+    metrics = Metrics()
+    engine = TraducteurPro(cache=LookupCache(path=':memory:'), http=FixtureTransport(), limits=NO_LIMITS,
+                           metrics=metrics, dictionaries={}, verbose=False)
+    engine.pons.guard = guard(rate=0.001, burst=1, max_wait=0)
+    engine.pons.guard.bucket.acquire(0)
+    engine.traduire_mot('Haus', 'de', 'fr', sections=('senses',))
+
+    pons = metrics.snapshot()['pons']
+    assert pons['counters'] == {'rejected': 1}
+    assert pons['phases']['lookup']['count'] == 1
+    assert pons['phases']['network']['count'] == 1
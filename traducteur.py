@@ -19,16 +19,51 @@ Fonctionnalités :
   5. Statistiques de progression
   6. Export du vocabulaire
   7. Recherche dans l'historique
+
+Mode non interactif :
+  python traducteur.py --fichier livre.txt [--source de --cible fr]
+      Traduction en flux d'un gros fichier .txt / .md, reprise possible
+  python traducteur.py --serveur [--hote 127.0.0.1 --port 8000]
+      API HTTP JSON (mots, phrases, recherche, révision)
+  python traducteur.py --importer vocabulaire.csv [--source de --cible fr]
+      Import d'une liste de mots (CSV/TSV ou un mot par ligne) dans l'historique
+  python traducteur.py --exporter anki [--sortie vocab.tsv] [--incrementiel]
+      Export du vocabulaire (txt, csv, anki, jsonl), éventuellement les seuls changements
+  python traducteur.py --dictionnaire deu-fra.tei [--source de --cible fr]
+      Indexe un dictionnaire libre (FreeDict TEI ou TSV) : les mots qu'il
+      contient sont traduits sans réseau, les sources en ligne enrichissent
+
+Plusieurs apprenants : --utilisateur nom (ou TRADUCTEUR_UTILISATEUR=nom)
+donne à chacun son historique et ses statistiques (dossier utilisateurs/).
 """
 
+import argparse
+import asyncio
+import bisect
+import copy
+import csv
+import heapq
+import io
 import json
+import math
+import mmap
 import os
 import random
 import re
+import sqlite3
 import sys
+import threading
 import time
-from datetime import datetime, timedelta
+import unicodedata
+import xml.etree.ElementTree as ElementTree
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
 # ── Forcer UTF-8 sur Windows ──
 if sys.platform == 'win32':
@@ -38,16 +73,16 @@ if sys.platform == 'win32':
 # ── Dépendances ──────────────────────────────────────────────
 try:
     import requests
-    from bs4 import BeautifulSoup, Tag
-    from deep_translator import GoogleTranslator, LingueeTranslator
+    from requests.adapters import HTTPAdapter
+    from bs4 import BeautifulSoup, SoupStrainer, Tag
     from colorama import init, Fore, Back, Style
     init(autoreset=True)
 except ImportError:
     print("⚠ Installation des dépendances...")
-    os.system(f"{sys.executable} -m pip install deep-translator colorama requests beautifulsoup4")
+    os.system(f"{sys.executable} -m pip install colorama requests beautifulsoup4")
     import requests
-    from bs4 import BeautifulSoup, Tag
-    from deep_translator import GoogleTranslator, LingueeTranslator
+    from requests.adapters import HTTPAdapter
+    from bs4 import BeautifulSoup, SoupStrainer, Tag
     from colorama import init, Fore, Back, Style
     init(autoreset=True)
 
@@ -55,8 +90,24 @@ except ImportError:
 # Configuration
 # ─────────────────────────────────────────────────────────────
 SCRIPT_DIR = Path(__file__).parent
-HISTORY_FILE = SCRIPT_DIR / "historique_traductions.json"
-STATS_FILE = SCRIPT_DIR / "stats_revision.json"
+HISTORY_FILE = SCRIPT_DIR / "historique_traductions.json"      # ancien format (importé)
+HISTORY_DB = SCRIPT_DIR / "historique_traductions.db"
+STATS_FILE = SCRIPT_DIR / "stats_revision.json"                # ancien format (importé)
+USERS_DIR = SCRIPT_DIR / "utilisateurs"                        # un historique par utilisateur
+USERS_OPEN_MAX = 64            # historiques d'utilisateurs gardés ouverts (LRU)
+CACHE_FILE = SCRIPT_DIR / "cache_traductions.db"
+DICT_DIR = SCRIPT_DIR / "dictionnaires"                        # index hors ligne (--dictionnaire)
+
+# Cache des sources : durée de vie par source (secondes) et taille maximale
+DAY = 24 * 3600
+CACHE_TTL = {
+    'google': 30 * DAY,
+    'linguee': 30 * DAY,
+    'pons': 14 * DAY,
+    'glosbe': 14 * DAY,
+}
+CACHE_MAX_ENTRIES = 50_000     # sur disque, éviction LRU au-delà
+CACHE_MEMORY_ENTRIES = 2_000   # copie chaude en mémoire
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
@@ -64,9 +115,81 @@ HEADERS = {
     'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8,de;q=0.7',
 }
 
+# Délai global d'une recherche de mot (secondes) : au-delà, on fusionne
+# ce qui est arrivé et les sources manquantes sont marquées « expirées ».
+LOOKUP_DEADLINE = 12
+MAX_WORKERS = 8
+
+# Taille max d'une requête Google Translate (limite : 5000 caractères)
+GOOGLE_MAX_CHARS = 4500
+
+# Serveur API : recherches simultanées max vers les sources, taille max d'une requête,
+# plafond du paramètre `limite`
+SERVER_MAX_CONCURRENT = 16
+SERVER_MAX_BODY = 64 * 1024
+SERVER_MAX_LIMIT = 200
+
+# Traduction de documents : traducteurs en parallèle, fréquence du point de reprise
+DOCUMENT_WORKERS = 4
+CHECKPOINT_EVERY = 20
+
+# Import de listes de vocabulaire : recherches de mots en parallèle. Les
+# requêtes attendent leur tour au limiteur de chaque source (jusqu'à
+# IMPORT_MAX_WAIT s) au lieu d'être refusées : c'est le débit permis des
+# sources, pas le nombre de workers, qui fixe la vitesse d'un import.
+IMPORT_WORKERS = 6
+IMPORT_MAX_WAIT = 60
+IMPORT_DEADLINE = 90
+
+# Sessions HTTP partagées : nombre d'hôtes gardés en pool, connexions par hôte
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 16
+HTTP_CONNECT_TIMEOUT = 3.05
+HTTP_TIMEOUT = 10
+
+# Protection par source : débit max (requêtes/s) et rafale autorisée.
+# Les erreurs passagères (connexion, 429, 5xx) sont retentées avec un délai
+# exponentiel aléatoire ; après BREAKER_THRESHOLD échecs de suite, la source
+# est mise en pause BREAKER_COOLDOWN secondes (disjoncteur).
+SOURCE_LIMITS = {
+    'google': {'rate': 5.0, 'burst': 10},
+    'linguee': {'rate': 1.0, 'burst': 3},
+    'pons': {'rate': 2.0, 'burst': 5},
+    'glosbe': {'rate': 2.0, 'burst': 5},
+}
+RETRY_ATTEMPTS = 2
+RETRY_BACKOFF = 0.3
+RATE_MAX_WAIT = 2.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30
+
+# Histogrammes de latence par source (bornes en secondes). TRADUCTEUR_TRACE=1
+# affiche chaque étape mesurée sur stderr.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Décompression brotli uniquement si urllib3 sait la décoder
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+# Analyseur HTML des scrapers : lxml s'il est installé (bien plus rapide),
+# sinon celui de la bibliothèque standard. Forçable via TRADUCTEUR_HTML_PARSER.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+HTML_PARSER = os.environ.get('TRADUCTEUR_HTML_PARSER', HTML_PARSER)
+
 LANG_MAP = {
-    'de': {'name': 'Allemand', 'flag': '🇩🇪', 'pons': 'german', 'glosbe': 'de'},
-    'fr': {'name': 'Français', 'flag': '🇫🇷', 'pons': 'french', 'glosbe': 'fr'},
+    'de': {'name': 'Allemand', 'flag': '🇩🇪', 'pons': 'german', 'linguee': 'german', 'glosbe': 'de'},
+    'fr': {'name': 'Français', 'flag': '🇫🇷', 'pons': 'french', 'linguee': 'french', 'glosbe': 'fr'},
 }
 
 
@@ -112,38 +235,145 @@ def spinner(msg):
 # ─────────────────────────────────────────────────────────────
 # Détection de langue
 # ─────────────────────────────────────────────────────────────
-def detect_language(text):
-    """Détecte si le texte est en allemand ou français."""
-    german_words = {
-        'der', 'die', 'das', 'ein', 'eine', 'und', 'ist', 'nicht', 'ich',
-        'du', 'er', 'sie', 'wir', 'ihr', 'mit', 'von', 'auf', 'für', 'aber',
-        'auch', 'noch', 'nach', 'bei', 'dem', 'den', 'des', 'sich', 'es',
-        'haben', 'sein', 'werden', 'kann', 'hat', 'sind', 'war', 'wenn',
-        'nur', 'wie', 'so', 'als', 'oder', 'diese', 'einem', 'einer',
-    }
-    french_words = {
-        'le', 'la', 'les', 'un', 'une', 'des', 'est', 'sont', 'je', 'tu',
-        'il', 'elle', 'nous', 'vous', 'ils', 'avec', 'pour', 'dans', 'sur',
-        'pas', 'mais', 'ou', 'que', 'qui', 'ce', 'cette', 'aux', 'du',
-        'être', 'avoir', 'fait', 'très', 'bien', 'tout', 'plus', 'comme',
-        'aussi', 'même', 'entre', 'après', 'sans', 'chez', 'peu',
-    }
+# Petits corpus de mots fréquents : les profils de trigrammes de caractères
+# en sont tirés une seule fois, au premier appel du détecteur.
+LANGUAGE_SAMPLES = {
+    'de': """der die das und ist nicht ich du er sie es wir ihr mit von auf für aber auch noch
+        nach bei dem den des sich haben sein werden kann hat sind war wenn nur wie so als oder
+        diese einem einer ein eine zu im in an aus um über unter vor zwischen durch gegen ohne
+        heute morgen gestern immer schon sehr viel mehr gut neu alt groß klein lang kurz hoch
+        jung schön haus zeit jahr mensch kind frau mann tag welt leben hand arbeit stadt land
+        schule wasser freund frage geschichte beispiel kirche straße mädchen zeitung regierung
+        entwicklung wirtschaft gesellschaft bedeutung möglichkeit wohnung erfahrung meinung
+        richtung machen gehen kommen sehen sagen wissen geben finden denken nehmen bleiben
+        stehen liegen spielen arbeiten sprechen schreiben lesen fahren laufen essen trinken
+        schlafen verstehen glauben brauchen zeigen führen bringen halten heißen müssen sollen
+        wollen dürfen möchten natürlich wirklich vielleicht zusammen wieder während deshalb
+        trotzdem nichts etwas jemand niemand welche welcher unsere euch ihnen ihm ihn mich dich
+        uns wurde worden gewesen geworden gemacht gesagt mittwoch donnerstag frühling herbst
+        schnell langsam fröhlich bäckerei brötchen tschüss bitte danke entschuldigung nachricht
+        wissenschaft geschwindigkeit zusammenarbeit zwei drei vier fünf sechs acht zehn
+        kaufen verkaufen wohnen wichtig richtig einfach schwierig deutsch sprache""",
+    'fr': """le la les un une des est sont je tu il elle nous vous ils elles avec pour dans sur
+        pas mais ou que qui ce cette aux du être avoir fait très bien tout plus comme aussi même
+        entre après sans chez peu de et en au se ne son sa ses leur leurs notre votre mon ma mes
+        ton ta quand comment pourquoi parce toujours jamais souvent déjà encore beaucoup trop
+        assez maintenant aujourd'hui hier demain maison temps année homme enfant femme jour
+        monde vie main travail ville pays école eau ami question histoire exemple église rue
+        fille journal gouvernement développement économie société signification possibilité
+        appartement expérience opinion direction faire aller venir voir dire savoir donner
+        trouver penser prendre rester mettre parler écrire lire conduire courir manger boire
+        dormir comprendre croire vouloir pouvoir devoir falloir montrer porter tenir appeler
+        naturellement vraiment peut-être ensemble pendant cependant rien quelque chose
+        quelqu'un personne lequel laquelle eux lui moi toi été dit mercredi jeudi printemps
+        automne rapide lentement heureux boulangerie croissant merci excusez nouvelle science
+        vitesse coopération château gâteau oiseau chevaux bateau nouveau français anglais
+        allemand deux trois quatre cinq six huit dix acheter vendre habiter important
+        simple difficile langue""",
+}
+
+LANGUAGE_STOP_WORDS = {
+    'de': {'der', 'die', 'das', 'ein', 'eine', 'und', 'ist', 'nicht', 'ich', 'du', 'er', 'sie',
+           'wir', 'ihr', 'mit', 'von', 'auf', 'für', 'aber', 'auch', 'noch', 'nach', 'bei', 'dem',
+           'den', 'des', 'sich', 'es', 'haben', 'sein', 'werden', 'kann', 'hat', 'sind', 'war',
+           'wenn', 'nur', 'wie', 'so', 'als', 'oder', 'diese', 'einem', 'einer'},
+    'fr': {'le', 'la', 'les', 'un', 'une', 'des', 'est', 'sont', 'je', 'tu', 'il', 'elle', 'nous',
+           'vous', 'ils', 'avec', 'pour', 'dans', 'sur', 'pas', 'mais', 'ou', 'que', 'qui', 'ce',
+           'cette', 'aux', 'du', 'être', 'avoir', 'fait', 'très', 'bien', 'tout', 'plus', 'comme',
+           'aussi', 'même', 'entre', 'après', 'sans', 'chez', 'peu'},
+}
 
-    text_lower = text.lower()
-    words = set(re.findall(r'\b\w+\b', text_lower))
+# En dessous de cette confiance, le mode interactif demande la direction
+DETECTION_MIN_CONFIDENCE = 0.75
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+
+
+class LanguageDetector:
+    """Détecteur allemand / français par profils de trigrammes de caractères.
+
+    Une seule table précalculée associe à chaque trigramme (mots bordés
+    d'espaces) le log-rapport de vraisemblance P(de) / P(fr) ; les mots
+    outils ajoutent un poids fixe. Le score d'un mot est mémorisé : sur un
+    lot de phrases, chaque mot distinct n'est évalué qu'une fois. Score > 0
+    → allemand ; la confiance est la probabilité a posteriori (sigmoïde).
+    """
+
+    STOP_WORD_WEIGHT = 3.0
+    CONFIDENCE_SCALE = 0.5     # les trigrammes ne sont pas indépendants : on tempère
+    MEMO_SIZE = 50_000
+
+    def __init__(self, samples=LANGUAGE_SAMPLES, stop_words=LANGUAGE_STOP_WORDS, smoothing=0.5):
+        counts = {lang: Counter() for lang in ('de', 'fr')}
+        for lang, text in samples.items():
+            for word in _WORD_RE.findall(text.lower()):
+                counts[lang].update(self._trigrams(word))
+        vocabulary = set(counts['de']) | set(counts['fr'])
+        totals = {lang: sum(c.values()) + smoothing * len(vocabulary) for lang, c in counts.items()}
+        self.weights = {
+            gram: math.log((counts['de'][gram] + smoothing) / totals['de'])
+            - math.log((counts['fr'][gram] + smoothing) / totals['fr'])
+            for gram in vocabulary
+        }
+        for word in stop_words['de'] - stop_words['fr']:
+            self.weights[word] = self.STOP_WORD_WEIGHT
+        for word in stop_words['fr'] - stop_words['de']:
+            self.weights[word] = -self.STOP_WORD_WEIGHT
+        self._memo = {}
 
-    de_score = len(words & german_words)
-    fr_score = len(words & french_words)
+    @staticmethod
+    def _trigrams(word):
+        padded = f" {word} "
+        return [padded[i:i + 3] for i in range(len(padded) - 2)]
 
-    # Bonus for special chars
-    de_score += sum(1 for c in 'äöüß' if c in text_lower)
-    fr_score += sum(1 for c in 'éèêëçàùîôû' if c in text_lower)
+    def _word_score(self, word):
+        score = self._memo.get(word)
+        if score is None:
+            weights = self.weights
+            score = weights.get(word, 0.0) + sum(weights.get(g, 0.0) for g in self._trigrams(word))
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[word] = score
+        return score
+
+    def score(self, text):
+        """Log-rapport allemand / français du texte (0 si aucun indice)."""
+        return sum(map(self._word_score, _WORD_RE.findall(text.lower())))
+
+    def detect(self, text):
+        """(src, tgt, confiance) — toujours la direction la plus probable."""
+        score = self.score(text)
+        confidence = 1 / (1 + math.exp(-min(abs(score) * self.CONFIDENCE_SCALE, 50)))
+        return ('de', 'fr', confidence) if score >= 0 else ('fr', 'de', confidence)
+
+    def detect_many(self, texts):
+        """Classe un lot de textes en une passe (mémo des mots partagé)."""
+        return [self.detect(text) for text in texts]
 
-    if de_score > fr_score:
-        return 'de', 'fr'
-    elif fr_score > de_score:
-        return 'fr', 'de'
-    return None, None
+
+_language_detector = None
+
+
+def get_language_detector():
+    global _language_detector
+    if _language_detector is None:
+        _language_detector = LanguageDetector()
+    return _language_detector
+
+
+def detect_language(text, min_confidence=DETECTION_MIN_CONFIDENCE):
+    """Détecte si le texte est en allemand ou français.
+
+    Retourne (src, tgt), ou (None, None) si la confiance est sous
+    `min_confidence` — à l'appelant de demander ou de trancher.
+    """
+    src, tgt, confidence = get_language_detector().detect(text)
+    return (src, tgt) if confidence >= min_confidence else (None, None)
+
+
+def detect_languages(texts):
+    """Version par lot : [(src, tgt, confiance)] pour chaque texte."""
+    return get_language_detector().detect_many(texts)
 
 
 def ask_direction():
@@ -158,7 +388,181 @@ def ask_direction():
 
 
 # ─────────────────────────────────────────────────────────────
-# Historique & Stats (persistance JSON)
+# Normalisation des formes fléchies (lemmes)
+# ─────────────────────────────────────────────────────────────
+# Formes irrégulières courantes : lemme → formes. Les formes ambiguës avec
+# un nom ou un adjectif fréquent (été, fait, vue, parti, sommes, avions, mets,
+# Stand, Fahrt, Waren, Taten, Würde…) sont volontairement absentes : mieux
+# vaut ne pas normaliser que se tromper. En allemand, un mot écrit avec une
+# majuscule est un nom et n'est pas normalisé (voir Lemmatizer.irregular_lemma).
+IRREGULAR_FORMS = {
+    'de': {
+        'sein': "bin bist ist sind seid war warst gewesen wäre wärst wären",
+        'haben': "hat habt hatte hattest hatten hattet gehabt hätte hätten",
+        'werden': "werde wirst wird werdet wurde wurdest wurden wurdet geworden",
+        'gehen': "gehe gehst geht ging gingst gingen gingt gegangen",
+        'kommen': "komme kommst kommt kam kamst kamen kamt gekommen käme",
+        'sehen': "sehe siehst sieht seht sah sahst sahen gesehen",
+        'geben': "gebe gibst gibt gebt gab gabst gegeben",
+        'nehmen': "nehme nimmst nimmt nehmt nahm nahmen genommen",
+        'essen': "isst esst aß aßen gegessen",
+        'fahren': "fahre fährst fährt fuhr fuhren gefahren",
+        'lesen': "lese liest lest las lasen gelesen",
+        'sprechen': "spreche sprichst spricht sprecht sprach sprachen gesprochen",
+        'finden': "finde findest findet fand fanden gefunden",
+        'bleiben': "bleibe bleibst bleibt blieb blieben geblieben",
+        'schreiben': "schreibe schreibst schreibt schrieb schrieben geschrieben",
+        'stehen': "stehe stehst steht standen gestanden",
+        'tun': "tue tust tut getan",
+        'wissen': "weißt wisst wusste wussten gewusst",
+        'können': "kann kannst könnt konnte konnten gekonnt könnte könnten",
+        'müssen': "muss musst müsst musste mussten gemusst müsste",
+        'wollen': "will willst wollt wollte wollten gewollt",
+        'dürfen': "darf darfst dürft durfte durften",
+        'sollen': "sollst sollt sollte sollten",
+        'mögen': "mag magst mögt mochte mochten möchte möchten",
+        'denken': "denke denkst denkt dachte dachten gedacht",
+        'bringen': "bringe bringst bringt brachte brachten gebracht",
+        'laufen': "läufst läuft lauft lief liefen gelaufen",
+        'schlafen': "schlafe schläfst schläft schlaft schlief schliefen geschlafen",
+        'trinken': "trinke trinkst trinkt tranken getrunken",
+        'helfen': "helfe hilfst hilft helft half halfen geholfen",
+    },
+    'fr': {
+        'être': "suis es êtes sont étais était étions étiez étaient serai seras sera "
+                "serons serez seront serais serait seraient sois soyons soyez soient fus fut furent",
+        'avoir': "ai avons avez ont avais avait aviez avaient eu eue eus eut aurai auras "
+                 "aurons aurez auront aurais aurait auraient aie ait ayons ayez aient",
+        'aller': "vais vas va allons allez vont allais allait allions alliez allaient allé allés "
+                 "irai iras ira irons irez iront irais irait iraient aille aillent",
+        'faire': "fais faisons faites font faisais faisait faisaient ferai fera ferons feront ferais "
+                 "ferait fasse fassent",
+        'pouvoir': "peux peut pouvons pouvez peuvent pouvais pouvait pu pourrai pourra pourrait puisse",
+        'vouloir': "veux veut voulons voulez veulent voulais voulait voulu voudrai voudra voudrais "
+                   "voudrait veuille",
+        'venir': "viens vient venons venez viennent venais venait venu viendrai viendra",
+        'dire': "dis disons dites disent disais disait dirai dira",
+        'voir': "vois voit voyons voyez voient voyais voyait vu vus verrai verra",
+        'savoir': "sais sait savons savez savent savais savait su saurai saura sache",
+        'prendre': "prends prend prenons prenez prennent prenais prenait pris prendrai prendra prenne",
+        'devoir': "dois doit devons devez doivent devais devait dû dus devrai devra devrait",
+        'mettre': "met mettons mettez mettent mettais mettait mis mettrai",
+        'partir': "pars partons partez partent partais partait",
+    },
+}
+
+# Règles de suffixes (fin de mot, remplacement), de la plus spécifique à la
+# plus générale. Un candidat n'est retenu que s'il est un mot vedette du
+# dictionnaire hors ligne : les règles proposent, le dictionnaire valide.
+# L'historique ne sert pas de lexique : il ne contient que quelques mots et
+# en ferait des cibles (mes → mer, portes → porter, verse → vers).
+SUFFIX_RULES = {
+    'de': [
+        ('äuser', 'aus'), ('äume', 'aum'), ('ände', 'and'), ('ächte', 'acht'), ('ürfe', 'urf'),
+        ('ern', ''), ('er', ''), ('en', ''), ('es', ''), ('em', ''), ('e', ''), ('n', ''), ('s', ''),
+        ('test', 'en'), ('tet', 'en'), ('ten', 'en'), ('te', 'en'), ('est', 'en'), ('et', 'en'),
+        ('st', 'en'), ('t', 'en'), ('e', 'en'), ('e', 'n'), ('t', 'n'), ('st', 'n'),
+    ],
+    'fr': [
+        ('eaux', 'eau'), ('aux', 'al'), ('euses', 'eur'), ('euse', 'eur'), ('ives', 'if'), ('ive', 'if'),
+        ('iennes', 'ien'), ('ienne', 'ien'), ('ères', 'er'), ('ère', 'er'),
+        ('eraient', 'er'), ('erions', 'er'), ('eriez', 'er'), ('erons', 'er'), ('eront', 'er'),
+        ('erais', 'er'), ('erait', 'er'), ('erai', 'er'), ('eras', 'er'), ('era', 'er'), ('erez', 'er'),
+        ('aient', 'er'), ('ions', 'er'), ('iez', 'er'), ('ais', 'er'), ('ait', 'er'), ('ées', 'er'),
+        ('és', 'er'), ('ée', 'er'), ('é', 'er'), ('ons', 'er'), ('ez', 'er'), ('ent', 'er'),
+        ('es', 'er'), ('e', 'er'), ('a', 'er'), ('ai', 'er'),
+        ('ons', 'r'), ('aient', 'r'), ('ait', 'r'), ('ais', 'r'),        # mangeons → manger
+        ('issaient', 'ir'), ('issions', 'ir'), ('issons', 'ir'), ('issez', 'ir'), ('issent', 'ir'),
+        ('issais', 'ir'), ('issait', 'ir'), ('ies', 'ir'), ('ie', 'ir'), ('is', 'ir'), ('it', 'ir'),
+        ('i', 'ir'),
+        ('ues', 're'), ('ue', 're'), ('us', 're'), ('u', 're'), ('ons', 're'), ('ez', 're'),
+        ('ent', 're'), ('s', 're'), ('', 're'),
+        ('es', ''), ('s', ''), ('x', ''), ('e', ''),
+    ],
+}
+
+
+class Lemmatizer:
+    """Ramène une forme fléchie (ging, gegangen, allons, chevaux) à son lemme.
+
+    Trois niveaux : table des formes irrégulières, puis lemme fourni par le
+    lexique (`known`), puis règles de suffixes validées par ce lexique. Sans
+    lexique, seules les formes irrégulières sont normalisées. La table n'a
+    pas de clés sans accents : wären → waren, dû → du en feraient d'autres mots.
+    """
+
+    MIN_LEMMA = 3
+
+    def __init__(self, irregular=IRREGULAR_FORMS, rules=SUFFIX_RULES):
+        self.irregular = {}
+        for lang, table in irregular.items():
+            forms = self.irregular[lang] = {}
+            for lemma, words in table.items():
+                for form in words.split():
+                    forms.setdefault(form, lemma)
+        self.rules = rules
+
+    def irregular_lemma(self, word, lang):
+        """Lemme de `word` d'après la table des formes irrégulières, ou None.
+
+        En allemand, une forme avec majuscule (Fahrt, Waren) est un nom : elle
+        n'est pas rapprochée d'un verbe.
+        """
+        if lang == 'de' and word[:1].isupper():
+            return None
+        return self.irregular.get(lang, {}).get(word.casefold())
+
+    def candidates(self, word, lang):
+        """Lemmes possibles de `word` (minuscules), du plus sûr au plus spéculatif."""
+        lower = word.casefold()
+        irregular = self.irregular.get(lang, {}).get(lower)
+        if irregular:
+            yield irregular
+        seen = {lower}
+        for suffix, replacement in self.rules.get(lang, ()):
+            if not lower.endswith(suffix) or len(lower) == len(suffix):
+                continue
+            stem = lower[:len(lower) - len(suffix)]
+            options = [stem + replacement]
+            if lang == 'de' and stem.startswith('ge'):
+                options.append(stem[2:] + replacement)     # participe : gemacht → machen
+            for candidate in options:
+                if len(candidate) >= self.MIN_LEMMA and candidate not in seen:
+                    seen.add(candidate)
+                    yield candidate
+
+    def lemma(self, word, lang, known=None):
+        """Lemme de `word`, ou `word` lui-même si rien de sûr ne se dégage.
+
+        `known(mot)` renvoie la graphie d'un mot du lexique (ex. 'Haus'),
+        ou None s'il est inconnu.
+        """
+        irregular = self.irregular_lemma(word, lang)
+        if irregular:
+            return irregular
+        if known is None:
+            return word
+        if known(word):
+            return word
+        for candidate in self.candidates(word, lang):
+            spelled = known(candidate)
+            if spelled:
+                return spelled
+        return word
+
+
+_lemmatizer = None
+
+
+def get_lemmatizer():
+    global _lemmatizer
+    if _lemmatizer is None:
+        _lemmatizer = Lemmatizer()
+    return _lemmatizer
+
+
+# ─────────────────────────────────────────────────────────────
+# Historique (SQLite) & Stats (JSON)
 # ─────────────────────────────────────────────────────────────
 def load_json(path):
     if path.exists():
@@ -168,304 +572,2521 @@ def load_json(path):
 
 
 def save_json(path, data):
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """Écriture atomique : fichier temporaire voisin puis os.replace.
+
+    Un lecteur voit l'ancien ou le nouveau contenu, jamais un fichier tronqué.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+# Dates de l'historique stockées en secondes epoch (entiers)
+EPOCH_FIELDS = ('date_added', 'last_lookup', 'next_revision')
+
+
+def to_epoch(value):
+    """Convertit une date (epoch, ISO 8601 ou None) en secondes epoch entières."""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return 0
+
+
+class HistoryStore:
+    """Historique des traductions dans SQLite (mode WAL).
+
+    Une ligne par (mot en minuscules, langue source), avec un index unique
+    sur cette clé : la mise à jour d'un mot coûte O(log n) au lieu de
+    réécrire tout le fichier. Le contenu de l'entrée est conservé en JSON
+    dans la colonne `data` ; les champs courts utilisés par les listes et
+    les statistiques sont recopiés dans des colonnes (voir HistoryRecord).
+    Les agrégats des statistiques (mots par niveau, mots difficiles, activité
+    par jour) sont tenus à jour par des triggers à chaque écriture.
+    Les statistiques de révision sont des compteurs de la table `meta`,
+    incrémentés dans une transaction. Les entrées lues portent une `version`
+    (écriture optimiste, voir ConflictError). Au premier lancement, les
+    anciens `historique_traductions.json` et `stats_revision.json` sont
+    importés (les fichiers ne sont pas modifiés).
+    """
+
+    SCHEMA_VERSION = 7
+
+    STATS_DEFAULTS = {
+        'total_sessions': 0,
+        'total_words_reviewed': 0,
+        'total_correct': 0,
+        'total_incorrect': 0,
+        'streak_days': 0,
+        'last_session': None,
+    }
 
+    def __init__(self, path=HISTORY_DB, legacy_json=HISTORY_FILE, legacy_stats=STATS_FILE):
+        self.path = path
+        self.search_index = None     # construit à la demande (get_search_index)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate_schema()
+        if legacy_json is not None:
+            self._import_json(legacy_json)
+        if legacy_stats is not None:
+            self._import_stats(legacy_stats)
+
+    def _migrate_schema(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        with self.transaction():
+            if version < 1:
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS history (
+                        id INTEGER PRIMARY KEY,
+                        word TEXT NOT NULL,
+                        word_key TEXT NOT NULL,
+                        src_lang TEXT NOT NULL,
+                        data TEXT NOT NULL
+                    )""")
+                self._conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_history_key ON history(word_key, src_lang)")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            if version < 2:
+                # File de révision : échéance en epoch (entier) et score indexés
+                self._conn.execute(
+                    "ALTER TABLE history ADD COLUMN next_revision_ts INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute(
+                    "ALTER TABLE history ADD COLUMN revision_score INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_due ON history(next_revision_ts)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_score ON history(revision_score)")
+            if version < 3:
+                # Champs courts lisibles sans décoder le JSON (HistoryRecord)
+                for column, kind in (('main_translation', "TEXT NOT NULL DEFAULT ''"),
+                                     ('tgt_lang', "TEXT NOT NULL DEFAULT ''"),
+                                     ('lookup_count', 'INTEGER NOT NULL DEFAULT 0'),
+                                     ('times_correct', 'INTEGER NOT NULL DEFAULT 0'),
+                                     ('times_incorrect', 'INTEGER NOT NULL DEFAULT 0')):
+                    self._conn.execute(f"ALTER TABLE history ADD COLUMN {column} {kind}")
+            if version < 5:
+                # Numéro de modification croissant : exports incrémentaux
+                self._conn.execute("ALTER TABLE history ADD COLUMN updated_seq INTEGER NOT NULL DEFAULT 0")
+                self._conn.execute("UPDATE history SET updated_seq = id")
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_history_changes ON history(src_lang, updated_seq)")
+            if version < 6:
+                # Version de chaque entrée : écritures optimistes (ConflictError)
+                self._conn.execute("ALTER TABLE history ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            if version < 7:
+                # MAX(updated_seq) à chaque écriture : lu dans l'index, sans parcours
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_seq ON history(updated_seq)")
+            if 1 <= version < 3:
+                # Colonnes ajoutées depuis : recopiées depuis le JSON de chaque entrée
+                for (data,) in self._conn.execute("SELECT data FROM history").fetchall():
+                    self._upsert(json.loads(data))
+            if version < 4:
+                self._create_aggregates()
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _create_aggregates(self):
+        """Tables d'agrégats + triggers qui les maintiennent, puis calcul initial."""
+        execute = self._conn.execute
+        execute("CREATE INDEX IF NOT EXISTS idx_history_lookups ON history(lookup_count)")
+        execute("CREATE INDEX IF NOT EXISTS idx_history_difficult ON history(times_incorrect - times_correct) "
+                "WHERE times_incorrect > times_correct")
+        execute("""
+            CREATE TABLE IF NOT EXISTS score_buckets (
+                score INTEGER PRIMARY KEY,
+                words INTEGER NOT NULL DEFAULT 0,
+                difficult INTEGER NOT NULL DEFAULT 0
+            )""")
+        execute("""
+            CREATE TABLE IF NOT EXISTS daily_activity (
+                day TEXT PRIMARY KEY,
+                added INTEGER NOT NULL DEFAULT 0,
+                lookups INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                incorrect INTEGER NOT NULL DEFAULT 0
+            )""")
+        bucket_in = """
+            INSERT INTO score_buckets (score, words, difficult)
+            VALUES (NEW.revision_score, 1, NEW.times_incorrect > NEW.times_correct)
+            ON CONFLICT(score) DO UPDATE SET words = words + 1, difficult = difficult + excluded.difficult;"""
+        bucket_out = """
+            UPDATE score_buckets SET words = words - 1,
+                difficult = difficult - (OLD.times_incorrect > OLD.times_correct)
+            WHERE score = OLD.revision_score;"""
+        activity = """
+            INSERT INTO daily_activity (day, added, lookups, correct, incorrect)
+            VALUES (date('now', 'localtime'), {added}, {lookups}, {correct}, {incorrect})
+            ON CONFLICT(day) DO UPDATE SET added = added + excluded.added,
+                lookups = lookups + excluded.lookups, correct = correct + excluded.correct,
+                incorrect = incorrect + excluded.incorrect;"""
+        execute(f"""
+            CREATE TRIGGER IF NOT EXISTS history_stats_insert AFTER INSERT ON history BEGIN
+                {bucket_in}
+                {activity.format(added=1, lookups='NEW.lookup_count', correct='NEW.times_correct',
+                                 incorrect='NEW.times_incorrect')}
+            END""")
+        execute(f"""
+            CREATE TRIGGER IF NOT EXISTS history_stats_level AFTER UPDATE ON history
+            WHEN OLD.revision_score != NEW.revision_score
+              OR (OLD.times_incorrect > OLD.times_correct) != (NEW.times_incorrect > NEW.times_correct)
+            BEGIN
+                {bucket_out}
+                {bucket_in}
+            END""")
+        execute(f"""
+            CREATE TRIGGER IF NOT EXISTS history_stats_activity AFTER UPDATE ON history
+            WHEN OLD.lookup_count != NEW.lookup_count OR OLD.times_correct != NEW.times_correct
+              OR OLD.times_incorrect != NEW.times_incorrect
+            BEGIN
+                {activity.format(added=0, lookups='max(NEW.lookup_count - OLD.lookup_count, 0)',
+                                 correct='max(NEW.times_correct - OLD.times_correct, 0)',
+                                 incorrect='max(NEW.times_incorrect - OLD.times_incorrect, 0)')}
+            END""")
+        execute(f"""
+            CREATE TRIGGER IF NOT EXISTS history_stats_delete AFTER DELETE ON history BEGIN
+                {bucket_out}
+            END""")
+
+        # Historique existant : niveaux exacts, activité rattachée au jour d'ajout
+        execute("DELETE FROM score_buckets")
+        execute("INSERT INTO score_buckets (score, words, difficult) "
+                "SELECT revision_score, COUNT(*), SUM(times_incorrect > times_correct) "
+                "FROM history GROUP BY revision_score")
+        days = {}
+        for data, lookups, correct, incorrect in execute(
+                "SELECT data, lookup_count, times_correct, times_incorrect FROM history").fetchall():
+            added = json.loads(data).get('date_added')
+            day = datetime.fromtimestamp(to_epoch(added)).date().isoformat() if added else None
+            if day:
+                row = days.setdefault(day, [0, 0, 0, 0])
+                for i, n in enumerate((1, lookups, correct, incorrect)):
+                    row[i] += n
+        execute("DELETE FROM daily_activity")
+        self._conn.executemany("INSERT INTO daily_activity VALUES (?, ?, ?, ?, ?)",
+                               [(day, *row) for day, row in days.items()])
+
+    def transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def close(self):
+        """Ferme la connexion (attend la fin de l'opération en cours)."""
+        with self._lock:
+            self._conn.close()
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.transaction():
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    def load_stats(self):
+        stats = dict(self.STATS_DEFAULTS)
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM meta WHERE key LIKE 'stats.%'").fetchall()
+        for key, value in rows:
+            name = key[len('stats.'):]
+            stats[name] = value if name == 'last_session' else int(value)
+        return stats
+
+    def record_session(self, reviewed, correct, incorrect, when=None):
+        """Ajoute une session de révision aux compteurs (incréments atomiques)."""
+        when = when or datetime.now().isoformat()
+        with self.transaction():
+            for name, n in (('total_sessions', 1), ('total_words_reviewed', reviewed),
+                            ('total_correct', correct), ('total_incorrect', incorrect)):
+                self._conn.execute(
+                    "INSERT INTO meta VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value",
+                    (f'stats.{name}', n))
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('stats.last_session', ?)", (when,))
+
+    def _import_stats(self, path):
+        with self.transaction():
+            done = self._conn.execute("SELECT value FROM meta WHERE key='stats_imported'").fetchone()
+            if done or not Path(path).exists():
+                return
+            for name, value in load_json(Path(path)).items():
+                if name in self.STATS_DEFAULTS and value is not None:
+                    self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (f'stats.{name}', value))
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('stats_imported', ?)",
+                               (datetime.now().isoformat(),))
+
+    def _import_json(self, path):
+        with self.transaction():
+            done = self._conn.execute("SELECT value FROM meta WHERE key='json_imported'").fetchone()
+            if done or not Path(path).exists():
+                return
+            entries = load_json(Path(path))
+            for entry in entries:
+                self._upsert(entry)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('json_imported', ?)",
+                               (datetime.now().isoformat(),))
+
+    @staticmethod
+    def key(word):
+        return word.lower()
+
+    def _upsert(self, entry):
+        """Écrit une entrée ; retourne son identifiant et met à jour entry['version'].
+
+        Une entrée lue depuis le store porte sa `version` : l'écriture n'a lieu
+        que si la ligne n'a pas changé entre-temps, sinon ConflictError. Sans
+        `version` (entrée neuve ou import), la dernière écriture l'emporte.
+        """
+        for field in EPOCH_FIELDS:
+            if field in entry:
+                entry[field] = to_epoch(entry[field])
+        key = (self.key(entry['word']), entry['src_lang'])
+        expected = entry.get('version')
+        data = json.dumps({k: v for k, v in entry.items() if k != 'version'}, ensure_ascii=False)
+        values = (entry['word'], data, entry.get('next_revision', 0), entry.get('revision_score', 0),
+                  str(entry.get('main_translation') or ''), entry.get('tgt_lang', ''),
+                  entry.get('lookup_count', 0), entry.get('times_correct', 0), entry.get('times_incorrect', 0))
+        if expected is None:
+            self._conn.execute(
+                "INSERT INTO history (word, data, next_revision_ts, revision_score, main_translation, "
+                "tgt_lang, lookup_count, times_correct, times_incorrect, word_key, src_lang, updated_seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, "
+                "(SELECT COALESCE(MAX(updated_seq), 0) + 1 FROM history)) "
+                "ON CONFLICT(word_key, src_lang) DO UPDATE SET word=excluded.word, data=excluded.data, "
+                "next_revision_ts=excluded.next_revision_ts, revision_score=excluded.revision_score, "
+                "main_translation=excluded.main_translation, tgt_lang=excluded.tgt_lang, "
+                "lookup_count=excluded.lookup_count, times_correct=excluded.times_correct, "
+                "times_incorrect=excluded.times_incorrect, updated_seq=excluded.updated_seq, "
+                "version=history.version + 1",
+                values + key)
+        else:
+            updated = self._conn.execute(
+                "UPDATE history SET word=?, data=?, next_revision_ts=?, revision_score=?, "
+                "main_translation=?, tgt_lang=?, lookup_count=?, times_correct=?, times_incorrect=?, "
+                "updated_seq=(SELECT COALESCE(MAX(updated_seq), 0) + 1 FROM history), version=version + 1 "
+                "WHERE word_key=? AND src_lang=? AND version=?",
+                values + key + (expected,))
+            if updated.rowcount == 0:
+                raise ConflictError(entry['word'], entry['src_lang'], expected)
+        entry_id, entry['version'] = self._conn.execute(
+            "SELECT id, version FROM history WHERE word_key=? AND src_lang=?", key).fetchone()
+        return entry_id
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def all(self):
+        """Toutes les entrées, dans l'ordre d'ajout (sans `version` : réécriture sans contrôle)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM history ORDER BY id").fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_rows(self):
+        """(id, entrée) pour toutes les entrées, sans tout garder en mémoire."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM history ORDER BY id")
+            for entry_id, data in rows:
+                yield entry_id, json.loads(data)
+
+    def records(self, limit=None, newest_first=False):
+        """Champs courts de chaque entrée (HistoryRecord), sans décoder le JSON."""
+        sql = f"SELECT {HistoryRecord.COLUMNS} FROM history ORDER BY id"
+        if newest_first:
+            sql += " DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql).fetchall()
+        return [HistoryRecord(self, *row) for row in rows]
+
+    def _query_records(self, where, order, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {HistoryRecord.COLUMNS} FROM history {where} ORDER BY {order} LIMIT ?",
+                (limit,)).fetchall()
+        return [HistoryRecord(self, *row) for row in rows]
+
+    def stats_summary(self, top=5, difficult=5, mastered=8):
+        """Agrégats des statistiques, lus depuis les tables tenues à jour et les index.
+
+        Le coût ne dépend que de `top` / `difficult` / `mastered`, pas de la
+        taille de l'historique.
+        """
+        with self._lock:
+            buckets = dict(self._conn.execute(
+                "SELECT score, words FROM score_buckets WHERE words > 0").fetchall())
+            difficult_count = self._conn.execute(
+                "SELECT COALESCE(SUM(difficult), 0) FROM score_buckets").fetchone()[0]
+        return {
+            'words': sum(buckets.values()),
+            'score_buckets': buckets,
+            'difficult_count': difficult_count,
+            'mastered_count': sum(n for score, n in buckets.items() if score >= 4),
+            'top': self._query_records("", "lookup_count DESC", top),
+            'difficult': self._query_records("WHERE times_incorrect > times_correct",
+                                             "times_incorrect - times_correct DESC", difficult),
+            'mastered': self._query_records("WHERE revision_score >= 4", "revision_score DESC", mastered),
+        }
 
-def load_history():
-    return load_json(HISTORY_FILE)
+    def activity(self, period='day', limit=7):
+        """Activité récente par jour ('day') ou par semaine, lundi → dimanche ('week'), la plus récente d'abord.
+
+        Retourne [(période, ajoutés, recherches, réponses justes, fausses)].
+        """
+        key = "day" if period == 'day' else "strftime('%Y-S%W', day)"
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {key} AS period, SUM(added), SUM(lookups), SUM(correct), SUM(incorrect) "
+                f"FROM daily_activity GROUP BY period ORDER BY period DESC LIMIT ?", (limit,)).fetchall()
+
+    def last_change(self):
+        """Numéro de la dernière modification (0 si l'historique est vide)."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(updated_seq), 0) FROM history").fetchone()[0]
+
+    def iter_changes(self, since=0, until=None, chunk=500, raw=False):
+        """Entrées modifiées après `since` (et jusqu'à `until`), par morceaux de `chunk`.
+
+        Regroupées par langue source puis dans l'ordre des modifications ;
+        pagination par clé sur l'index (src_lang, updated_seq) : mémoire bornée
+        et verrou relâché entre deux morceaux. Avec `raw`, le JSON stocké est
+        rendu tel quel, sans être décodé.
+        """
+        until = self.last_change() if until is None else until
+        for src_lang in sorted(LANG_MAP):
+            last = since
+            while True:
+                with self._lock:
+                    rows = self._conn.execute(
+                        "SELECT updated_seq, data FROM history "
+                        "WHERE src_lang=? AND updated_seq > ? AND updated_seq <= ? "
+                        "ORDER BY updated_seq LIMIT ?", (src_lang, last, until, chunk)).fetchall()
+                for _, data in rows:
+                    yield data if raw else json.loads(data)
+                if len(rows) < chunk:
+                    break
+                last = rows[-1][0]
+
+    def get_many(self, ids):
+        """Entrées pour une liste d'identifiants, dans le même ordre."""
+        found = {}
+        ids = list(ids)
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT id, data, version FROM history WHERE id IN ({','.join('?' * len(batch))})",
+                    batch)
+                found.update((entry_id, _versioned(data, version)) for entry_id, data, version in rows)
+        return [found[i] for i in ids if i in found]
+
+    def due(self, now, limit):
+        """Les `limit` entrées dont la révision est échue, les plus en retard d'abord."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, version FROM history WHERE next_revision_ts <= ? "
+                "ORDER BY next_revision_ts LIMIT ?", (now, limit)).fetchall()
+        return [_versioned(*row) for row in rows]
+
+    def weakest(self, limit):
+        """Les `limit` entrées au score de révision le plus bas."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, version FROM history ORDER BY revision_score, id LIMIT ?", (limit,)).fetchall()
+        return [_versioned(*row) for row in rows]
+
+    def get(self, word, src_lang):
+        with self._lock:
+            row = self._conn.execute("SELECT data, version FROM history WHERE word_key=? AND src_lang=?",
+                                     (self.key(word), src_lang)).fetchone()
+        return _versioned(*row) if row else None
+
+    def headword(self, word, src_lang):
+        """Graphie enregistrée de `word` s'il est dans l'historique, sinon None."""
+        with self._lock:
+            row = self._conn.execute("SELECT word FROM history WHERE word_key=? AND src_lang=?",
+                                     (self.key(word), src_lang)).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, entry):
+        """Insère ou met à jour une entrée ; retourne son identifiant."""
+        with self.transaction():
+            return self._upsert(entry)
+
+    def upsert_many(self, entries):
+        """Écrit plusieurs entrées dans une seule transaction."""
+        with self.transaction():
+            for entry in entries:
+                self._upsert(entry)
+
+
+class ConflictError(Exception):
+    """L'entrée a été modifiée ailleurs depuis sa lecture (écriture optimiste refusée)."""
+
+    def __init__(self, word, src_lang, version):
+        super().__init__(f"« {word} » ({src_lang}) modifié depuis la version {version}")
+        self.word = word
+        self.src_lang = src_lang
+        self.version = version
+
+
+def _versioned(data, version):
+    entry = json.loads(data)
+    entry['version'] = version
+    return entry
+
+
+class HistoryRecord:
+    """Vue compacte d'une entrée d'historique : les champs courts seulement.
+
+    Les listes, l'historique et les statistiques n'ont besoin que du mot, de
+    sa traduction principale et des compteurs ; ces champs sont lus depuis
+    des colonnes SQLite dans un objet à `__slots__`. Les champs lourds
+    (sens, exemples, expressions...) sont chargés au premier accès via
+    `record['examples']` / `record.get('senses')` ou `record.entry()`.
+    """
+
+    __slots__ = ('id', 'word', 'main_translation', 'src_lang', 'tgt_lang', 'lookup_count',
+                 'revision_score', 'next_revision', 'times_correct', 'times_incorrect',
+                 '_store', '_entry')
+
+    COLUMNS = ("id, word, main_translation, src_lang, tgt_lang, lookup_count, revision_score, "
+               "next_revision_ts, times_correct, times_incorrect")
+
+    def __init__(self, store, entry_id, word, main_translation, src_lang, tgt_lang, lookup_count,
+                 revision_score, next_revision, times_correct, times_incorrect):
+        self._store = store
+        self._entry = None
+        self.id = entry_id
+        self.word = word
+        self.main_translation = main_translation
+        self.src_lang = src_lang
+        self.tgt_lang = tgt_lang
+        self.lookup_count = lookup_count
+        self.revision_score = revision_score
+        self.next_revision = next_revision
+        self.times_correct = times_correct
+        self.times_incorrect = times_incorrect
+
+    def entry(self):
+        """L'entrée complète (dict), chargée une fois à la demande."""
+        if self._entry is None:
+            found = self._store.get_many([self.id])
+            self._entry = found[0] if found else {}
+        return self._entry
+
+    def __getitem__(self, field):
+        if field in self.__slots__ and not field.startswith('_'):
+            return getattr(self, field)
+        return self.entry()[field]
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
 
+    def __repr__(self):
+        return f"HistoryRecord({self.id}, {self.word!r} → {self.main_translation!r})"
 
-def save_history(history):
-    save_json(HISTORY_FILE, history)
 
+class _Transaction:
+    """BEGIN IMMEDIATE … COMMIT (ROLLBACK en cas d'erreur), réentrant par thread."""
 
-def add_to_history(word, result):
-    """Ajoute/met à jour un mot dans l'historique."""
-    history = load_history()
+    def __init__(self, conn, lock):
+        self._conn = conn
+        self._lock = lock
+        self._outer = False
 
-    # Vérifier si le mot existe déjà
-    for entry in history:
-        if entry['word'].lower() == word.lower() and entry['src_lang'] == result['src']:
-            entry['lookup_count'] += 1
-            entry['last_lookup'] = datetime.now().isoformat()
-            save_history(history)
-            return
+    def __enter__(self):
+        self._lock.acquire()
+        self._outer = not self._conn.in_transaction
+        if self._outer:
+            self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
 
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._outer:
+                self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+USER_NAME = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Un store par espace de noms (None = historique par défaut, à côté du script).
+# Au plus USERS_OPEN_MAX utilisateurs restent ouverts : le moins récemment
+# utilisé est fermé au-delà (l'historique par défaut n'est jamais évincé),
+# sauf s'il est en cours d'utilisation (bail pris par history_store).
+_history_stores = OrderedDict()
+_history_leases = Counter()       # utilisateur → blocs history_store en cours
+_history_stores_lock = threading.Lock()
+_current_user = os.environ.get('TRADUCTEUR_UTILISATEUR') or None
+
+
+def use_user(user):
+    """Choisit l'utilisateur par défaut du processus (--utilisateur)."""
+    global _current_user
+    if user is not None and not USER_NAME.match(user):
+        raise ValueError(f"nom d'utilisateur invalide : {user!r}")
+    _current_user = user
+
+
+def _resolve_user(user):
+    user = user or _current_user
+    if user is not None and not USER_NAME.match(user):
+        raise ValueError(f"nom d'utilisateur invalide : {user!r}")
+    return user
+
+
+def _evict_history_stores():
+    """Retire les stores en trop, les moins récents sans bail d'abord ; à fermer hors du verrou."""
+    idle = [name for name in _history_stores if name is not None and not _history_leases[name]]
+    excess = sum(name is not None for name in _history_stores) - USERS_OPEN_MAX
+    return [_history_stores.pop(name) for name in idle[:max(0, excess)]]
+
+
+def _close_stores(stores):
+    # Hors du verrou global : close() attend l'opération en cours du store
+    for store in stores:
+        store.close()
+
+
+def get_history_store(user=None):
+    """Historique de `user` (ou de l'utilisateur courant).
+
+    Chaque utilisateur a sa propre base SQLite dans USERS_DIR : les
+    apprenants d'un même déploiement ne partagent ni données ni verrou
+    d'écriture. L'utilisateur par défaut garde `historique_traductions.db`.
+    Un thread qui garde le store pendant que d'autres utilisateurs sont
+    servis (serveur API) le prend avec history_store, sinon il peut être
+    fermé par éviction.
+    """
+    user = _resolve_user(user)
+    with _history_stores_lock:
+        store = _history_stores.get(user)
+        if store is None:
+            if user is None:
+                store = HistoryStore()
+            else:
+                USERS_DIR.mkdir(exist_ok=True)
+                store = HistoryStore(USERS_DIR / f"{user}.db", legacy_json=None, legacy_stats=None)
+            _history_stores[user] = store
+        _history_stores.move_to_end(user)
+        evicted = _evict_history_stores()
+    _close_stores(evicted)
+    return store
+
+
+@contextmanager
+def history_store(user=None):
+    """Historique de `user`, protégé de l'éviction jusqu'à la fin du bloc."""
+    user = _resolve_user(user)
+    with _history_stores_lock:
+        _history_leases[user] += 1
+    try:
+        yield get_history_store(user)
+    finally:
+        with _history_stores_lock:
+            _history_leases[user] -= 1
+            if not _history_leases[user]:
+                del _history_leases[user]
+            evicted = _evict_history_stores()
+        _close_stores(evicted)
+
+
+def load_history(user=None):
+    return get_history_store(user).all()
+
+
+def save_history(history, user=None):
+    get_history_store(user).upsert_many(history)
+
+
+def make_history_entry(word, result):
+    """Construit une nouvelle entrée d'historique à partir d'un résultat de traduction.
+
+    L'entrée est rangée sous le lemme du résultat ; `word`, s'il en diffère,
+    devient sa première forme rencontrée (`forms`).
+    """
+    now = int(time.time())
+    lemma = result.get('lemma') or word
     entry = {
-        'word': word,
+        'word': lemma,
         'main_translation': result.get('main_translation', ''),
         'translations': result.get('all_translations', []),
         'senses': result.get('senses', []),
-        'synonyms': result.get('synonyms_src', []) + result.get('synonyms_tgt', []),
+        'synonyms': (result.get('synonyms_src') or []) + result.get('synonyms_tgt', []),
         'examples': result.get('examples', [])[:8],
         'phrases': result.get('phrases', [])[:6],
         'src_lang': result['src'],
         'tgt_lang': result['tgt'],
-        'date_added': datetime.now().isoformat(),
-        'last_lookup': datetime.now().isoformat(),
+        'date_added': now,
+        'last_lookup': now,
         'lookup_count': 1,
         'revision_score': 0,
-        'next_revision': datetime.now().isoformat(),
+        'next_revision': now,
         'times_correct': 0,
         'times_incorrect': 0,
     }
-    history.append(entry)
-    save_history(history)
-
-
-def load_stats():
-    data = load_json(STATS_FILE)
-    if not data:
-        data = {
-            'total_sessions': 0,
-            'total_words_reviewed': 0,
-            'total_correct': 0,
-            'total_incorrect': 0,
-            'streak_days': 0,
-            'last_session': None,
+    add_form(entry, word)
+    return entry
+
+
+def add_form(entry, word):
+    """Note une forme fléchie de l'entrée ; True si elle est nouvelle."""
+    if word.lower() == entry['word'].lower():
+        return False
+    forms = entry.setdefault('forms', [])
+    if any(form.lower() == word.lower() for form in forms):
+        return False
+    forms.append(word)
+    return True
+
+
+def add_to_history(word, result, user=None):
+    """Ajoute/met à jour un mot dans l'historique (fusionné avec son lemme)."""
+    store = get_history_store(user)
+    with store.transaction():
+        entry = store.get(result.get('lemma') or word, result['src'])
+        is_new = entry is None
+        if is_new:
+            entry = make_history_entry(word, result)
+            changed = True
+        else:
+            entry['lookup_count'] = entry.get('lookup_count', 0) + 1
+            entry['last_lookup'] = int(time.time())
+            changed = add_form(entry, word)
+        entry_id = store.upsert(entry)
+    if changed and store.search_index is not None:
+        store.search_index.add(entry_id, entry)
+
+
+# ─────────────────────────────────────────────────────────────
+# Index de recherche (plein texte, insensible aux accents)
+# ─────────────────────────────────────────────────────────────
+
+class _FoldTable(dict):
+    """Table pour str.translate, remplie à la demande caractère par caractère."""
+
+    def __missing__(self, code):
+        decomposed = unicodedata.normalize('NFKD', chr(code))
+        folded = ''.join(c for c in decomposed if not unicodedata.combining(c))
+        self[code] = folded
+        return folded
+
+
+_FOLD_TABLE = _FoldTable({ord('ß'): 'ss'})
+
+
+def fold(text):
+    """Minuscules sans accents ni trémas : 'Über' → 'uber', 'Straße' → 'strasse'."""
+    text = text.lower()
+    return text if text.isascii() else text.translate(_FOLD_TABLE)
+
+
+def edit_distance(a, b, limit):
+    """Distance de Levenshtein, ou limit + 1 dès qu'elle dépasse `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SearchIndex:
+    """Index inversé sur les mots, traductions, sens et exemples de l'historique.
+
+    Les termes sont indexés sans accents (`fold`). Une requête combine, pour
+    chaque terme : correspondance exacte, préfixe (liste triée des termes),
+    et seulement si aucune ne trouve rien, sous-chaîne et approximative
+    (distance d'édition) via un index de trigrammes limité au vocabulaire
+    (mot et traductions). Avec un
+    `lemmatizer`, une forme irrégulière trouve aussi son lemme (ging → gehen).
+    Les résultats sont classés par pertinence, pondérée selon le champ qui
+    correspond.
+    """
+
+    # (champ, poids, inclus dans l'index de trigrammes)
+    FIELD_WEIGHTS = {'word': 3.0, 'main_translation': 2.5, 'translations': 2.0,
+                     'senses': 1.0, 'examples': 0.5}
+    VOCABULARY_FIELDS = ('word', 'main_translation', 'translations')
+    FUZZY_SCAN_LIMIT = 2000     # termes lus au plus dans les listes de trigrammes
+    FUZZY_CHECKS = 50           # candidats vérifiés au plus par distance d'édition
+    TOKEN_RE = re.compile(r'\w+')
+
+    def __init__(self, lemmatizer=None):
+        self._postings = {}        # terme → {id: poids}
+        self._sorted_terms = []    # pour la recherche par préfixe
+        self._trigrams = {}        # trigramme → {termes du vocabulaire}
+        self._vocabulary = set()   # termes présents dans l'index de trigrammes
+        self._lock = threading.RLock()
+        self._entry_terms = {}     # id → {termes}, pour la mise à jour
+        self.lemmatizer = lemmatizer
+
+    @classmethod
+    def build(cls, rows, lemmatizer=None):
+        index = cls(lemmatizer)
+        index._bulk = True
+        for entry_id, entry in rows:
+            index.add(entry_id, entry)
+        index._bulk = False
+        index._sorted_terms = sorted(index._postings)
+        return index
+
+    _bulk = False
+
+    def __len__(self):
+        return len(self._entry_terms)
+
+    @staticmethod
+    def _grams(term):
+        padded = f"  {term} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _fields(self, entry):
+        yield 'word', [entry.get('word', '')] + entry.get('forms', [])
+        yield 'main_translation', [entry.get('main_translation') or '']
+        yield 'translations', entry.get('translations', [])
+        yield 'senses', [f"{s.get('meaning', '')} {s.get('translation', '')}" for s in entry.get('senses', [])]
+        yield 'examples', [f"{e.get('original', '')} {e.get('translation', '')}" for e in entry.get('examples', [])]
+
+    def add(self, entry_id, entry):
+        """Indexe (ou réindexe) une entrée."""
+        with self._lock:
+            self._add(entry_id, entry)
+
+    def _add(self, entry_id, entry):
+        if entry_id in self._entry_terms:
+            self._remove(entry_id)
+        terms = set()
+        for field, texts in self._fields(entry):
+            weight = self.FIELD_WEIGHTS[field]
+            vocabulary = field in self.VOCABULARY_FIELDS
+            for text in texts:
+                for term in self.TOKEN_RE.findall(fold(str(text))):
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = {}
+                        if not self._bulk:
+                            bisect.insort(self._sorted_terms, term)
+                    if postings.get(entry_id, 0) < weight:
+                        postings[entry_id] = weight
+                    if vocabulary and term not in self._vocabulary:
+                        self._vocabulary.add(term)
+                        for gram in self._grams(term):
+                            self._trigrams.setdefault(gram, set()).add(term)
+                    terms.add(term)
+        self._entry_terms[entry_id] = terms
+
+    def remove(self, entry_id):
+        with self._lock:
+            self._remove(entry_id)
+
+    def _remove(self, entry_id):
+        for term in self._entry_terms.pop(entry_id, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(entry_id, None)
+            if not postings:
+                del self._postings[term]
+                i = bisect.bisect_left(self._sorted_terms, term)
+                if i < len(self._sorted_terms) and self._sorted_terms[i] == term:
+                    del self._sorted_terms[i]
+                if term in self._vocabulary:
+                    self._vocabulary.discard(term)
+                    for gram in self._grams(term):
+                        self._trigrams[gram].discard(term)
+
+    def _term_matches(self, q, max_terms=200):
+        """{terme de l'index: qualité} pour un terme de requête.
+
+        La recherche approximative (sous-chaîne, distance d'édition) n'est
+        faite que si ni l'exact, ni le lemme, ni le préfixe ne trouvent rien.
+        Elle lit les listes de trigrammes de la plus courte à la plus longue
+        et s'arrête à FUZZY_SCAN_LIMIT termes : les trigrammes très courants
+        (« ein », « ion ») sont ignorés plutôt que de parcourir le vocabulaire.
+        """
+        matches = {}
+        if q in self._postings:
+            matches[q] = 1.0
+        if self.lemmatizer is not None:
+            # Forme irrégulière → lemme indexé (ging → gehen, allons → aller).
+            # Pas de règles de suffixes : sans dictionnaire pour les valider,
+            # elles rapprochent des mots distincts (mes → mer, portes → porter).
+            for lang in LANG_MAP:
+                lemma = self.lemmatizer.irregular_lemma(q, lang)
+                if lemma and fold(lemma) in self._postings:
+                    matches.setdefault(fold(lemma), 0.9)
+        i = bisect.bisect_left(self._sorted_terms, q)
+        for term in self._sorted_terms[i:i + max_terms]:
+            if not term.startswith(q):
+                break
+            matches.setdefault(term, 0.8)
+
+        if len(q) >= 3 and not matches:
+            max_dist = 1 if len(q) <= 5 else 2
+            postings = sorted((self._trigrams.get(gram, set()) for gram in self._grams(q)), key=len)
+            # Candidats : termes des listes les plus courtes, jusqu'à FUZZY_SCAN_LIMIT…
+            shared = Counter()
+            scanned = 0
+            while postings and (not scanned or scanned + len(postings[0]) <= self.FUZZY_SCAN_LIMIT):
+                terms = postings.pop(0)
+                shared.update(terms)
+                scanned += len(terms) or 1
+            # … puis leurs trigrammes restants, comptés par intersection
+            candidates = set(shared)
+            for terms in postings:
+                shared.update(candidates.intersection(terms))
+            # Un terme à distance ≤ d diffère d'au plus 3·d trigrammes de la requête
+            min_shared = len(self._grams(q)) - 3 * max_dist
+            for term, count in shared.most_common(self.FUZZY_CHECKS):
+                if count < min_shared:
+                    break
+                if q in term:
+                    matches[term] = 0.6
+                else:
+                    dist = edit_distance(q, term, max_dist)
+                    if dist <= max_dist:
+                        matches[term] = 0.5 / dist
+        return matches
+
+    def search(self, query, limit=30):
+        """Retourne [(id, score)] triés par pertinence décroissante."""
+        terms = self.TOKEN_RE.findall(fold(query))
+        if not terms:
+            return []
+        with self._lock:
+            return self._search(terms, limit)
+
+    def _search(self, terms, limit):
+        scores = None
+        for q in terms:
+            term_scores = {}
+            for term, quality in self._term_matches(q).items():
+                for entry_id, weight in self._postings[term].items():
+                    score = weight * quality
+                    if score > term_scores.get(entry_id, 0):
+                        term_scores[entry_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                # Tous les termes de la requête doivent correspondre
+                scores = {i: scores[i] + sc for i, sc in term_scores.items() if i in scores}
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+
+_search_index_lock = threading.Lock()
+
+
+def get_search_index(user=None):
+    """Index de recherche construit une fois depuis l'historique, puis tenu à jour."""
+    store = get_history_store(user)
+    with _search_index_lock:
+        if store.search_index is None:
+            store.search_index = SearchIndex.build(store.iter_rows(), get_lemmatizer())
+    return store.search_index
+
+
+def load_stats(user=None):
+    return get_history_store(user).load_stats()
+
+
+# ─────────────────────────────────────────────────────────────
+# Cache persistant des sources (SQLite)
+# ─────────────────────────────────────────────────────────────
+MISSING = object()
+
+
+class LookupCache:
+    """Cache des réponses des sources, partagé entre les exécutions.
+
+    Clé : (source, mot, langue source, langue cible). Les valeurs sont
+    stockées en JSON dans SQLite, avec une durée de vie par source et une
+    éviction LRU au-delà de `max_entries`. Les entrées récentes restent
+    aussi dans un petit LRU en mémoire pour les recherches répétées.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl=None, max_entries=CACHE_MAX_ENTRIES,
+                 memory_entries=CACHE_MEMORY_ENTRIES):
+        self.ttl = dict(CACHE_TTL, **(ttl or {}))
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {}
+        try:
+            self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            # Dossier en lecture seule : cache limité à la session
+            self._conn = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS lookup_cache (
+                source TEXT NOT NULL,
+                word TEXT NOT NULL,
+                src TEXT NOT NULL,
+                tgt TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (source, word, src, tgt)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_access ON lookup_cache(last_access)")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()[0]
+
+    def _count(self, source, hit):
+        counters = self._counters.setdefault(source, [0, 0])
+        counters[0 if hit else 1] += 1
+
+    def get(self, source, word, src, tgt):
+        """Retourne la valeur en cache, ou MISSING."""
+        key = (source, word, src, tgt)
+        now = time.time()
+        ttl = self.ttl.get(source, 7 * DAY)
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None and now - item[1] < ttl:
+                self._memory.move_to_end(key)
+                self._count(source, True)
+                return json.loads(item[0])
+
+            row = self._conn.execute(
+                "SELECT value, created_at FROM lookup_cache "
+                "WHERE source=? AND word=? AND src=? AND tgt=?", key).fetchone()
+            if row is None or now - row[1] >= ttl:
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM lookup_cache WHERE source=? AND word=? AND src=? AND tgt=?", key)
+                    self._size -= 1
+                self._memory.pop(key, None)
+                self._count(source, False)
+                return MISSING
+
+            self._conn.execute(
+                "UPDATE lookup_cache SET last_access=? "
+                "WHERE source=? AND word=? AND src=? AND tgt=?", (now,) + key)
+            self._remember(key, row[0], row[1])
+            self._count(source, True)
+            return json.loads(row[0])
+
+    def set(self, source, word, src, tgt, value):
+        key = (source, word, src, tgt)
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookup_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                key + (payload, now, now))
+            # Taille approximative (un remplacement compte aussi) : recalculée
+            # exactement par _evict() quand elle dépasse la limite.
+            self._size += 1
+            self._remember(key, payload, now)
+            if self._size > self.max_entries:
+                self._evict()
+
+    def _remember(self, key, payload, created_at):
+        self._memory[key] = (payload, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Supprime les entrées expirées puis les moins récemment utilisées."""
+        now = time.time()
+        for source, ttl in self.ttl.items():
+            self._conn.execute("DELETE FROM lookup_cache WHERE source=? AND created_at < ?",
+                               (source, now - ttl))
+        excess = self._conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            # On libère 10 % de marge pour ne pas évincer à chaque insertion
+            excess += self.max_entries // 10
+            self._conn.execute(
+                "DELETE FROM lookup_cache WHERE rowid IN "
+                "(SELECT rowid FROM lookup_cache ORDER BY last_access LIMIT ?)", (excess,))
+        self._size = self._conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()[0]
+
+    def stats(self):
+        """Compteurs hits/misses par source et taille du cache."""
+        with self._lock:
+            per_source = {}
+            for source, (hits, misses) in self._counters.items():
+                total = hits + misses
+                per_source[source] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_ratio': hits / total if total else 0.0,
+                }
+            return {'entries': self._size, 'memory_entries': len(self._memory), 'sources': per_source}
+
+
+# ─────────────────────────────────────────────────────────────
+# Mesures par source (latences, volumes, erreurs)
+# ─────────────────────────────────────────────────────────────
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes (format Prometheus)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # dernière case : +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Borne supérieure du seau contenant le quantile `q` (estimation)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': dict(zip([*map(str, self.buckets), '+Inf'], self.counts)),
         }
-    return data
 
 
-def save_stats(stats):
-    save_json(STATS_FILE, stats)
+class Metrics:
+    """Mesures des sources et du moteur.
+
+    - durées par (source, étape) : 'lookup' (appel complet, cache compris),
+      'network' (HTTP, attente du limiteur et reprises comprises), 'parse' ;
+    - compteurs par source : octets, erreurs, délais dépassés, refus...
+    - ratio de cache repris de LookupCache.stats().
+
+    Les crochets de traçage (`add_hook`) reçoivent un dict par étape mesurée :
+    {'source', 'phase', 'seconds', 'error'}.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = Counter()
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def observe(self, source, phase, seconds, error=None):
+        with self._lock:
+            histogram = self._histograms.get((source, phase))
+            if histogram is None:
+                histogram = self._histograms[(source, phase)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        for hook in self._hooks:
+            try:
+                hook({'source': source, 'phase': phase, 'seconds': seconds, 'error': error})
+            except Exception:
+                pass
+
+    def count(self, source, event, n=1):
+        with self._lock:
+            self._counters[(source, event)] += n
+
+    @contextmanager
+    def span(self, source, phase, count_errors=True):
+        """Mesure la durée du bloc ; une exception levée est comptée puis propagée.
+
+        Un bloc qui en englobe un autre déjà compté (l'appel complet autour
+        du réseau) passe `count_errors=False` : l'erreur n'est comptée qu'une fois.
+        """
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            if count_errors:
+                self.count(source, 'rejected' if isinstance(e, SourceUnavailable) else 'errors')
+            raise
+        finally:
+            self.observe(source, phase, time.perf_counter() - start, error)
+
+    def snapshot(self, cache=None):
+        """Instantané JSON : {source: {'phases': ..., 'counters': ..., 'cache': ...}}."""
+        out = {}
+        with self._lock:
+            for (source, phase), histogram in self._histograms.items():
+                out.setdefault(source, {'phases': {}, 'counters': {}})['phases'][phase] = histogram.snapshot()
+            for (source, event), n in self._counters.items():
+                out.setdefault(source, {'phases': {}, 'counters': {}})['counters'][event] = n
+        if cache is not None:
+            for source, stats in cache.stats()['sources'].items():
+                out.setdefault(source, {'phases': {}, 'counters': {}})['cache'] = stats
+        return out
+
+    def to_prometheus(self, cache=None):
+        """Export au format texte Prometheus (exposition 0.0.4)."""
+        lines = ['# HELP traducteur_source_seconds Durée par source et par étape.',
+                 '# TYPE traducteur_source_seconds histogram']
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            for (source, phase), h in histograms:
+                labels = f'source="{source}",phase="{phase}"'
+                cumulative = 0
+                for bound, n in zip([*map(str, h.buckets), '+Inf'], h.counts):
+                    cumulative += n
+                    lines.append(f'traducteur_source_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'traducteur_source_seconds_sum{{{labels}}} {h.sum:.6f}')
+                lines.append(f'traducteur_source_seconds_count{{{labels}}} {h.count}')
+        lines += ['# HELP traducteur_source_events_total Événements par source (octets, erreurs, délais...).',
+                  '# TYPE traducteur_source_events_total counter']
+        lines += [f'traducteur_source_events_total{{source="{source}",event="{event}"}} {n}'
+                  for (source, event), n in counters]
+        if cache is not None:
+            sources = sorted(cache.stats()['sources'].items())
+            lines += ['# HELP traducteur_cache_requests_total Consultations du cache par source.',
+                      '# TYPE traducteur_cache_requests_total counter']
+            for source, stats in sources:
+                lines.append(f'traducteur_cache_requests_total{{source="{source}",result="hit"}} {stats["hits"]}')
+                lines.append(f'traducteur_cache_requests_total{{source="{source}",result="miss"}} {stats["misses"]}')
+            lines += ['# TYPE traducteur_cache_hit_ratio gauge']
+            lines += [f'traducteur_cache_hit_ratio{{source="{source}"}} {stats["hit_ratio"]:.4f}'
+                      for source, stats in sources]
+        return '\n'.join(lines) + '\n'
+
+
+def _trace_to_stderr(event):
+    status = f" ✗ {event['error']}" if event['error'] else ''
+    print(f"[trace] {event['source']}.{event['phase']} {event['seconds'] * 1000:.1f} ms{status}",
+          file=sys.stderr)
+
+
+_metrics = None
+
+
+def get_metrics():
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+        if os.environ.get('TRADUCTEUR_TRACE'):
+            _metrics.add_hook(_trace_to_stderr)
+    return _metrics
+
+
+# ─────────────────────────────────────────────────────────────
+# Analyse HTML des pages PONS / Glosbe / Linguee
+# ─────────────────────────────────────────────────────────────
+
+class _TagFilter(SoupStrainer):
+    """SoupStrainer qui ne construit que les balises retenues par `predicate(nom, attributs)`.
+
+    Le reste de la page (scripts, navigation, publicités…) est ignoré pendant
+    l'analyse au lieu d'être transformé en arbre. Compatible bs4 4.12
+    (`search_tag`) et ≥ 4.13 (`allow_tag_creation`).
+    """
+
+    def __init__(self, predicate):
+        super().__init__()
+        self.predicate = predicate
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.predicate(name, attrs or {})
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return self.predicate(markup_name, markup_attrs or {})
+
+    def allow_string_creation(self, string):
+        return False
+
+
+def _has_class(attrs, cls):
+    value = attrs.get('class') or ''
+    return cls in (value.split() if isinstance(value, str) else value)
+
+
+GOOGLE_FILTER = _TagFilter(
+    lambda name, attrs: name == 'div' and (_has_class(attrs, 't0') or _has_class(attrs, 'result-container')))
+PONS_FILTER = _TagFilter(lambda name, attrs: name == 'dl')
+GLOSBE_FILTER = _TagFilter(
+    lambda name, attrs: name in ('h3', 'li') or _has_class(attrs, 'translation__example'))
+LINGUEE_FILTER = _TagFilter(
+    lambda name, attrs: name == 'a' and _has_class(attrs, 'dictLink') and _has_class(attrs, 'featured'))
+
+
+def parse_pons_html(html, parser=None, strain=True):
+    """Sens et expressions d'une page PONS.
+
+    `strain=False` et `parser='html.parser'` reproduisent l'analyse complète
+    d'origine (utilisé par le benchmark de comparaison).
+    """
+    result = {'senses': [], 'phrases': []}
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=PONS_FILTER if strain else None)
+
+    for dl in soup.select('dl'):
+        dt = dl.find('dt')
+        dd = dl.find('dd')
+        if not dt or not dd:
+            continue
+
+        dt_text = dt.get_text(' ', strip=True)
+        dd_text = dd.get_text(' ', strip=True)
+        # Nettoyer les marqueurs "French French (Canada)"
+        dd_text = re.sub(r'French\s*(\(Canada\))?\s*', '', dd_text).strip()
+
+        sense_el = dt.select_one('.sense')
+        if sense_el:
+            # Ajouter des espaces entre mots collés : (mehrstöckigesWohnhaus) -> (mehrstöckiges Wohnhaus)
+            meaning = sense_el.get_text(' ', strip=True)
+            meaning = re.sub(r'([a-zäöüß])([A-ZÄÖÜ])', r'\1 \2', meaning)
+            result['senses'].append({
+                'meaning': meaning,
+                'translation': dd_text,
+            })
+        elif len(dt_text) > 3:
+            result['phrases'].append({
+                'phrase': dt_text,
+                'translation': dd_text,
+            })
+
+    return result
+
+
+def parse_linguee_html(html, parser=None, strain=True):
+    """Traductions mises en avant d'une page Linguee (liens `dictLink featured`)."""
+    results = []
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=LINGUEE_FILTER if strain else None)
+    for link in soup.find_all('a', {'class': 'dictLink featured'}):
+        placeholder = link.find('span', {'class': 'placeholder'})
+        text = link.get_text(strip=True)
+        if placeholder:
+            text = text.replace(placeholder.get_text(strip=True), '')
+        if text and text not in results:
+            results.append(text)
+    return results
+
+
+def parse_glosbe_html(html, parser=None, strain=True):
+    """Traductions, définitions et exemples d'une page Glosbe."""
+    result = {'translations': [], 'definitions': [], 'examples': []}
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=GLOSBE_FILTER if strain else None)
+
+    # Traductions principales (h3 tags)
+    for h in soup.select('h3')[:10]:
+        text = h.get_text(strip=True)
+        if text and len(text) < 50:
+            result['translations'].append(text)
+
+    # Définitions : extraire seulement le texte de définition des <li>
+    for li in soup.select('li')[:25]:
+        text = li.get_text(' ', strip=True)
+        # Chercher le pattern : mot_type + feminine/masculine + définition
+        match = re.match(
+            r'^(\w+)\s*(noun|verb|adjective|adverb)\s*(masculine|feminine|neuter)?\s*(.+)',
+            text, re.IGNORECASE
+        )
+        if match:
+            word_type = match.group(2)
+            gender = match.group(3) or ''
+            definition = match.group(4).strip()
+            # Garder seulement la première phrase de la définition
+            definition = re.split(r'[.!]', definition)[0].strip()
+            if definition and 5 < len(definition) < 120:
+                label = f"{word_type}"
+                if gender:
+                    label += f", {gender}"
+                result['definitions'].append({
+                    'type': label,
+                    'definition': definition,
+                })
+
+    # Exemples contextuels réels
+    for ex in soup.select('.translation__example')[:10]:
+        ps = ex.select('p')
+        if len(ps) >= 2:
+            src_text = ps[0].get_text(' ', strip=True)
+            tgt_text = ps[1].get_text(' ', strip=True)
+            if src_text and tgt_text:
+                result['examples'].append({
+                    'original': src_text,
+                    'translation': tgt_text,
+                })
+
+    return result
 
 
 # ─────────────────────────────────────────────────────────────
 # Sources EN LIGNE
 # ─────────────────────────────────────────────────────────────
 
-class GoogleSource:
-    """Google Translate — traduction rapide et fiable."""
+class HttpClient:
+    """Session HTTP partagée par toutes les sources.
+
+    Une seule `requests.Session` avec un pool de connexions keep-alive par
+    hôte : les recherches successives réutilisent les connexions TCP/TLS déjà
+    ouvertes au lieu de refaire DNS + poignées de main à chaque requête.
+    """
+
+    def __init__(self, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                 timeout=(HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+
+_http_client = None
+
+
+def get_http_client():
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
+
+
+class SingleFlight:
+    """Regroupe les appels identiques simultanés (« single-flight »).
+
+    Le premier appelant pour une clé exécute la fonction ; ceux qui arrivent
+    pendant ce temps attendent le même Future et reçoivent une copie du
+    résultat (ou la même exception). Rien n'est gardé après coup : c'est le
+    rôle du cache.
+    """
 
     def __init__(self):
-        self._cache = {}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        """Retourne (résultat, partagé) — `partagé` vaut True pour les appelants en attente."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return copy.deepcopy(future.result()), True
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class SourceUnavailable(Exception):
+    """Source mise en pause (disjoncteur ouvert) ou débit max atteint."""
+
+
+class TokenBucket:
+    """Limiteur de débit à jetons : `rate` requêtes/s, rafales de `burst`.
+
+    Un appel sans jeton disponible réserve le prochain et attend son tour,
+    sauf si l'attente dépasse `max_wait` : il est alors refusé.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=RATE_MAX_WAIT):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait_for = (1 - self._tokens) / self.rate if self._tokens < 1 else 0
+            if wait_for > max_wait:
+                return False
+            self._tokens -= 1
+        if wait_for:
+            time.sleep(wait_for)
+        return True
+
+
+class CircuitBreaker:
+    """Disjoncteur : après `threshold` échecs consécutifs, la source est
+    ignorée pendant `cooldown` secondes, puis une seule requête d'essai
+    décide de la refermer (succès) ou de la rouvrir (échec).
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.cooldown or self._probing:
+                return 'open'
+            return 'half-open'
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self):
+        """Libère la requête d'essai sans verdict (elle n'a pas été envoyée)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class SourceGuard:
+    """Débit, reprises et disjoncteur d'une source en ligne.
+
+    Les erreurs réseau, 429 et 5xx sont retentées (délai exponentiel avec
+    gigue, Retry-After respecté s'il est court) ; seul l'échec final compte
+    pour le disjoncteur. Toute autre exception (redirections en boucle, URL
+    invalide...) compte aussitôt comme un échec. Les autres réponses (200,
+    404...) sont rendues telles quelles.
+    """
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, name, rate, burst, retries=RETRY_ATTEMPTS, backoff=RETRY_BACKOFF,
+                 max_wait=RATE_MAX_WAIT, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(threshold, cooldown)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+
+    def available(self):
+        return self.breaker.state != 'open'
+
+    def call(self, fetch, *args, **kwargs):
+        if not self.breaker.allow():
+            raise SourceUnavailable(f"{self.name} : en pause après des échecs répétés")
+        for attempt in range(self.retries + 1):
+            if not self.bucket.acquire(self.max_wait):
+                # Refus local : ni succès ni échec de la source elle-même
+                self.breaker.release()
+                raise SourceUnavailable(f"{self.name} : débit maximal atteint")
+            retry_after = 0
+            try:
+                r = fetch(*args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                failure = e
+            except Exception:
+                # Sans verdict, une requête d'essai laisserait le disjoncteur ouvert
+                self.breaker.record_failure()
+                raise
+            else:
+                if r.status_code not in self.RETRY_STATUS:
+                    self.breaker.record_success()
+                    return r
+                failure = r
+                retry_after = _retry_after(r)
+            if attempt == self.retries or retry_after > self.max_wait:
+                break
+            delay = self.backoff * 2 ** attempt
+            time.sleep(max(random.uniform(delay / 2, delay * 1.5), retry_after))
+        self.breaker.record_failure()
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class OnlineSource:
+    """Base des sources en ligne : cache, session HTTP, garde et mesures.
+
+    Une erreur de la source donne un résultat vide ; un refus de la garde
+    (débit, disjoncteur) lève SourceUnavailable, pour être signalé.
+    """
+
+    NAME = None
+
+    def __init__(self, cache=None, http=None, guard=None, metrics=None):
+        self.cache = cache
+        self.http = http or get_http_client()
+        self.guard = guard or SourceGuard(self.NAME, **SOURCE_LIMITS[self.NAME])
+        self.metrics = metrics or get_metrics()
+        self.flight = SingleFlight()
+
+    def _single(self, key, func, *args):
+        """Exécute `func` une seule fois pour des requêtes identiques simultanées."""
+        result, shared = self.flight.do(key, func, *args)
+        if shared:
+            self.metrics.count(self.NAME, 'coalesced')
+        return result
+
+    def _get(self, url, **kwargs):
+        with self.metrics.span(self.NAME, 'network'):
+            r = self.guard.call(self.http.get, url, **kwargs)
+        self.metrics.count(self.NAME, 'requests')
+        self.metrics.count(self.NAME, 'bytes', len(r.content))
+        if r.status_code >= 400 and r.status_code != 404:
+            self.metrics.count(self.NAME, 'http_errors')
+        return r
+
+    def _parse(self):
+        return self.metrics.span(self.NAME, 'parse')
+
+
+class GoogleSource(OnlineSource):
+    """Google Translate — traduction rapide et fiable."""
+
+    NAME = 'google'
+    URL = "https://translate.google.com/m"
 
     def translate(self, text, src='de', tgt='fr'):
-        key = (text, src, tgt)
-        if key in self._cache:
-            return self._cache[key]
+        if self.cache:
+            cached = self.cache.get('google', text, src, tgt)
+            if cached is not MISSING:
+                return cached
+        return self._single((text, src, tgt), self._translate, text, src, tgt)
+
+    def _translate(self, text, src, tgt):
+        result = self._fetch(text, src, tgt)
+        if self.cache and result:
+            self.cache.set('google', text, src, tgt, result)
+        return result
+
+    def _fetch(self, text, src, tgt):
+        """Interroge la version mobile de Google Translate (sans clé d'API)."""
+        text = text.strip()
+        if not text or src == tgt:
+            return text or None
         try:
-            result = GoogleTranslator(source=src, target=tgt).translate(text)
-            self._cache[key] = result
-            return result
+            r = self._get(self.URL, params={'sl': src, 'tl': tgt, 'q': text})
+            if r.status_code != 200:
+                return None
+            with self._parse():
+                soup = BeautifulSoup(r.text, HTML_PARSER, parse_only=GOOGLE_FILTER)
+                element = soup.find('div', {'class': 't0'}) or soup.find('div', {'class': 'result-container'})
+                return element.get_text(strip=True) if element else None
+        except SourceUnavailable:
+            raise
         except Exception:
             return None
 
+    def translate_batch(self, texts, src='de', tgt='fr'):
+        """Traduit plusieurs textes courts (mots) en un minimum de requêtes.
+
+        Les doublons et les textes déjà en cache ne sont pas renvoyés à Google ;
+        le reste est envoyé par paquets de lignes (une ligne par texte) sous
+        GOOGLE_MAX_CHARS. Retourne {texte: traduction} pour les textes traduits.
+        """
+        results = {}
+        todo = []
+        for text in dict.fromkeys(t for t in texts if t and '\n' not in t):
+            if self.cache:
+                cached = self.cache.get('google', text, src, tgt)
+                if cached is not MISSING:
+                    results[text] = cached
+                    continue
+            todo.append(text)
+
+        chunk, size = [], 0
+        for text in todo + [None]:
+            if text is not None and size + len(text) + 1 <= GOOGLE_MAX_CHARS:
+                chunk.append(text)
+                size += len(text) + 1
+                continue
+            if chunk:
+                results.update(self._translate_lines(chunk, src, tgt))
+            chunk, size = ([text], len(text) + 1) if text is not None else ([], 0)
+        return results
+
+    def _translate_lines(self, lines, src, tgt):
+        translated = self._fetch('\n'.join(lines), src, tgt) if len(lines) > 1 else None
+        parts = [p.strip() for p in translated.split('\n')] if translated else []
+        if len(parts) == len(lines) and all(parts):
+            if self.cache:
+                for line, part in zip(lines, parts):
+                    self.cache.set('google', line, src, tgt, part)
+        else:
+            # Google a fusionné ou réordonné des lignes : repli mot par mot (mis en cache)
+            parts = [self._single((line, src, tgt), self._translate, line, src, tgt) for line in lines]
+        return {line: part for line, part in zip(lines, parts) if part}
+
 
-class LingueeSource:
+class LingueeSource(OnlineSource):
     """Linguee — traductions multiples d'un mot."""
 
+    NAME = 'linguee'
+
     def get_translations(self, word, src='de', tgt='fr'):
+        if self.cache:
+            cached = self.cache.get('linguee', word, src, tgt)
+            if cached is not MISSING:
+                return cached
+        return self._single((word, src, tgt), self._get_translations, word, src, tgt)
+
+    def _get_translations(self, word, src, tgt):
+        src_l = LANG_MAP[src]['linguee']
+        tgt_l = LANG_MAP[tgt]['linguee']
+        url = (f"https://www.linguee.com/{src_l}-{tgt_l}/search/"
+               f"?source={src_l}&query={requests.utils.quote(word)}")
         try:
-            translator = LingueeTranslator(source=src, target=tgt)
-            results = translator.translate(word)
-            if isinstance(results, list):
-                return results
-            return [results] if results else []
+            r = self._get(url)
+            if r.status_code != 200:
+                return []
+            with self._parse():
+                results = parse_linguee_html(r.text)
+        except SourceUnavailable:
+            raise
         except Exception:
             return []
 
+        if self.cache and results:
+            self.cache.set('linguee', word, src, tgt, results)
+        return results
+
 
-class PONSSource:
+class PONSSource(OnlineSource):
     """PONS Dictionary — définitions par sens et expressions idiomatiques."""
 
+    NAME = 'pons'
+
     def lookup(self, word, src='de', tgt='fr'):
+        if self.cache:
+            cached = self.cache.get('pons', word, src, tgt)
+            if cached is not MISSING:
+                return cached
+        return self._single((word, src, tgt), self._lookup, word, src, tgt)
+
+    def _lookup(self, word, src, tgt):
         src_pons = LANG_MAP[src]['pons']
         tgt_pons = LANG_MAP[tgt]['pons']
         url = f"https://en.pons.com/translate/{src_pons}-{tgt_pons}/{requests.utils.quote(word)}"
 
-        result = {'senses': [], 'phrases': []}
-
         try:
-            r = requests.get(url, headers=HEADERS, timeout=10)
+            r = self._get(url)
             if r.status_code != 200:
-                return result
-
+                return {'senses': [], 'phrases': []}
             # PONS envoie parfois du latin-1 mal déclaré
             r.encoding = r.apparent_encoding or 'utf-8'
-            soup = BeautifulSoup(r.text, 'html.parser')
-
-            for dl in soup.select('dl'):
-                dt = dl.find('dt')
-                dd = dl.find('dd')
-                if not dt or not dd:
-                    continue
-
-                dt_text = dt.get_text(' ', strip=True)
-                dd_text = dd.get_text(' ', strip=True)
-                # Nettoyer les marqueurs "French French (Canada)"
-                dd_text = re.sub(r'French\s*(\(Canada\))?\s*', '', dd_text).strip()
-
-                sense_el = dt.select_one('.sense')
-                if sense_el:
-                    # Ajouter des espaces entre mots collés : (mehrstöckigesWohnhaus) -> (mehrstöckiges Wohnhaus)
-                    meaning = sense_el.get_text(' ', strip=True)
-                    meaning = re.sub(r'([a-zäöüß])([A-ZÄÖÜ])', r'\1 \2', meaning)
-                    result['senses'].append({
-                        'meaning': meaning,
-                        'translation': dd_text,
-                    })
-                elif len(dt_text) > 3:
-                    result['phrases'].append({
-                        'phrase': dt_text,
-                        'translation': dd_text,
-                    })
+            with self._parse():
+                result = parse_pons_html(r.text)
+        except SourceUnavailable:
+            raise
         except Exception:
-            pass
+            return {'senses': [], 'phrases': []}
 
+        if self.cache:
+            self.cache.set('pons', word, src, tgt, result)
         return result
 
 
-class GlosbeSource:
+class GlosbeSource(OnlineSource):
     """Glosbe — exemples contextuels réels tirés de vrais textes."""
 
+    NAME = 'glosbe'
+
     def lookup(self, word, src='de', tgt='fr'):
-        url = f"https://glosbe.com/{src}/{tgt}/{requests.utils.quote(word)}"
-        result = {'translations': [], 'definitions': [], 'examples': []}
+        if self.cache:
+            cached = self.cache.get('glosbe', word, src, tgt)
+            if cached is not MISSING:
+                return cached
+        return self._single((word, src, tgt), self._lookup, word, src, tgt)
 
+    def _lookup(self, word, src, tgt):
+        url = f"https://glosbe.com/{src}/{tgt}/{requests.utils.quote(word)}"
         try:
-            r = requests.get(url, headers=HEADERS, timeout=10)
+            r = self._get(url)
             if r.status_code != 200:
-                return result
-
-            soup = BeautifulSoup(r.text, 'html.parser')
-
-            # Traductions principales (h3 tags)
-            for h in soup.select('h3')[:10]:
-                text = h.get_text(strip=True)
-                if text and len(text) < 50:
-                    result['translations'].append(text)
-
-            # Définitions : extraire seulement le texte de définition des <li>
-            for li in soup.select('li')[:25]:
-                text = li.get_text(' ', strip=True)
-                # Chercher le pattern : mot_type + feminine/masculine + définition
-                match = re.match(
-                    r'^(\w+)\s*(noun|verb|adjective|adverb)\s*(masculine|feminine|neuter)?\s*(.+)',
-                    text, re.IGNORECASE
-                )
-                if match:
-                    word_type = match.group(2)
-                    gender = match.group(3) or ''
-                    definition = match.group(4).strip()
-                    # Garder seulement la première phrase de la définition
-                    definition = re.split(r'[.!]', definition)[0].strip()
-                    if definition and 5 < len(definition) < 120:
-                        label = f"{word_type}"
-                        if gender:
-                            label += f", {gender}"
-                        result['definitions'].append({
-                            'type': label,
-                            'definition': definition,
-                        })
-
-            # Exemples contextuels réels
-            for ex in soup.select('.translation__example')[:10]:
-                ps = ex.select('p')
-                if len(ps) >= 2:
-                    src_text = ps[0].get_text(' ', strip=True)
-                    tgt_text = ps[1].get_text(' ', strip=True)
-                    if src_text and tgt_text:
-                        result['examples'].append({
-                            'original': src_text,
-                            'translation': tgt_text,
-                        })
+                return {'translations': [], 'definitions': [], 'examples': []}
+            with self._parse():
+                result = parse_glosbe_html(r.text)
+        except SourceUnavailable:
+            raise
         except Exception:
-            pass
+            return {'translations': [], 'definitions': [], 'examples': []}
 
+        if self.cache:
+            self.cache.set('glosbe', word, src, tgt, result)
         return result
 
 
 # ─────────────────────────────────────────────────────────────
-# Moteur de traduction (agrégation multi-sources)
+# Dictionnaire hors ligne (index trié, projeté en mémoire)
 # ─────────────────────────────────────────────────────────────
+# Codes ISO 639-3 des fichiers FreeDict (deu-fra.tei) → codes de l'application
+DICT_LANG_CODES = {'deu': 'de', 'ger': 'de', 'de': 'de', 'fra': 'fr', 'fre': 'fr', 'fr': 'fr'}
+TEI_NS = '{http://www.tei-c.org/ns/1.0}'
 
-class TraducteurPro:
-    def __init__(self):
-        self.google = GoogleSource()
-        self.linguee = LingueeSource()
-        self.pons = PONSSource()
-        self.glosbe = GlosbeSource()
 
-    def traduire_mot(self, word, src='de', tgt='fr'):
-        """Traduction complète d'un mot — 4 sources en ligne."""
-        spinner("Google Translate...")
-        main_translation = self.google.translate(word, src, tgt)
+def read_tei_dictionary(path):
+    """(mot, lemme, traductions) d'un dictionnaire FreeDict au format TEI.
+
+    Lecture en flux (iterparse) : chaque <entry> est libérée après usage.
+    Les formes fléchies (<form type="infl">) renvoient au mot vedette.
+    """
+    for _, elem in ElementTree.iterparse(path, events=('end',)):
+        if elem.tag not in (f'{TEI_NS}entry', 'entry'):
+            continue
+        ns = TEI_NS if elem.tag.startswith('{') else ''
+        orths = [(form.get('type'), orth.text.strip())
+                 for form in elem.iter(f'{ns}form')
+                 for orth in form.findall(f'{ns}orth') if orth.text and orth.text.strip()]
+        translations = [quote.text.strip()
+                        for cit in elem.iter(f'{ns}cit') if cit.get('type') in ('trans', 'translation')
+                        for quote in cit.findall(f'{ns}quote') if quote.text and quote.text.strip()]
+        elem.clear()
+        if not orths:
+            continue
+        headword = orths[0][1]
+        yield headword, '', translations
+        for kind, form in orths[1:]:
+            if kind in ('infl', 'inflected') and form != headword:
+                yield form, headword, []
+
 
-        spinner("Linguee...")
-        linguee_trans = self.linguee.get_translations(word, src, tgt)
+def read_tsv_dictionary(path):
+    """(mot, lemme, traductions) d'un fichier `mot<TAB>trad1; trad2[<TAB>lemme]`.
 
-        spinner("PONS Dictionary...")
-        pons_data = self.pons.lookup(word, src, tgt)
+    Les lignes vides ou commençant par # sont ignorées.
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            if not line.strip() or line.startswith('#'):
+                continue
+            cols = line.rstrip('\r\n').split('\t')
+            word = cols[0].strip()
+            translations = [t.strip() for t in re.split(r'[;|]', cols[1])] if len(cols) > 1 else []
+            lemma = cols[2].strip() if len(cols) > 2 else ''
+            if word:
+                yield word, lemma if lemma != word else '', [t for t in translations if t]
+
+
+class _SortedKeys:
+    """Vue séquence des clés de l'index (pour bisect), sans rien décoder."""
+
+    __slots__ = ('_mm', '_offsets')
+
+    def __init__(self, mm, offsets):
+        self._mm = mm
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, i):
+        start = self._offsets[i]
+        return self._mm[start:self._mm.find(b'\t', start)]
+
+
+class OfflineDictionary:
+    """Dictionnaire bilingue local : un fichier d'index trié, projeté en mémoire.
+
+    Format : en-tête (MAGIC, nombre d'entrées), table des positions (uint32),
+    puis une ligne par clé `clé<TAB>mot<TAB>lemme<TAB>trad1<US>trad2…`, triée
+    par clé UTF-8 (minuscules). Une recherche est une dichotomie sur la
+    table : rien n'est chargé en mémoire, le système pagine le fichier et
+    plusieurs processus partagent les mêmes pages.
+    """
+
+    MAGIC = b'TPDICT1\0'
+    HEADER = len(MAGIC) + 8
+    SEP = '\x1f'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(self.MAGIC)] != self.MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path} n'est pas un index de dictionnaire")
+        count = int.from_bytes(self._mm[len(self.MAGIC):self.HEADER], 'little')
+        self._view = memoryview(self._mm)
+        self._offsets = self._view[self.HEADER:self.HEADER + 4 * count].cast('I')
+        self._keys = _SortedKeys(self._mm, self._offsets)
+
+    @staticmethod
+    def key(word):
+        return word.strip().casefold().encode('utf-8')
+
+    @classmethod
+    def build(cls, entries, path):
+        """Écrit l'index trié de `entries` (mot, lemme, traductions) ; retourne le nombre de clés.
+
+        Les entrées de même clé sont fusionnées (traductions dédupliquées).
+        """
+        merged = {}
+        for word, lemma, translations in entries:
+            key = cls.key(word)
+            if not key or b'\t' in key or b'\n' in key:
+                continue
+            known = merged.get(key)
+            if known is None:
+                merged[key] = [word, lemma, list(dict.fromkeys(translations))]
+                continue
+            if translations and known[1]:
+                known[0], known[1] = word, ''      # un vrai mot vedette prime sur une forme
+            for t in translations:
+                if t not in known[2]:
+                    known[2].append(t)
+
+        clean = str.maketrans({'\t': ' ', '\n': ' ', cls.SEP: ' '})
+        records = []
+        for key in sorted(merged):
+            word, lemma, translations = merged[key]
+            translations = cls.SEP.join(t.translate(clean) for t in translations)
+            line = '\t'.join((word.translate(clean), lemma.translate(clean), translations))
+            records.append(key + b'\t' + line.encode('utf-8') + b'\n')
+
+        offsets = array('I')
+        position = cls.HEADER + 4 * len(records)
+        for record in records:
+            offsets.append(position)
+            position += len(record)
+        if position >= 2 ** 32:
+            raise ValueError("dictionnaire trop volumineux pour un index 32 bits")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(cls.MAGIC + len(records).to_bytes(8, 'little'))
+            f.write(offsets.tobytes())
+            f.writelines(records)
+        os.replace(tmp, path)
+        return len(records)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _record(self, i):
+        start = self._offsets[i]
+        line = self._mm[start:self._mm.find(b'\n', start)].decode('utf-8')
+        _, word, lemma, translations = line.split('\t')
+        return word, lemma, translations.split(self.SEP) if translations else []
+
+    def _find(self, key):
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._offsets) and self._keys[i] == key:
+            return i
+        return None
+
+    def lookup(self, word):
+        """{'word', 'lemma', 'translations'} ou None.
+
+        Une forme fléchie sans traduction propre renvoie l'entrée de son lemme.
+        """
+        i = self._find(self.key(word))
+        if i is None:
+            return None
+        headword, lemma, translations = self._record(i)
+        if lemma and not translations:
+            j = self._find(self.key(lemma))
+            if j is not None:
+                headword, _, translations = self._record(j)
+        if not translations:
+            return None
+        return {'word': headword, 'lemma': lemma or headword, 'translations': translations}
 
-        spinner("Glosbe (exemples contextuels)...")
-        glosbe_data = self.glosbe.lookup(word, src, tgt)
+    def lemma(self, word):
+        """Lemme connu de `word` (lui-même s'il est mot vedette), sinon None."""
+        i = self._find(self.key(word))
+        if i is None:
+            return None
+        headword, lemma, _ = self._record(i)
+        return lemma or headword
 
-        # ── Fusionner les traductions (dédupliquer) ──
-        all_translations = []
+    def prefix(self, text, limit=20):
+        """Mots vedettes commençant par `text`, dans l'ordre de l'index."""
+        prefix = self.key(text)
+        if not prefix:
+            return []
+        words = []
         seen = set()
-        sources = ([main_translation] if main_translation else []) + linguee_trans + glosbe_data['translations']
-        for t in sources:
-            if t and t.lower() not in seen:
-                seen.add(t.lower())
-                all_translations.append(t)
-
-        # ── Synonymes via traduction inverse ──
-        synonyms_src = []
-        for t in all_translations[:5]:
+        i = bisect.bisect_left(self._keys, prefix)
+        while i < len(self._offsets) and len(words) < limit:
+            if not self._keys[i].startswith(prefix):
+                break
+            headword, lemma, _ = self._record(i)
+            word = lemma or headword
+            if word not in seen:
+                seen.add(word)
+                words.append(word)
+            i += 1
+        return words
+
+    def close(self):
+        self._offsets.release()
+        self._view.release()
+        self._mm.close()
+
+
+def dictionary_path(src, tgt):
+    return DICT_DIR / f"{src}-{tgt}.idx"
+
+
+_dictionaries = {}
+_dictionaries_lock = threading.Lock()
+
+
+def get_offline_dictionary(src, tgt):
+    """Index hors ligne de la direction src → tgt, ou None s'il n'a pas été construit."""
+    with _dictionaries_lock:
+        if (src, tgt) not in _dictionaries:
+            path = dictionary_path(src, tgt)
+            _dictionaries[(src, tgt)] = OfflineDictionary(path) if path.exists() else None
+        return _dictionaries[(src, tgt)]
+
+
+def install_dictionary(path, src=None, tgt=None):
+    """Indexe un dictionnaire FreeDict (.tei) ou TSV ; retourne (src, tgt, nombre de clés).
+
+    Sans `src`/`tgt`, la direction est lue dans le nom (deu-fra.tei → de → fr).
+    """
+    path = Path(path)
+    if src is None:
+        codes = re.findall(r'[a-z]+', path.name.lower())
+        langs = [DICT_LANG_CODES[c] for c in codes if c in DICT_LANG_CODES]
+        if len(langs) < 2 or langs[0] == langs[1]:
+            raise ValueError(f"direction introuvable dans « {path.name} » : préciser --source et --cible")
+        src, tgt = langs[:2]
+    tgt = tgt or ('fr' if src == 'de' else 'de')
+    reader = read_tei_dictionary if path.suffix.lower() in ('.tei', '.xml') else read_tsv_dictionary
+    with _dictionaries_lock:
+        old = _dictionaries.pop((src, tgt), None)
+    if old is not None:
+        old.close()     # Windows refuse de remplacer un fichier projeté
+    return src, tgt, OfflineDictionary.build(reader(path), dictionary_path(src, tgt))
+
+
+# ─────────────────────────────────────────────────────────────
+# Moteur de traduction (agrégation multi-sources)
+# ─────────────────────────────────────────────────────────────
+
+class WordResult(dict):
+    """Résultat de traduire_mot : un dict, plus le chargement des sections différées.
+
+    `result['pending']` liste les sections pas encore chargées ; `ensure()`
+    les demande au moteur d'origine. Reste sérialisable tel quel (JSON) et
+    copiable (les copies partagent le moteur).
+    """
+
+    def __init__(self, engine, data):
+        super().__init__(data)
+        self._engine = engine
+
+    @property
+    def pending(self):
+        return self['pending']
+
+    def ensure(self, *sections):
+        """Charge les sections demandées (toutes celles en attente par défaut) ; retourne self."""
+        wanted = [name for name in (sections or self['pending']) if name in self['pending']]
+        if wanted:
+            self._engine.completer(self, wanted)
+        return self
+
+    def __deepcopy__(self, memo):
+        return WordResult(self._engine, copy.deepcopy(dict(self), memo))
+
+
+class TraducteurPro:
+    # Nom affiché de chaque source et valeur par défaut si elle ne répond pas
+    SOURCES = {
+        'google': ("Google Translate", None),
+        'linguee': ("Linguee", []),
+        'pons': ("PONS", {'senses': [], 'phrases': []}),
+        'glosbe': ("Glosbe", {'translations': [], 'definitions': [], 'examples': []}),
+    }
+    # Sections d'enrichissement → palier qui les fournit ('synonymes' : traduction inverse)
+    SECTIONS = {
+        'senses': 'pons',
+        'phrases': 'pons',
+        'definitions': 'glosbe',
+        'examples': 'glosbe',
+        'synonyms_src': 'synonymes',
+    }
+
+    def __init__(self, deadline=LOOKUP_DEADLINE, max_workers=MAX_WORKERS, cache=None, http=None,
+                 verbose=True, limits=None, metrics=None, dictionaries=None):
+        self.verbose = verbose
+        self.dictionaries = dictionaries     # {(src, tgt): OfflineDictionary}, None = DICT_DIR
+        self.cache = cache if cache is not None else LookupCache()
+        self.http = http or get_http_client()
+        self.metrics = metrics or get_metrics()
+        limits = SOURCE_LIMITS if limits is None else limits
+
+        def source(cls, name):
+            return cls(self.cache, self.http, SourceGuard(name, **limits[name]), self.metrics)
+        self.google = source(GoogleSource, 'google')
+        self.linguee = source(LingueeSource, 'linguee')
+        self.pons = source(PONSSource, 'pons')
+        self.glosbe = source(GlosbeSource, 'glosbe')
+        self.deadline = deadline
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='source')
+        self._flight = SingleFlight()
+
+    def dictionnaire(self, src, tgt):
+        """Dictionnaire hors ligne de la direction, ou None."""
+        if self.dictionaries is None:
+            return get_offline_dictionary(src, tgt)
+        return self.dictionaries.get((src, tgt))
+
+    def lemme(self, word, src, tgt):
+        """Lemme de `word` : c'est lui qui est envoyé aux sources et mis en cache.
+
+        Le lexique est le dictionnaire hors ligne (qui connaît aussi ses
+        formes fléchies). Sans dictionnaire, seules les formes irrégulières
+        sont normalisées (voir SUFFIX_RULES).
+        """
+        dictionary = self.dictionnaire(src, tgt)
+        if dictionary is None:
+            return get_lemmatizer().lemma(word, src)
+        lemma = dictionary.lemma(word)
+        if lemma:
+            return lemma
+
+        def known(candidate):
+            entry = dictionary.lookup(candidate)
+            return entry['word'] if entry else None
+        return get_lemmatizer().lemma(word, src, known)
+
+    def _hors_ligne(self, word, src, tgt):
+        dictionary = self.dictionnaire(src, tgt)
+        if dictionary is None:
+            return None
+        entry = dictionary.lookup(word)
+        self.metrics.count('dictionnaire', 'hits' if entry else 'misses')
+        return entry
+
+    @classmethod
+    def _donnees_vides(cls):
+        return {name: copy.deepcopy(default) for name, (_, default) in cls.SOURCES.items()}
+
+    def _interroger_sources(self, word, src, tgt, skip=()):
+        """Lance les sources disponibles en parallèle et attend au plus `self.deadline`.
+
+        Les sources dont le disjoncteur est ouvert ne sont pas interrogées,
+        ni celles de `skip` (déjà couvertes par le dictionnaire hors ligne).
+        Retourne (données par source, sources expirées, sources en pause) ;
+        une source refusée par sa garde en cours de route compte en pause.
+        """
+        futures, unavailable = self._lancer_sources(word, src, tgt, skip)
+        done, pending = wait(futures, timeout=self.deadline)
+
+        data = self._donnees_vides()
+        for fut in done:
             try:
-                reverse = self.google.translate(t, tgt, src)
-                if reverse and reverse.lower() != word.lower():
-                    if reverse.lower() not in {s.lower() for s in synonyms_src}:
-                        synonyms_src.append(reverse)
+                data[futures[fut]] = fut.result()
+            except SourceUnavailable:
+                unavailable.append(futures[fut])
             except Exception:
                 pass
+        unavailable.sort(key=list(self.SOURCES).index)
+        return data, self._expirer(futures, pending), unavailable
+
+    def _lancer_sources(self, word, src, tgt, skip=()):
+        """Soumet au pool les sources disponibles ; retourne ({future: source}, sources en pause)."""
+        calls = {
+            'google': (self.google, self.google.translate),
+            'linguee': (self.linguee, self.linguee.get_translations),
+            'pons': (self.pons, self.pons.lookup),
+            'glosbe': (self.glosbe, self.glosbe.lookup),
+        }
+        futures = {}
+        unavailable = []
+        for name, (source, method) in calls.items():
+            if name in skip:
+                continue
+            if source.guard.available():
+                futures[self._pool.submit(self._mesurer, name, method, word, src, tgt)] = name
+            else:
+                unavailable.append(name)
+                self.metrics.count(name, 'skipped')
+        return futures, unavailable
+
+    def _expirer(self, futures, pending):
+        """Abandonne les sources encore en cours ; retourne leurs noms (ordre de SOURCES)."""
+        timed_out = []
+        for fut in pending:
+            # Le thread continue en arrière-plan mais son résultat est ignoré
+            fut.cancel()
+            timed_out.append(futures[fut])
+            self.metrics.count(futures[fut], 'timeouts')
+        timed_out.sort(key=list(self.SOURCES).index)
+        return timed_out
+
+    def _mesurer(self, name, method, *args):
+        with self.metrics.span(name, 'lookup', count_errors=False):
+            return method(*args)
+
+    def metriques(self, fmt='json'):
+        """Mesures des sources : instantané JSON ou texte Prometheus (`fmt='prometheus'`)."""
+        if fmt == 'prometheus':
+            return self.metrics.to_prometheus(self.cache)
+        return self.metrics.snapshot(self.cache)
+
+    def synonymes_inverses(self, word, translations, src, tgt):
+        """Mots proches en langue source : traduction inverse des 5 premières traductions.
+
+        Une seule requête groupée (translate_batch), dédoublonnage en une passe.
+        """
+        candidates = translations[:5]
+        reverse = self.google.translate_batch(candidates, tgt, src)
+        synonyms = []
+        seen = {word.lower()}
+        for t in candidates:
+            r = reverse.get(t)
+            if r and r.lower() not in seen:
+                seen.add(r.lower())
+                synonyms.append(r)
+        return synonyms
+
+    def completer_synonymes(self, result):
+        """Calcule les synonymes différés d'un résultat (synonyms_src à None)."""
+        if isinstance(result, WordResult):
+            return result.ensure('synonyms_src')
+        if result.get('synonyms_src') is None:
+            self._synonymes(result)
+        return result
 
-        print(f"\r  {Fore.GREEN}✓ Données agrégées de 4 sources en ligne.{Style.RESET_ALL}          ")
+    def _synonymes(self, result):
+        try:
+            result['synonyms_src'] = self.synonymes_inverses(
+                result.get('lemma') or result['word'], result['all_translations'], result['src'], result['tgt'])
+        except SourceUnavailable:
+            result['synonyms_src'] = []
+            if 'google' not in result.get('unavailable', []):
+                result['unavailable'] = result.get('unavailable', []) + ['google']
+
+    def traduire_mot(self, word, src='de', tgt='fr', synonyms=True, enrich=True, sections=None):
+        """Traduction d'un mot, par paliers.
+
+        Palier principal : traduction et alternatives (dictionnaire hors
+        ligne, sinon Google Translate + Linguee). Paliers d'enrichissement :
+        sens et expressions (PONS), définitions et exemples (Glosbe),
+        synonymes (traduction inverse). Tous les paliers demandés sont
+        interrogés en parallèle.
+
+        `sections` (clés de SECTIONS) choisit l'enrichissement ; par défaut
+        tout, sauf les synonymes si `synonyms=False`, et rien si
+        `enrich=False` — un mot du dictionnaire est alors rendu sans aucun
+        accès réseau. Le résultat (WordResult) liste dans `pending` les
+        sections non chargées ; `result.ensure(...)` les charge à la demande.
+
+        Une forme fléchie est recherchée sous son lemme (`lemma` dans le
+        résultat) : ging, gehe et gegangen partagent le cache de gehen.
+
+        Les appels simultanés pour le même mot (API, documents) partagent une
+        seule recherche ; chacun reçoit sa propre copie du résultat. Pour
+        afficher chaque source dès son arrivée, voir traduire_mot_flux.
+        """
+        if sections is None:
+            sections = [name for name in self.SECTIONS if name != 'synonyms_src' or synonyms] if enrich else []
+        sections = tuple(sorted(sections))
+        result, shared = self._flight.do((word, src, tgt, sections), self._traduire_mot,
+                                         word, src, tgt, sections)
+        if shared:
+            self.metrics.count('moteur', 'coalesced')
+        return result
 
-        return {
-            'word': word,
-            'main_translation': main_translation or (all_translations[0] if all_translations else '?'),
-            'all_translations': all_translations,
-            'senses': pons_data['senses'],
-            'phrases': pons_data['phrases'],
-            'definitions': glosbe_data['definitions'],
-            'examples': glosbe_data['examples'],
-            'synonyms_src': synonyms_src,
-            'synonyms_tgt': all_translations[1:] if len(all_translations) > 1 else [],
+    def _traduire_mot(self, word, src, tgt, sections):
+        form, word = word, self.lemme(word, src, tgt)
+        if word != form:
+            self.metrics.count('moteur', 'lemmatized')
+        tiers = {self.SECTIONS[name] for name in sections}
+        local = self._hors_ligne(word, src, tgt)
+        names = [name for name in self.SOURCES
+                 if name in tiers or (name in ('google', 'linguee') and not local)]
+        data, timed_out, unavailable = self._interroger(word, src, tgt, names, local)
+        result = self._nouveau_resultat(form, word, local, src, tgt)
+        result['timed_out'] = timed_out
+        result['unavailable'] = unavailable
+        self._recalculer(result, local, data)
+        self._appliquer_paliers(result, data, tiers)
+        return result
+
+    def traduire_mot_flux(self, word, src='de', tgt='fr', synonyms=True):
+        """Traduction complète d'un mot, publiée source par source.
+
+        Générateur de (étape, sections, résultat) : 'principal' dès que la
+        traduction principale est connue (dictionnaire hors ligne ou Google),
+        puis 'linguee', 'pons', 'glosbe' dans leur ordre d'arrivée,
+        'synonymes' et enfin 'fin'. `sections` liste les clés complétées à
+        cette étape ; le résultat est un seul WordResult, complété au fil de
+        l'eau. Une source lente ne retarde donc plus l'affichage des autres.
+        """
+        form, word = word, self.lemme(word, src, tgt)
+        local = self._hors_ligne(word, src, tgt)
+        result = self._nouveau_resultat(form, word, local, src, tgt)
+        data = self._donnees_vides()
+        started = time.perf_counter()
+        futures, unavailable = self._lancer_sources(word, src, tgt, ('google', 'linguee') if local else ())
+
+        main_ready = bool(local)
+        held = []             # sources arrivées avant la traduction principale
+        published = []
+        if main_ready:
+            self._recalculer(result, local, data)
+            yield 'principal', ('main_translation', 'all_translations'), result
+        timed_out = []
+        try:
+            for fut in as_completed(futures, timeout=self.deadline):
+                name = futures[fut]
+                try:
+                    data[name] = fut.result()
+                except SourceUnavailable:
+                    unavailable.append(name)
+                except Exception:
+                    pass
+                if name == 'google':
+                    main_ready = True
+                    self._recalculer(result, local, data)
+                    yield 'principal', ('main_translation',), result
+                    names, held = held, []
+                elif main_ready:
+                    names = [name]
+                else:
+                    held.append(name)
+                    names = []
+                for other in names:
+                    published.append(other)
+                    yield self._publier(result, local, data, other)
+        except FuturesTimeout:
+            timed_out = self._expirer(futures, [fut for fut in futures if not fut.done()])
+        self.metrics.observe('moteur', 'sources', time.perf_counter() - started)
+
+        if not main_ready:
+            # Google n'a pas répondu : la principale vient des autres sources
+            self._recalculer(result, local, data)
+            yield 'principal', ('main_translation',), result
+            for other in held:
+                published.append(other)
+                yield self._publier(result, local, data, other)
+        result['timed_out'] = timed_out
+        result['unavailable'] = sorted(unavailable, key=list(self.SOURCES).index)
+        self._appliquer_paliers(result, data, {'pons', 'glosbe'} - set(published))
+        if synonyms:
+            self._appliquer_paliers(result, data, {'synonymes'})
+            yield 'synonymes', ('synonyms_src',), result
+        yield 'fin', (), result
+
+    # Clés complétées par chaque source, pour traduire_mot_flux
+    PUBLISHED_SECTIONS = {
+        'linguee': ('all_translations',),
+        'pons': ('senses', 'phrases'),
+        'glosbe': ('all_translations', 'definitions', 'examples'),
+    }
+
+    def _publier(self, result, local, data, name):
+        self._appliquer_paliers(result, data, {name})
+        self._recalculer(result, local, data)
+        return name, self.PUBLISHED_SECTIONS[name], result
+
+    def _nouveau_resultat(self, form, lemma, local, src, tgt):
+        return WordResult(self, {
+            'word': form,
+            'lemma': lemma,
+            'main_translation': '?',
+            'all_translations': [],
+            'senses': [],
+            'phrases': [],
+            'definitions': [],
+            'examples': [],
+            'synonyms_src': None,
+            'synonyms_tgt': [],
+            'pending': sorted(self.SECTIONS),
+            'timed_out': [],
+            'unavailable': [],
+            'offline': bool(local),
             'src': src,
             'tgt': tgt,
-        }
+        })
+
+    def _recalculer(self, result, local, data):
+        """Traduction principale et liste fusionnée, d'après les sources arrivées."""
+        main_translation = local['translations'][0] if local else data['google']
+        first = local['translations'] if local else ([main_translation] if main_translation else [])
+        translations = self._fusionner_traductions(first, data['linguee'], data['glosbe']['translations'])
+        result['main_translation'] = main_translation or (translations[0] if translations else '?')
+        result['all_translations'] = translations
+        result['synonyms_tgt'] = translations[1:]
+
+    def completer(self, result, sections):
+        """Charge dans `result` les sections en attente demandées (voir WordResult.ensure)."""
+        tiers = {self.SECTIONS[name] for name in sections if name in result['pending']}
+        names = [name for name in self.SOURCES if name in tiers]
+        data, timed_out, unavailable = self._interroger(result['lemma'], result['src'], result['tgt'], names)
+        result['timed_out'] = result['timed_out'] + timed_out
+        result['unavailable'] = result['unavailable'] + unavailable
+        self._appliquer_paliers(result, data, tiers)
+        return result
 
-    def traduire_phrase(self, sentence, src=None, tgt=None):
-        """Traduit une phrase complète avec analyse mot à mot."""
+    def _interroger(self, word, src, tgt, names, local=None):
+        """Interroge les sources `names` (avec messages si verbose) ; voir _interroger_sources."""
+        if not names:
+            if self.verbose and local:
+                print(f"  {Fore.GREEN}✓ Dictionnaire hors ligne.{Style.RESET_ALL}")
+            return self._donnees_vides(), [], []
+        if self.verbose:
+            spinner(' • '.join(self.SOURCES[name][0] for name in names) + "...")
+        skip = [name for name in self.SOURCES if name not in names]
+        with self.metrics.span('moteur', 'sources'):
+            data, timed_out, unavailable = self._interroger_sources(word, src, tgt, skip)
+
+        missing = timed_out + unavailable
+        if self.verbose and missing:
+            answered = len(names) - len(missing)
+            notes = []
+            if timed_out:
+                notes.append("délai dépassé : " + ', '.join(self.SOURCES[name][0] for name in timed_out))
+            if unavailable:
+                notes.append("en pause : " + ', '.join(self.SOURCES[name][0] for name in unavailable))
+            print(f"\r  {Fore.YELLOW}⚠ Données agrégées de {answered} source(s) — {' ; '.join(notes)}.{Style.RESET_ALL}          ")
+        elif self.verbose:
+            extra = " + dictionnaire hors ligne" if local else ""
+            print(f"\r  {Fore.GREEN}✓ Données agrégées de {len(names)} source(s) en ligne{extra}.{Style.RESET_ALL}          ")
+        return data, timed_out, unavailable
+
+    @staticmethod
+    def _fusionner_traductions(*lists):
+        merged = []
+        seen = set()
+        for translations in lists:
+            for t in translations:
+                if t and t.lower() not in seen:
+                    seen.add(t.lower())
+                    merged.append(t)
+        return merged
+
+    def _appliquer_paliers(self, result, data, tiers):
+        """Verse les données des paliers `tiers` dans `result` et les retire de `pending`."""
+        if 'pons' in tiers:
+            result['senses'] = data['pons']['senses']
+            result['phrases'] = data['pons']['phrases']
+        if 'glosbe' in tiers:
+            result['definitions'] = data['glosbe']['definitions']
+            result['examples'] = data['glosbe']['examples']
+            result['all_translations'] = self._fusionner_traductions(
+                result['all_translations'], data['glosbe']['translations'])
+            result['synonyms_tgt'] = result['all_translations'][1:]
+        # Les synonymes partent des traductions : après la fusion Glosbe
+        if 'synonymes' in tiers:
+            self._synonymes(result)
+        result['pending'] = [name for name in result['pending'] if self.SECTIONS[name] not in tiers]
+
+    def traduire_phrase(self, sentence, src=None, tgt=None, interactive=True):
+        """Traduit une phrase complète avec analyse mot à mot.
+
+        Si la détection est incertaine, demande la direction à l'utilisateur —
+        ou garde la plus probable si `interactive=False` (API, documents).
+        """
+        confidence = None
         if src is None:
-            src, tgt = detect_language(sentence)
-            if src is None:
+            src, tgt, confidence = get_language_detector().detect(sentence)
+            if interactive and confidence < DETECTION_MIN_CONFIDENCE:
                 src, tgt = ask_direction()
+                confidence = None
+        elif tgt is None:
+            tgt = 'fr' if src == 'de' else 'de'
 
-        spinner("Traduction de la phrase...")
-        translation = self.google.translate(sentence, src, tgt)
-
-        # Vocabulaire mot à mot
-        words = re.findall(r'\b\w+\b', sentence)
-        word_by_word = {}
-        for w in words:
-            if len(w) > 2:
-                wt = self.google.translate(w, src, tgt)
-                if wt:
-                    word_by_word[w] = wt
+        if self.verbose:
+            spinner("Traduction de la phrase...")
+        unavailable = []
+        try:
+            translation = self.google.translate(sentence, src, tgt)
+        except SourceUnavailable:
+            translation, unavailable = None, ['google']
+
+        # Vocabulaire mot à mot, par lemme (ging et gegangen → une seule
+        # recherche de gehen) : dictionnaire hors ligne d'abord, puis une
+        # requête groupée pour les lemmes hors cache
+        words = [w for w in re.findall(r'\b\w+\b', sentence) if len(w) > 2]
+        lemmas = {w: self.lemme(w, src, tgt) for w in dict.fromkeys(words)}
+        translated = {}
+        for lemma in dict.fromkeys(lemmas.values()):
+            entry = self._hors_ligne(lemma, src, tgt)
+            if entry:
+                translated[lemma] = entry['translations'][0]
+        try:
+            translated.update(self.google.translate_batch(
+                [lemma for lemma in dict.fromkeys(lemmas.values()) if lemma not in translated], src, tgt))
+        except SourceUnavailable:
+            unavailable = ['google']
+        word_by_word = {w: translated[lemma] for w, lemma in lemmas.items() if lemma in translated}
 
-        print(f"\r  {Fore.GREEN}✓ Traduction terminée.{Style.RESET_ALL}                          ")
+        if self.verbose:
+            print(f"\r  {Fore.GREEN}✓ Traduction terminée.{Style.RESET_ALL}                          ")
 
         return {
             'original': sentence,
             'translation': translation,
             'src': src,
             'tgt': tgt,
+            'detection_confidence': confidence,
             'word_by_word': word_by_word,
+            'unavailable': unavailable,
         }
 
 
@@ -473,80 +3094,157 @@ class TraducteurPro:
 # Affichage des résultats
 # ─────────────────────────────────────────────────────────────
 
-def display_word_result(result):
-    """Affiche le résultat détaillé d'une traduction de mot."""
-    src = result['src']
-    tgt = result['tgt']
-    sf = LANG_MAP[src]['flag']
-    tf = LANG_MAP[tgt]['flag']
-    sn = LANG_MAP[src]['name']
-    tn = LANG_MAP[tgt]['name']
+# Sections d'un résultat de mot, dans l'ordre d'affichage
+WORD_SECTIONS = ('all_translations', 'senses', 'definitions', 'synonyms_src', 'synonyms_tgt',
+                 'phrases', 'examples')
+
+
+def display_word_result(result, traducteur=None):
+    """Affiche le résultat détaillé d'une traduction de mot.
+
+    Les sections en attente d'un WordResult sont chargées ici ; pour un
+    simple dict aux synonymes différés, `traducteur` sert à les calculer.
+    """
+    if isinstance(result, WordResult):
+        result.ensure()
+    elif result.get('synonyms_src') is None and traducteur is not None:
+        traducteur.completer_synonymes(result)
+    print_word_header(result)
+    print_word_sections(result, WORD_SECTIONS)
+    print_word_footer(result)
+
+
+def display_word_progressive(steps):
+    """Affiche un résultat de traduire_mot_flux au fur et à mesure ; retourne le résultat final.
+
+    L'en-tête s'affiche dès la traduction principale, puis chaque section
+    dès que sa source répond ; les sections restantes et le pied à la fin.
+    Les traductions fusionnées après l'affichage de leur section (Glosbe,
+    Linguee arrivé en second) sont ajoutées dans une section « suite ».
+    """
+    spinner("Recherche...")
+    shown = set()
+    listed = []
+    result = None
+    for step, sections, result in steps:
+        if step == 'principal':
+            sys.stdout.write("\r" + " " * 40 + "\r")
+            print_word_header(result)
+        if 'all_translations' in sections and 'all_translations' in shown:
+            print_new_translations(result, listed)
+        todo = [name for name in WORD_SECTIONS if name in sections and name not in shown]
+        print_word_sections(result, todo)
+        shown.update(todo)
+        if 'all_translations' in todo:
+            listed.extend(result['all_translations'][:12])
+        sys.stdout.flush()
+    if 'all_translations' in shown:
+        print_new_translations(result, listed)
+    print_word_sections(result, [name for name in WORD_SECTIONS if name not in shown])
+    print_word_footer(result)
+    return result
+
+
+def print_new_translations(result, listed):
+    """Affiche les traductions de `result` absentes de `listed` (12 au total) et les y ajoute."""
+    new = [t for t in result['all_translations'] if t not in listed][:max(0, 12 - len(listed))]
+    if not new:
+        return
+    tn = LANG_MAP[result['tgt']]['name']
+    print_section(f"📖 Traductions ({tn}, suite)")
+    for t in new:
+        print(f"    {Fore.WHITE}○ {t}{Style.RESET_ALL}")
+    listed.extend(new)
 
-    # En-tête
+
+def print_word_header(result):
+    sf = LANG_MAP[result['src']]['flag']
+    tf = LANG_MAP[result['tgt']]['flag']
+    lemma = result.get('lemma')
+    lemma = f" {Fore.WHITE}({lemma})" if lemma and lemma != result['word'] else ""
     print(f"\n{Fore.CYAN}{'━' * 62}")
-    print(f"  {sf}  {Fore.YELLOW}{Style.BRIGHT}{result['word']}{Style.RESET_ALL}  →  "
+    print(f"  {sf}  {Fore.YELLOW}{Style.BRIGHT}{result['word']}{Style.RESET_ALL}{lemma}{Style.RESET_ALL}  →  "
           f"{tf}  {Fore.GREEN}{Style.BRIGHT}{result['main_translation']}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'━' * 62}")
 
-    # ── Toutes les traductions ──
-    if result['all_translations']:
-        print_section(f"📖 Traductions ({tn})")
-        for i, t in enumerate(result['all_translations'][:12], 1):
-            marker = "●" if i == 1 else "○"
-            color = Fore.GREEN if i == 1 else Fore.WHITE
-            print(f"    {color}{marker} {t}{Style.RESET_ALL}")
-
-    # ── Significations / Sens (PONS) ──
-    if result['senses']:
-        print_section("🎯 Significations par sens (PONS)")
-        for s in result['senses'][:10]:
-            print(f"    {Fore.YELLOW}{s['meaning']}{Style.RESET_ALL}")
-            print(f"      → {Fore.GREEN}{s['translation']}{Style.RESET_ALL}")
-
-    # ── Définitions (Glosbe) ──
-    if result['definitions']:
-        print_section("📝 Définitions")
-        for d in result['definitions'][:6]:
-            print(f"    {Fore.CYAN}[{d['type']}]{Fore.WHITE} {d['definition']}{Style.RESET_ALL}")
-
-    # ── Synonymes langue source ──
-    if result['synonyms_src']:
-        print_section(f"🔄 Mots proches ({sn})")
-        for s in result['synonyms_src'][:6]:
-            print(f"    {Fore.MAGENTA}≈ {s}{Style.RESET_ALL}")
-
-    # ── Synonymes langue cible ──
-    if result['synonyms_tgt']:
-        print_section(f"🔄 Synonymes ({tn})")
-        for s in result['synonyms_tgt'][:8]:
-            print(f"    {Fore.MAGENTA}≈ {s}{Style.RESET_ALL}")
-
-    # ── Expressions & Locutions (PONS) ──
-    if result['phrases']:
-        print_section("💡 Expressions & Locutions (PONS)")
-        for p in result['phrases'][:10]:
-            print(f"    {sf} {Fore.WHITE}{p['phrase']}{Style.RESET_ALL}")
-            print(f"       {tf} {Fore.GREEN}{p['translation']}{Style.RESET_ALL}")
-
-    # ── Exemples contextuels réels (Glosbe) ──
-    if result['examples']:
-        print_section("💬 Exemples en contexte (phrases réelles — Glosbe)")
-        for i, ex in enumerate(result['examples'][:10], 1):
-            print(f"\n    {Fore.YELLOW}({i}) {sf}  {ex['original']}")
-            print(f"        {tf}  {Fore.GREEN}{ex['translation']}{Style.RESET_ALL}")
-
-    # Sources
+
+def print_word_sections(result, sections):
+    """Affiche les sections demandées (clés de WORD_SECTIONS), dans l'ordre donné."""
+    sf = LANG_MAP[result['src']]['flag']
+    tf = LANG_MAP[result['tgt']]['flag']
+    sn = LANG_MAP[result['src']]['name']
+    tn = LANG_MAP[result['tgt']]['name']
+
+    for section in sections:
+        # ── Toutes les traductions ──
+        if section == 'all_translations' and result['all_translations']:
+            print_section(f"📖 Traductions ({tn})")
+            for i, t in enumerate(result['all_translations'][:12], 1):
+                marker = "●" if i == 1 else "○"
+                color = Fore.GREEN if i == 1 else Fore.WHITE
+                print(f"    {color}{marker} {t}{Style.RESET_ALL}")
+
+        # ── Significations / Sens (PONS) ──
+        elif section == 'senses' and result['senses']:
+            print_section("🎯 Significations par sens (PONS)")
+            for s in result['senses'][:10]:
+                print(f"    {Fore.YELLOW}{s['meaning']}{Style.RESET_ALL}")
+                print(f"      → {Fore.GREEN}{s['translation']}{Style.RESET_ALL}")
+
+        # ── Définitions (Glosbe) ──
+        elif section == 'definitions' and result['definitions']:
+            print_section("📝 Définitions")
+            for d in result['definitions'][:6]:
+                print(f"    {Fore.CYAN}[{d['type']}]{Fore.WHITE} {d['definition']}{Style.RESET_ALL}")
+
+        # ── Synonymes langue source ──
+        elif section == 'synonyms_src' and result['synonyms_src']:
+            print_section(f"🔄 Mots proches ({sn})")
+            for s in result['synonyms_src'][:6]:
+                print(f"    {Fore.MAGENTA}≈ {s}{Style.RESET_ALL}")
+
+        # ── Synonymes langue cible ──
+        elif section == 'synonyms_tgt' and result['synonyms_tgt']:
+            print_section(f"🔄 Synonymes ({tn})")
+            for s in result['synonyms_tgt'][:8]:
+                print(f"    {Fore.MAGENTA}≈ {s}{Style.RESET_ALL}")
+
+        # ── Expressions & Locutions (PONS) ──
+        elif section == 'phrases' and result['phrases']:
+            print_section("💡 Expressions & Locutions (PONS)")
+            for p in result['phrases'][:10]:
+                print(f"    {sf} {Fore.WHITE}{p['phrase']}{Style.RESET_ALL}")
+                print(f"       {tf} {Fore.GREEN}{p['translation']}{Style.RESET_ALL}")
+
+        # ── Exemples contextuels réels (Glosbe) ──
+        elif section == 'examples' and result['examples']:
+            print_section("💬 Exemples en contexte (phrases réelles — Glosbe)")
+            for i, ex in enumerate(result['examples'][:10], 1):
+                print(f"\n    {Fore.YELLOW}({i}) {sf}  {ex['original']}")
+                print(f"        {tf}  {Fore.GREEN}{ex['translation']}{Style.RESET_ALL}")
+
+
+def print_word_footer(result):
     print(f"\n{Fore.CYAN}{'─' * 62}")
     src_list = []
-    if result.get('main_translation'):
-        src_list.append("Google Translate")
-    if result.get('all_translations'):
-        src_list.append("Linguee")
+    if result.get('offline'):
+        src_list.append("Dictionnaire hors ligne")
+    else:
+        if result.get('main_translation'):
+            src_list.append("Google Translate")
+        if result.get('all_translations'):
+            src_list.append("Linguee")
     if result.get('senses') or result.get('phrases'):
         src_list.append("PONS")
     if result.get('examples') or result.get('definitions'):
         src_list.append("Glosbe")
     print(f"  {Fore.WHITE}Sources : {Fore.CYAN}{' • '.join(src_list)}{Style.RESET_ALL}")
+    if result.get('timed_out'):
+        expired = ' • '.join(TraducteurPro.SOURCES[name][0] for name in result['timed_out'])
+        print(f"  {Fore.WHITE}Délai dépassé : {Fore.YELLOW}{expired}{Style.RESET_ALL}")
+    if result.get('unavailable'):
+        paused = ' • '.join(TraducteurPro.SOURCES[name][0] for name in result['unavailable'])
+        print(f"  {Fore.WHITE}En pause (erreurs répétées ou débit max) : {Fore.YELLOW}{paused}{Style.RESET_ALL}")
     print(f"{Fore.CYAN}{'━' * 62}{Style.RESET_ALL}")
 
 
@@ -568,6 +3266,9 @@ def display_sentence_result(result):
         for w, t in result['word_by_word'].items():
             print(f"    {Fore.YELLOW}{w:<{max_w}}{Fore.WHITE}  →  {Fore.GREEN}{t}{Style.RESET_ALL}")
 
+    if result.get('unavailable'):
+        paused = ' • '.join(TraducteurPro.SOURCES[name][0] for name in result['unavailable'])
+        print(f"\n  {Fore.WHITE}En pause (erreurs répétées ou débit max) : {Fore.YELLOW}{paused}{Style.RESET_ALL}")
     print(f"\n{Fore.CYAN}{'━' * 62}{Style.RESET_ALL}")
 
 
@@ -576,43 +3277,35 @@ def display_sentence_result(result):
 # ─────────────────────────────────────────────────────────────
 
 def show_history():
-    history = load_history()
-    if not history:
+    store = get_history_store()
+    total = len(store)
+    if not total:
         print(f"\n  {Fore.YELLOW}📭 Aucun mot dans l'historique.{Style.RESET_ALL}")
         return
 
-    print_section(f"📚 Historique — {len(history)} mots")
+    print_section(f"📚 Historique — {total} mots")
     print(f"\n  {Fore.WHITE}{'N°':<4} {'Mot':<20} {'Traduction':<20} {'Dir.':<8} {'×':<4} {'Niveau'}")
     print(f"  {Fore.CYAN}{'─' * 62}")
 
-    for i, entry in enumerate(reversed(history[-50:]), 1):
-        sf = LANG_MAP[entry['src_lang']]['flag']
-        tf = LANG_MAP[entry['tgt_lang']]['flag']
+    for i, record in enumerate(store.records(limit=50, newest_first=True), 1):
+        sf = LANG_MAP[record.src_lang]['flag']
+        tf = LANG_MAP[record.tgt_lang]['flag']
         direction = f"{sf}→{tf}"
-        main_trans = entry.get('main_translation', entry.get('translations', ['?'])[0] if entry.get('translations') else '?')
-        score = entry.get('revision_score', 0)
+        main_trans = record.main_translation or (record.get('translations') or ['?'])[0]
+        score = record.revision_score
         bar = '★' * score + '☆' * (5 - score)
-        print(f"  {Fore.YELLOW}{i:<4}{Fore.WHITE}{entry['word']:<20}{Fore.GREEN}"
+        print(f"  {Fore.YELLOW}{i:<4}{Fore.WHITE}{record.word:<20}{Fore.GREEN}"
               f"{str(main_trans)[:18]:<20}{Fore.CYAN}{direction:<8}"
-              f"{Fore.MAGENTA}{entry.get('lookup_count', 1):<4}{Fore.YELLOW}{bar}{Style.RESET_ALL}")
+              f"{Fore.MAGENTA}{record.lookup_count or 1:<4}{Fore.YELLOW}{bar}{Style.RESET_ALL}")
 
 
 def search_history():
-    query = input(f"\n  {Fore.CYAN}🔍 Rechercher : {Style.RESET_ALL}").strip().lower()
+    query = input(f"\n  {Fore.CYAN}🔍 Rechercher : {Style.RESET_ALL}").strip()
     if not query:
         return
 
-    history = load_history()
-    results = []
-    for e in history:
-        if query in e['word'].lower():
-            results.append(e)
-            continue
-        if query in e.get('main_translation', '').lower():
-            results.append(e)
-            continue
-        if any(query in t.lower() for t in e.get('translations', [])):
-            results.append(e)
+    ranked = get_search_index().search(query)
+    results = get_history_store().get_many(entry_id for entry_id, _ in ranked)
 
     if not results:
         print(f"\n  {Fore.YELLOW}Aucun résultat pour « {query} ».{Style.RESET_ALL}")
@@ -633,29 +3326,71 @@ def search_history():
         print()
 
 
+def check_answer(entry, answer):
+    """Vrai si `answer` correspond à une traduction de l'entrée (sous-chaîne tolérée)."""
+    correct_answers = set()
+    if entry.get('main_translation'):
+        correct_answers.add(entry['main_translation'].lower().strip())
+    for t in entry.get('translations', []):
+        correct_answers.add(t.lower().strip())
+
+    user_answer = answer.lower().strip()
+    if user_answer in correct_answers:
+        return True
+
+    # Tolérance : sous-chaîne
+    for ca in correct_answers:
+        if (user_answer in ca or ca in user_answer) and len(user_answer) > 2:
+            return True
+    return False
+
+
+def apply_review(entry, is_correct, now_ts):
+    """Met à jour score et prochaine échéance (répétition espacée) après une réponse."""
+    if is_correct:
+        entry['times_correct'] = entry.get('times_correct', 0) + 1
+        entry['revision_score'] = min(5, entry.get('revision_score', 0) + 1)
+        days = [1, 2, 4, 7, 14, 30][min(entry['revision_score'], 5)]
+        entry['next_revision'] = now_ts + days * DAY
+    else:
+        entry['times_incorrect'] = entry.get('times_incorrect', 0) + 1
+        entry['revision_score'] = max(0, entry.get('revision_score', 0) - 1)
+        entry['next_revision'] = now_ts
+
+
+def save_reviews(store, answered, now_ts):
+    """Enregistre les réponses d'une session, sans écraser les écritures concurrentes.
+
+    Seules les cartes répondues sont écrites. Si une carte a changé depuis
+    sa lecture (autre session, API), la réponse est réappliquée à l'état
+    courant au lieu de l'écraser.
+    """
+    with store.transaction():
+        for entry, is_correct in answered:
+            try:
+                store.upsert(entry)
+            except ConflictError:
+                current = store.get(entry['word'], entry['src_lang'])
+                if current is None:
+                    continue
+                apply_review(current, is_correct, now_ts)
+                store.upsert(current)
+
+
 def revision_mode():
     """Mode révision par flashcards avec répétition espacée."""
-    history = load_history()
-    if len(history) < 3:
+    store = get_history_store()
+    if len(store) < 3:
         print(f"\n  {Fore.YELLOW}⚠ Il faut au moins 3 mots dans l'historique pour la révision.{Style.RESET_ALL}")
         return
 
-    stats = load_stats()
-    stats['total_sessions'] += 1
     now = datetime.now()
+    now_ts = int(now.timestamp())
 
-    # Mots à réviser (priorité : score bas + date due)
-    revision_words = []
-    for entry in history:
-        next_rev = datetime.fromisoformat(entry.get('next_revision', now.isoformat()))
-        if next_rev <= now:
-            revision_words.append(entry)
-
-    if not revision_words:
-        revision_words = sorted(history, key=lambda x: x.get('revision_score', 0))[:10]
-
+    # Mots à réviser : les 15 plus en retard (index sur l'échéance),
+    # sinon les 10 de plus faible score
+    revision_words = store.due(now_ts, 15) or store.weakest(10)
     random.shuffle(revision_words)
-    revision_words = revision_words[:15]
 
     print(f"\n{Fore.CYAN}{'═' * 62}")
     print(f"  {Fore.YELLOW}🧠  MODE RÉVISION  —  {len(revision_words)} mots")
@@ -666,6 +3401,7 @@ def revision_mode():
     correct = 0
     incorrect = 0
     total = 0
+    answered = []
 
     for i, entry in enumerate(revision_words, 1):
         sf = LANG_MAP[entry['src_lang']]['flag']
@@ -707,39 +3443,19 @@ def revision_mode():
         total += 1
 
         # Vérifier la réponse
-        correct_answers = set()
-        if entry.get('main_translation'):
-            correct_answers.add(entry['main_translation'].lower().strip())
-        for t in entry.get('translations', []):
-            correct_answers.add(t.lower().strip())
-
         user_answer = answer.lower().strip()
-        is_correct = user_answer in correct_answers
-
-        # Tolérance : sous-chaîne
-        if not is_correct:
-            for ca in correct_answers:
-                if (user_answer in ca or ca in user_answer) and len(user_answer) > 2:
-                    is_correct = True
-                    break
+        is_correct = check_answer(entry, answer)
+        apply_review(entry, is_correct, now_ts)
+        answered.append((entry, is_correct))
 
         if is_correct:
             correct += 1
-            entry['times_correct'] = entry.get('times_correct', 0) + 1
-            entry['revision_score'] = min(5, entry.get('revision_score', 0) + 1)
-            days = [1, 2, 4, 7, 14, 30][min(entry['revision_score'], 5)]
-            entry['next_revision'] = (now + timedelta(days=days)).isoformat()
-
             print(f"  {Fore.GREEN}✅ Correct !{Style.RESET_ALL}")
             extras = [t for t in entry.get('translations', [])[:4] if t.lower() != user_answer]
             if extras:
                 print(f"     {Fore.WHITE}Autres : {Fore.CYAN}{', '.join(extras)}{Style.RESET_ALL}")
         else:
             incorrect += 1
-            entry['times_incorrect'] = entry.get('times_incorrect', 0) + 1
-            entry['revision_score'] = max(0, entry.get('revision_score', 0) - 1)
-            entry['next_revision'] = now.isoformat()
-
             trans = entry.get('main_translation', '')
             print(f"  {Fore.RED}❌ La réponse était : {Fore.GREEN}{trans}{Style.RESET_ALL}")
             extras = entry.get('translations', [])[:3]
@@ -752,13 +3468,8 @@ def revision_mode():
             print(f"     {Fore.WHITE}💬 {ex.get('original', '')}")
             print(f"        {Fore.CYAN}{ex.get('translation', '')}{Style.RESET_ALL}")
 
-    save_history(history)
-
-    stats['total_words_reviewed'] += total
-    stats['total_correct'] += correct
-    stats['total_incorrect'] += incorrect
-    stats['last_session'] = now.isoformat()
-    save_stats(stats)
+    save_reviews(store, answered, now_ts)
+    store.record_session(total, correct, incorrect, now.isoformat())
 
     # Résumé
     print(f"\n{Fore.CYAN}{'═' * 62}")
@@ -786,7 +3497,8 @@ def revision_mode():
 
 def show_stats():
     stats = load_stats()
-    history = load_history()
+    store = get_history_store()
+    summary = store.stats_summary()
 
     print_section("📊 Statistiques globales")
     print(f"\n  {Fore.WHITE}Sessions de révision  : {Fore.YELLOW}{stats.get('total_sessions', 0)}")
@@ -799,89 +3511,1015 @@ def show_stats():
         pct = (stats['total_correct'] / t) * 100
         print(f"  {Fore.WHITE}Taux de réussite      : {Fore.GREEN}{pct:.1f}%")
 
-    print(f"\n  {Fore.WHITE}Mots dans l'historique : {Fore.YELLOW}{len(history)}")
+    print(f"\n  {Fore.WHITE}Mots dans l'historique : {Fore.YELLOW}{summary['words']}")
 
     if stats.get('last_session'):
         last = datetime.fromisoformat(stats['last_session'])
         print(f"  {Fore.WHITE}Dernière session       : {Fore.CYAN}{last.strftime('%d/%m/%Y à %H:%M')}")
 
-    if history:
-        top = sorted(history, key=lambda x: x.get('lookup_count', 0), reverse=True)[:5]
+    if summary['words']:
+        levels = '  '.join(f"{'★' * score or '☆'} {summary['score_buckets'].get(score, 0)}"
+                           for score in range(6))
+        print(f"  {Fore.WHITE}Par niveau             : {Fore.YELLOW}{levels}")
+
         print(f"\n  {Fore.YELLOW}🏆 Top 5 des mots les plus recherchés :")
-        for i, e in enumerate(top, 1):
-            print(f"    {Fore.WHITE}{i}. {Fore.YELLOW}{e['word']}{Fore.WHITE} ({e.get('lookup_count', 1)}×)")
+        for i, r in enumerate(summary['top'], 1):
+            print(f"    {Fore.WHITE}{i}. {Fore.YELLOW}{r.word}{Fore.WHITE} ({r.lookup_count or 1}×)")
+
+        if summary['difficult']:
+            print(f"\n  {Fore.RED}⚠ Mots à travailler ({summary['difficult_count']}) :")
+            for r in summary['difficult']:
+                print(f"    {Fore.WHITE}• {Fore.RED}{r.word}{Fore.WHITE} "
+                      f"(❌{r.times_incorrect} / ✅{r.times_correct})")
+
+        if summary['mastered']:
+            print(f"\n  {Fore.GREEN}🌟 Mots maîtrisés ({summary['mastered_count']}) :")
+            for r in summary['mastered']:
+                print(f"    {Fore.GREEN}✓ {r.word}{Style.RESET_ALL}")
+
+        for title, period, limit in (("7 derniers jours", 'day', 7), ("4 dernières semaines", 'week', 4)):
+            rows = store.activity(period, limit)
+            if not rows:
+                continue
+            print(f"\n  {Fore.CYAN}📅 Activité — {title} :")
+            for label, added, lookups, correct, incorrect in rows:
+                print(f"    {Fore.WHITE}{label:<11} {Fore.YELLOW}+{added:<4} mots  "
+                      f"{Fore.WHITE}{lookups:>4} recherches  {Fore.GREEN}✅{correct:<4}"
+                      f"{Fore.RED}❌{incorrect}{Style.RESET_ALL}")
+
+
+DIRECTION_LABELS = {'de': 'ALLEMAND → FRANÇAIS', 'fr': 'FRANÇAIS → ALLEMAND'}
+
+
+def _export_txt(entries):
+    """Rapport lisible, une section par direction (entrées groupées par langue source)."""
+    yield "═" * 60 + "\n"
+    yield "   VOCABULAIRE ALLEMAND ⇄ FRANÇAIS\n"
+    yield f"   Exporté le {datetime.now().strftime('%d/%m/%Y à %H:%M')}\n"
+    yield "═" * 60 + "\n\n"
+
+    total, direction = 0, None
+    for entry in entries:
+        if entry['src_lang'] != direction:
+            direction = entry['src_lang']
+            yield f"{'─' * 40}\n  {DIRECTION_LABELS.get(direction, direction)}\n{'─' * 40}\n\n"
+        total += 1
 
-        difficult = [e for e in history if e.get('times_incorrect', 0) > e.get('times_correct', 0)]
-        if difficult:
-            print(f"\n  {Fore.RED}⚠ Mots à travailler :")
-            for e in difficult[:5]:
-                print(f"    {Fore.WHITE}• {Fore.RED}{e['word']}{Fore.WHITE} "
-                      f"(❌{e.get('times_incorrect', 0)} / ✅{e.get('times_correct', 0)})")
+        main = entry.get('main_translation', '')
+        lines = [f"  ● {entry['word']}  →  {main}\n"]
+        for s in entry.get('senses', [])[:3]:
+            lines.append(f"      {s.get('meaning', '')} : {s.get('translation', '')}\n")
+        others = [t for t in entry.get('translations', [])[:5] if t != main]
+        if others:
+            lines.append(f"      Aussi : {', '.join(others)}\n")
+        for p in entry.get('phrases', [])[:2]:
+            lines.append(f"      → {p.get('phrase', '')} = {p.get('translation', '')}\n")
+        for ex in entry.get('examples', [])[:2]:
+            lines.append(f"      💬 {ex.get('original', '')}\n")
+            lines.append(f"         {ex.get('translation', '')}\n")
+        score = entry.get('revision_score', 0)
+        lines.append(f"      Niveau : {'★' * score}{'☆' * (5 - score)}  "
+                     f"(recherché {entry.get('lookup_count', 1)}×)\n\n")
+        yield ''.join(lines)
+
+    yield f"\nTotal : {total} mots\n"
+
+
+def _csv_row(writer, buffer, row):
+    writer.writerow(row)
+    line = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return line
+
+
+def _export_csv(entries):
+    """Tableur : une ligne par mot, autres traductions séparées par « ; »."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    yield _csv_row(writer, buffer, ['mot', 'traduction', 'autres_traductions', 'source', 'cible',
+                                    'niveau', 'recherches', 'justes', 'fausses'])
+    for entry in entries:
+        main = entry.get('main_translation', '')
+        yield _csv_row(writer, buffer, [
+            entry['word'], main,
+            '; '.join(t for t in entry.get('translations', [])[:5] if t != main),
+            entry['src_lang'], entry['tgt_lang'], entry.get('revision_score', 0),
+            entry.get('lookup_count', 1), entry.get('times_correct', 0), entry.get('times_incorrect', 0),
+        ])
+
+
+def _anki_field(text):
+    return str(text).replace('\t', ' ').replace('\n', '<br>')
+
+
+def _export_anki(entries):
+    """Fichier texte importable dans Anki : recto, verso (HTML), étiquettes."""
+    yield "#separator:tab\n#html:true\n#tags column:3\n"
+    for entry in entries:
+        main = entry.get('main_translation', '')
+        back = [f"<b>{main}</b>"]
+        back += [f"{s.get('meaning', '')} : {s.get('translation', '')}" for s in entry.get('senses', [])[:3]]
+        others = [t for t in entry.get('translations', [])[:5] if t != main]
+        if others:
+            back.append(f"<i>Aussi :</i> {', '.join(others)}")
+        for ex in entry.get('examples', [])[:1]:
+            back.append(f"💬 {ex.get('original', '')}<br>{ex.get('translation', '')}")
+        tags = f"traducteur {entry['src_lang']}-{entry['tgt_lang']} niveau{entry.get('revision_score', 0)}"
+        yield f"{_anki_field(entry['word'])}\t{_anki_field('<br>'.join(back))}\t{tags}\n"
+
+
+def _export_jsonl(entries):
+    """Une entrée complète (JSON) par ligne — reçoit le JSON stocké, sans le décoder."""
+    for data in entries:
+        yield data + "\n"
+
+
+# format → (générateur, extension du fichier, entrées en JSON brut)
+EXPORT_FORMATS = {
+    'txt': (_export_txt, '.txt', False),
+    'csv': (_export_csv, '.csv', False),
+    'anki': (_export_anki, '.tsv', False),
+    'jsonl': (_export_jsonl, '.jsonl', True),
+}
+
+
+def export_vocabulary(output_path, fmt='txt', incremental=False, store=None):
+    """Exporte l'historique en flux vers `output_path` au format `fmt`.
+
+    Les entrées sont lues par morceaux (HistoryStore.iter_changes) et écrites
+    au fil de l'eau : mémoire bornée quelle que soit la taille de
+    l'historique. Avec `incremental`, seules les entrées modifiées depuis le
+    dernier export dans ce format sont écrites. Le fichier est remplacé
+    atomiquement. Retourne {'path', 'entries', 'since'}.
+    """
+    store = store or get_history_store()
+    writer, _, raw = EXPORT_FORMATS[fmt]
+    marker = f'export_seq:{fmt}'
+    since = int(store.get_meta(marker, 0)) if incremental else 0
+    until = store.last_change()
 
-        mastered = [e for e in history if e.get('revision_score', 0) >= 4]
-        if mastered:
-            print(f"\n  {Fore.GREEN}🌟 Mots maîtrisés ({len(mastered)}) :")
-            for e in mastered[:8]:
-                print(f"    {Fore.GREEN}✓ {e['word']}{Style.RESET_ALL}")
+    count = 0
+
+    def counted(entries):
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    output_path = Path(output_path)
+    tmp = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        for text in writer(counted(store.iter_changes(since, until, raw=raw))):
+            f.write(text)
+    os.replace(tmp, output_path)
+    store.set_meta(marker, until)
+    return {'path': str(output_path), 'entries': count, 'since': since}
 
 
 def export_history():
-    history = load_history()
-    if not history:
+    store = get_history_store()
+    if not len(store):
         print(f"\n  {Fore.YELLOW}📭 Historique vide.{Style.RESET_ALL}")
         return
 
-    export_file = SCRIPT_DIR / f"export_vocabulaire_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+    print(f"\n  {Fore.WHITE}Format : {Fore.YELLOW}[1]{Fore.WHITE} Texte  {Fore.YELLOW}[2]{Fore.WHITE} CSV  "
+          f"{Fore.YELLOW}[3]{Fore.WHITE} Anki  {Fore.YELLOW}[4]{Fore.WHITE} JSON Lines")
+    choice = input(f"  {Fore.CYAN}▶ Choix (1) : {Style.RESET_ALL}").strip() or '1'
+    fmt = {'1': 'txt', '2': 'csv', '3': 'anki', '4': 'jsonl'}.get(choice, 'txt')
+    incremental = False
+    if store.get_meta(f'export_seq:{fmt}') is not None:
+        answer = input(f"  {Fore.CYAN}Seulement les mots modifiés depuis le dernier export ? (o/N) : "
+                       f"{Style.RESET_ALL}").strip().lower()
+        incremental = answer in ('o', 'oui', 'y')
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M')
+    export_file = SCRIPT_DIR / f"export_vocabulaire_{stamp}{EXPORT_FORMATS[fmt][1]}"
+    summary = export_vocabulary(export_file, fmt, incremental, store)
+    print(f"\n  {Fore.GREEN}✅ {summary['entries']} mot(s) exporté(s) vers : "
+          f"{Fore.WHITE}{export_file}{Style.RESET_ALL}")
 
-    with open(export_file, 'w', encoding='utf-8') as f:
-        f.write("═" * 60 + "\n")
-        f.write("   VOCABULAIRE ALLEMAND ⇄ FRANÇAIS\n")
-        f.write(f"   Exporté le {datetime.now().strftime('%d/%m/%Y à %H:%M')}\n")
-        f.write("═" * 60 + "\n\n")
 
-        for src_code, tgt_code, label in [('de', 'fr', 'ALLEMAND → FRANÇAIS'), ('fr', 'de', 'FRANÇAIS → ALLEMAND')]:
-            entries = [e for e in history if e['src_lang'] == src_code]
-            if not entries:
+# ─────────────────────────────────────────────────────────────
+# Traduction de documents (mode fichier, en flux)
+# ─────────────────────────────────────────────────────────────
+
+SENTENCE_END = re.compile(r'(?<=[.!?…:;])\s+')
+MARKUP_PREFIX = re.compile(r'^(\s*(?:#{1,6}|[-*+>]|\d+[.)])\s+)')
+
+
+def split_sentences(text, max_chars=GOOGLE_MAX_CHARS):
+    """Découpe un texte en phrases, elles-mêmes coupées aux espaces si trop longues."""
+    for sentence in SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            yield sentence[:cut]
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            yield sentence
+
+
+def iter_document_chunks(lines, max_chars=GOOGLE_MAX_CHARS):
+    """Transforme un flux de lignes en morceaux (préfixe, texte, suffixe).
+
+    Chaque morceau regroupe des phrases d'une même ligne sans dépasser
+    `max_chars`. La sortie s'obtient par préfixe + traduction(texte) + suffixe,
+    ce qui conserve les sauts de ligne, la mise en forme Markdown simple et
+    les blocs de code (non traduits).
+    """
+    in_code = False
+    for line in lines:
+        body = line.rstrip('\r\n')
+        eol = line[len(body):]
+        if body.lstrip().startswith('```'):
+            in_code = not in_code
+        if in_code or body.lstrip().startswith('```') or not body.strip():
+            yield line, '', ''
+            continue
+
+        match = MARKUP_PREFIX.match(body)
+        prefix = match.group(1) if match else body[:len(body) - len(body.lstrip())]
+        chunk, size = [], 0
+        for sentence in split_sentences(body[len(prefix):].strip(), max_chars):
+            if chunk and size + len(sentence) + 1 > max_chars:
+                yield prefix, ' '.join(chunk), ' '
+                prefix, chunk, size = '', [], 0
+            chunk.append(sentence)
+            size += len(sentence) + 1
+        yield prefix, ' '.join(chunk), eol
+
+
+def _load_checkpoint(path, expected):
+    """Point de reprise de `path`, s'il a été écrit pour la même traduction.
+
+    `expected` : entrée, direction, taille et date de modification de
+    l'entrée. Un fichier modifié ou une autre direction repart de zéro
+    plutôt que de raccorder l'ancienne sortie à la nouvelle.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or any(data.get(key) != value for key, value in expected.items()):
+        return None
+    return data
+
+
+def _save_checkpoint(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def translate_document(traducteur, input_path, output_path, src, tgt,
+                       workers=DOCUMENT_WORKERS, resume=True, progress=None):
+    """Traduit un fichier texte en flux, en mémoire constante.
+
+    Les morceaux sont traduits par un pool borné de `workers` threads (au
+    plus 2 × workers morceaux en vol) et écrits dans l'ordre d'origine. Un
+    point de reprise (`<sortie>.checkpoint`) mémorise le nombre de morceaux
+    écrits et la taille de la sortie : après un arrêt, la traduction reprend
+    là où elle s'était arrêtée, si l'entrée (taille, date) et la direction
+    n'ont pas changé. Retourne un résumé (morceaux, échecs, durée).
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    checkpoint_path = output_path.with_name(output_path.name + '.checkpoint')
+
+    stat = input_path.stat()
+    run = {'input': str(input_path), 'src': src, 'tgt': tgt,
+           'input_size': stat.st_size, 'input_mtime_ns': stat.st_mtime_ns}
+    state = _load_checkpoint(checkpoint_path, run) if resume else None
+    if state and output_path.exists() and output_path.stat().st_size >= state['offset']:
+        skip, offset = state['chunks'], state['offset']
+    else:
+        skip, offset = 0, 0
+    state = dict(run, chunks=skip, offset=offset)
+
+    def translate_chunk(prefix, text, suffix):
+        if not text:
+            return prefix + suffix, True
+        try:
+            translated = traducteur.google.translate(text, src, tgt)
+        except SourceUnavailable:
+            translated = None
+        # En cas d'échec, on garde le texte d'origine plutôt que de perdre la ligne
+        return prefix + (translated or text) + suffix, bool(translated)
+
+    started = time.time()
+    failures = 0
+    with open(input_path, 'r', encoding='utf-8', errors='replace') as fin, \
+            open(output_path, 'r+b' if offset else 'wb') as fout, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='document') as pool:
+        fout.seek(offset)
+        fout.truncate()
+
+        in_flight = deque()
+
+        def flush_one():
+            nonlocal failures
+            text, ok = in_flight.popleft().result()
+            failures += not ok
+            state['offset'] += fout.write(text.encode('utf-8'))
+            state['chunks'] += 1
+            if state['chunks'] % CHECKPOINT_EVERY == 0:
+                fout.flush()
+                _save_checkpoint(checkpoint_path, state)
+            if progress:
+                progress(state['chunks'], failures)
+
+        for index, chunk in enumerate(iter_document_chunks(fin)):
+            if index < skip:
                 continue
+            in_flight.append(pool.submit(translate_chunk, *chunk))
+            if len(in_flight) >= 2 * workers:
+                flush_one()
+        while in_flight:
+            flush_one()
+
+    checkpoint_path.unlink(missing_ok=True)
+    return {
+        'chunks': state['chunks'],
+        'resumed_from': skip,
+        'failures': failures,
+        'seconds': time.time() - started,
+        'output': str(output_path),
+    }
 
-            f.write(f"{'─' * 40}\n  {label}\n{'─' * 40}\n\n")
 
-            for entry in entries:
-                main = entry.get('main_translation', '')
-                f.write(f"  ● {entry['word']}  →  {main}\n")
+def _guess_direction(sample):
+    """Direction la plus probable d'un échantillon, sans rien demander (modes non interactifs)."""
+    src, tgt, confidence = get_language_detector().detect(sample)
+    if confidence < DETECTION_MIN_CONFIDENCE:
+        print(f"  {Fore.YELLOW}⚠ Langue incertaine ({confidence:.0%}), {LANG_MAP[src]['name']} → "
+              f"{LANG_MAP[tgt]['name']} retenu (préciser --source / --cible).{Style.RESET_ALL}")
+    return src, tgt
 
-                if entry.get('senses'):
-                    for s in entry['senses'][:3]:
-                        f.write(f"      {s.get('meaning', '')} : {s.get('translation', '')}\n")
 
-                if entry.get('translations'):
-                    others = [t for t in entry['translations'][:5] if t != main]
-                    if others:
-                        f.write(f"      Aussi : {', '.join(others)}\n")
+def document_mode(path, output=None, src=None, tgt=None, workers=DOCUMENT_WORKERS, resume=True):
+    """Point d'entrée du mode fichier (--fichier)."""
+    path = Path(path)
+    if not path.exists():
+        print(f"  {Fore.RED}❌ Fichier introuvable : {path}{Style.RESET_ALL}")
+        return 1
 
-                if entry.get('phrases'):
-                    for p in entry['phrases'][:2]:
-                        f.write(f"      → {p.get('phrase', '')} = {p.get('translation', '')}\n")
+    if src is None:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            src, tgt = _guess_direction(f.read(4000))
+    elif tgt is None:
+        tgt = 'fr' if src == 'de' else 'de'
 
-                if entry.get('examples'):
-                    for ex in entry['examples'][:2]:
-                        f.write(f"      💬 {ex.get('original', '')}\n")
-                        f.write(f"         {ex.get('translation', '')}\n")
+    output = Path(output) if output else path.with_name(f"{path.stem}.{tgt}{path.suffix}")
+    print(f"  {Fore.CYAN}📄 {path.name}  {LANG_MAP[src]['flag']} → {LANG_MAP[tgt]['flag']}  "
+          f"{Fore.WHITE}→ {output}{Style.RESET_ALL}")
 
-                score = entry.get('revision_score', 0)
-                f.write(f"      Niveau : {'★' * score}{'☆' * (5 - score)}  "
-                        f"(recherché {entry.get('lookup_count', 1)}×)\n\n")
+    def progress(chunks, failures):
+        spinner(f"{chunks} morceaux traduits" + (f" ({failures} échecs)" if failures else ""))
 
-        f.write(f"\nTotal : {len(history)} mots\n")
+    summary = translate_document(TraducteurPro(), path, output, src, tgt,
+                                 workers=workers, resume=resume, progress=progress)
+    if summary['resumed_from']:
+        print(f"\n  {Fore.CYAN}↻ Reprise après {summary['resumed_from']} morceaux déjà traduits.")
+    rate = (summary['chunks'] - summary['resumed_from']) / max(summary['seconds'], 1e-6)
+    print(f"\r  {Fore.GREEN}✅ {summary['chunks']} morceaux traduits en {summary['seconds']:.1f} s "
+          f"({rate:.1f}/s).{Style.RESET_ALL}          ")
+    if summary['failures']:
+        print(f"  {Fore.YELLOW}⚠ {summary['failures']} morceau(x) laissé(s) non traduit(s).{Style.RESET_ALL}")
+    return 0
 
-    print(f"\n  {Fore.GREEN}✅ Exporté vers : {Fore.WHITE}{export_file}{Style.RESET_ALL}")
+
+# ─────────────────────────────────────────────────────────────
+# Import de vocabulaire (mode --importer)
+# ─────────────────────────────────────────────────────────────
+
+IMPORT_HEADERS = {'mot', 'word', 'wort', 'vocabulaire'}
+
+
+def read_word_list(path):
+    """Lit une liste de mots et retourne [(mot, langue source ou None)] sans doublons.
+
+    Fichiers .csv / .tsv : 1re colonne = mot, 2e colonne optionnelle = langue
+    source ('de' / 'fr'), ligne d'en-tête tolérée. Autres fichiers : un mot par
+    ligne. Lignes vides et commentaires (#) ignorés.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    words, seen = [], set()
+    with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+        if suffix in ('.csv', '.tsv'):
+            rows = csv.reader(f, delimiter='\t' if suffix == '.tsv' else ',')
+        else:
+            rows = ([line] for line in f)
+        for index, row in enumerate(rows):
+            word = row[0].strip() if row else ''
+            if not word or word.startswith('#') or (index == 0 and word.lower() in IMPORT_HEADERS):
+                continue
+            lang = row[1].strip().lower() if len(row) > 1 else ''
+            lang = lang if lang in LANG_MAP else None
+            key = (word.lower(), lang)
+            if key not in seen:
+                seen.add(key)
+                words.append((word, lang))
+    return words
+
+
+def import_vocabulary(traducteur, words, src='de', tgt='fr', workers=IMPORT_WORKERS,
+                      resume=True, progress=None):
+    """Recherche une liste de mots en parallèle et l'ajoute à l'historique.
+
+    `words` : [(mot, langue source ou None)] comme renvoyé par read_word_list ;
+    la langue par défaut est `src` → `tgt`. Les recherches passent par un pool
+    borné de `workers` threads et remplissent le cache des sources au fil de
+    l'eau ; l'historique est écrit à la fin en une seule transaction.
+
+    Reprise : avec `resume`, les mots déjà présents dans l'historique sont
+    sautés. Après une interruption (Ctrl+C), les mots déjà traduits sont
+    enregistrés et les autres seront relancés — en grande partie depuis le
+    cache — au prochain import. Un mot dont une source a expiré ou a été
+    refusée (`incomplete`) n'est pas enregistré non plus : sinon la reprise
+    le sauterait avec ses sections vides. Les synonymes inverses ne sont pas
+    calculés.
+    """
+    store = get_history_store()
+    todo, skipped = [], 0
+    for word, lang in words:
+        word_src = lang or src
+        word_tgt = tgt if lang is None else ('fr' if word_src == 'de' else 'de')
+        if resume and store.headword(traducteur.lemme(word, word_src, word_tgt), word_src):
+            skipped += 1
+        else:
+            todo.append((word, word_src, word_tgt))
+
+    started = time.time()
+    entries, failures, incomplete, interrupted = [], 0, 0, False
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='import')
+    futures = {pool.submit(traducteur.traduire_mot, word, word_src, word_tgt, False): word
+               for word, word_src, word_tgt in todo}
+    try:
+        for done, fut in enumerate(as_completed(futures), 1):
+            try:
+                result = fut.result()
+            except Exception:
+                result = None
+            if not result or not result['all_translations']:
+                failures += 1
+            elif result['timed_out'] or result['unavailable']:
+                incomplete += 1
+            else:
+                entries.append(make_history_entry(futures[fut], result))
+            if progress:
+                progress(done, len(todo), failures + incomplete)
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+
+    added, reindex, updated = [], [], 0
+    with store.transaction():
+        for entry in entries:
+            existing = store.get(entry['word'], entry['src_lang'])
+            if existing is None:
+                added.append((store.upsert(entry), entry))
+            else:
+                existing['lookup_count'] = existing.get('lookup_count', 0) + 1
+                existing['last_lookup'] = entry['last_lookup']
+                forms = [form for form in entry.get('forms', []) if add_form(existing, form)]
+                entry_id = store.upsert(existing)
+                if forms:
+                    reindex.append((entry_id, existing))
+                updated += 1
+    if store.search_index is not None:
+        for entry_id, entry in added + reindex:
+            store.search_index.add(entry_id, entry)
+
+    return {
+        'words': len(words),
+        'added': len(added),
+        'updated': updated,
+        'skipped': skipped,
+        'failures': failures,
+        'incomplete': incomplete,
+        'interrupted': interrupted,
+        'seconds': time.time() - started,
+    }
+
+
+def import_engine(workers=IMPORT_WORKERS, **options):
+    """Moteur pour l'import : attend le limiteur des sources au lieu d'être refusé.
+
+    `options` (cache, http...) sont passées à TraducteurPro.
+    """
+    limits = {name: dict(limit, max_wait=IMPORT_MAX_WAIT) for name, limit in SOURCE_LIMITS.items()}
+    return TraducteurPro(deadline=IMPORT_DEADLINE, max_workers=4 * workers, verbose=False, limits=limits,
+                         **options)
+
+
+def import_mode(path, src=None, tgt=None, workers=IMPORT_WORKERS, resume=True):
+    """Point d'entrée du mode import (--importer)."""
+    path = Path(path)
+    if not path.exists():
+        print(f"  {Fore.RED}❌ Fichier introuvable : {path}{Style.RESET_ALL}")
+        return 1
+
+    words = read_word_list(path)
+    if src is None:
+        src, tgt = _guess_direction(' '.join(word for word, _ in words[:200]))
+    elif tgt is None:
+        tgt = 'fr' if src == 'de' else 'de'
+
+    print(f"  {Fore.CYAN}📥 {path.name} : {len(words)} mots  "
+          f"{LANG_MAP[src]['flag']} → {LANG_MAP[tgt]['flag']}{Style.RESET_ALL}")
+    started = time.time()
+
+    def progress(done, total, failures):
+        rate = done / max(time.time() - started, 1e-6)
+        eta = (total - done) / rate if rate else 0
+        spinner(f"{done}/{total} mots ({rate:.1f}/s, reste ~{eta:.0f} s)"
+                + (f" — {failures} sans traduction ou incomplet(s)" if failures else ""))
+
+    summary = import_vocabulary(import_engine(workers), words, src, tgt, workers=workers, resume=resume,
+                                progress=progress)
+    looked_up = summary['added'] + summary['updated'] + summary['failures'] + summary['incomplete']
+    rate = looked_up / max(summary['seconds'], 1e-6)
+    print(f"\r  {Fore.GREEN}✅ {summary['added']} mots ajoutés, {summary['updated']} mis à jour "
+          f"en {summary['seconds']:.1f} s ({rate:.1f} mots/s).{Style.RESET_ALL}          ")
+    if summary['skipped']:
+        print(f"  {Fore.CYAN}↻ {summary['skipped']} mots déjà dans l'historique, ignorés.{Style.RESET_ALL}")
+    if summary['failures']:
+        print(f"  {Fore.YELLOW}⚠ {summary['failures']} mot(s) sans traduction.{Style.RESET_ALL}")
+    if summary['incomplete']:
+        print(f"  {Fore.YELLOW}⚠ {summary['incomplete']} mot(s) incomplet(s) (source en pause ou trop lente), "
+              f"non enregistré(s) : relancer l'import pour les compléter.{Style.RESET_ALL}")
+    if summary['interrupted']:
+        print(f"  {Fore.YELLOW}⏸ Import interrompu : relancer la même commande pour le terminer.{Style.RESET_ALL}")
+        return 130
+    return 0
+
+
+# ─────────────────────────────────────────────────────────────
+# Serveur HTTP (API JSON, mode --serveur)
+# ─────────────────────────────────────────────────────────────
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+HTTP_REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+                500: 'Internal Server Error'}
+
+
+class APIServer:
+    """API JSON asynchrone autour de TraducteurPro.
+
+    Les connexions sont gérées par asyncio (keep-alive HTTP/1.1) ; les appels
+    bloquants au moteur passent par un pool de threads borné par un sémaphore
+    (`max_concurrent`) pour protéger les sources en ligne. Les requêtes
+    identiques simultanées (même mot, même direction) partagent un seul
+    calcul. Les routes d'historique acceptent `utilisateur=nom` (un
+    historique séparé par apprenant).
+
+      GET  /api/mot?q=Haus&src=de&tgt=fr[&synonymes=0][&enrichir=0][&historique=1]
+           [&sections=senses,examples]   enrichissement partiel (`pending` : le reste)
+      GET  /api/mot/flux?q=Haus&src=de&tgt=fr[&synonymes=0][&historique=1]
+           Server-Sent Events : `principal`, puis une étape par source, `fin`
+      GET  /api/dictionnaire?q=hau&src=de&tgt=fr[&limite=20]   complétion hors ligne
+      GET  /api/phrase?q=...[&src=de&tgt=fr]
+      GET  /api/recherche?q=...[&limite=30]
+      GET  /api/revision?limite=15           mots à réviser (avec `version`)
+      POST /api/revision  {"word", "src", "answer"[, "version"]}   409 si la carte a changé
+      GET  /api/sante
+      GET  /api/metriques[?format=prometheus]
+      POST /api/langue  {"texts": [...]}       détection par lot
+    """
+
+    def __init__(self, traducteur=None, max_concurrent=SERVER_MAX_CONCURRENT, cors_origin='*'):
+        self.traducteur = traducteur or TraducteurPro(max_workers=4 * max_concurrent, verbose=False)
+        self.max_concurrent = max_concurrent
+        self.cors_origin = cors_origin
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='api')
+        self._semaphore = None
+        self._inflight = {}
+        self.routes = {
+            ('GET', '/api/mot'): self.api_mot,
+            ('GET', '/api/mot/flux'): self.api_mot_flux,
+            ('GET', '/api/phrase'): self.api_phrase,
+            ('GET', '/api/dictionnaire'): self.api_dictionnaire,
+            ('GET', '/api/recherche'): self.api_recherche,
+            ('GET', '/api/revision'): self.api_revision,
+            ('POST', '/api/revision'): self.api_revision_reponse,
+            ('GET', '/api/sante'): self.api_sante,
+            ('GET', '/api/metriques'): self.api_metriques,
+            ('POST', '/api/langue'): self.api_langue,
+        }
+
+    # ── Exécution bornée et regroupement des requêtes identiques ──
+
+    async def _run(self, func, *args):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _run_as(self, user, func, *args):
+        """Comme _run, l'historique de `user` restant ouvert pendant l'appel (history_store)."""
+        def call():
+            with history_store(user):
+                return func(*args)
+        return await self._run(call)
+
+    async def _coalesced(self, key, func, *args):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(func, *args))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    # ── Points d'entrée ──
+
+    @staticmethod
+    def _param(query, name, default=None, required=False):
+        value = query.get(name, [default])[0]
+        if required and not value:
+            raise HTTPError(400, f"paramètre « {name} » manquant")
+        return value
+
+    @staticmethod
+    def _limit(query, default):
+        value = query.get('limite', [None])[0]
+        if value is None:
+            return default
+        try:
+            limit = int(value)
+        except ValueError:
+            raise HTTPError(400, "paramètre « limite » invalide (entier attendu)")
+        if limit < 1:
+            raise HTTPError(400, "paramètre « limite » invalide (au moins 1)")
+        return min(limit, SERVER_MAX_LIMIT)
+
+    @staticmethod
+    def _direction(query):
+        src = query.get('src', ['de'])[0]
+        tgt = query.get('tgt', ['fr' if src == 'de' else 'de'])[0]
+        if src not in LANG_MAP or tgt not in LANG_MAP or src == tgt:
+            raise HTTPError(400, "direction invalide (src/tgt : de ou fr)")
+        return src, tgt
+
+    @staticmethod
+    def _user(query):
+        user = query.get('utilisateur', [None])[0] or None
+        if user is not None and not USER_NAME.match(user):
+            raise HTTPError(400, "nom d'utilisateur invalide")
+        return user
+
+    async def api_mot(self, query, body):
+        word = self._param(query, 'q', required=True).strip()
+        src, tgt = self._direction(query)
+        synonyms = self._param(query, 'synonymes', '1') != '0'
+        enrich = self._param(query, 'enrichir', '1') != '0'
+        sections = self._param(query, 'sections')
+        if sections is not None:
+            sections = tuple(sorted(name for name in sections.split(',') if name))
+            unknown = set(sections) - set(TraducteurPro.SECTIONS)
+            if unknown:
+                raise HTTPError(400, f"sections inconnues : {', '.join(sorted(unknown))} "
+                                     f"(possibles : {', '.join(TraducteurPro.SECTIONS)})")
+        user = self._user(query)
+        result = await self._coalesced(('mot', word, src, tgt, synonyms, enrich, sections),
+                                       self.traducteur.traduire_mot, word, src, tgt, synonyms, enrich, sections)
+        if self._param(query, 'historique') == '1':
+            await self._run_as(user, add_to_history, word, result, user)
+        return result
+
+    async def api_mot_flux(self, query, body):
+        word = self._param(query, 'q', required=True).strip()
+        src, tgt = self._direction(query)
+        synonyms = self._param(query, 'synonymes', '1') != '0'
+        history = self._param(query, 'historique') == '1'
+        user = self._user(query)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        closed = threading.Event()
+
+        def send(event):
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        def produce():
+            # Thread du pool : le JSON est sérialisé ici, pas dans la boucle
+            try:
+                for step, sections, result in self.traducteur.traduire_mot_flux(word, src, tgt, synonyms):
+                    if closed.is_set():
+                        return
+                    send((step, json.dumps(self._etape(step, sections, result), ensure_ascii=False)))
+                if history:
+                    with history_store(user):
+                        add_to_history(word, result, user)
+            except Exception as e:
+                send(('erreur', json.dumps({'error': str(e)}, ensure_ascii=False)))
+            finally:
+                send(None)
+
+        async def events():
+            asyncio.ensure_future(self._run(produce))
+            try:
+                while True:
+                    event = await queue.get()
+                    if event is None:
+                        break
+                    yield event
+            finally:
+                # Client parti : le producteur s'arrête à l'étape suivante
+                closed.set()
+        return events()
+
+    @staticmethod
+    def _etape(step, sections, result):
+        if step == 'fin':
+            return result
+        payload = {name: result[name] for name in sections}
+        if step == 'principal':
+            payload.update({name: result[name] for name in
+                            ('word', 'lemma', 'main_translation', 'src', 'tgt', 'offline')})
+        return payload
+
+    async def api_phrase(self, query, body):
+        sentence = self._param(query, 'q', required=True).strip()
+        src, tgt = self._direction(query) if 'src' in query else (None, None)
+        return await self._coalesced(
+            ('phrase', sentence, src, tgt),
+            lambda: self.traducteur.traduire_phrase(sentence, src, tgt, interactive=False))
+
+    async def api_dictionnaire(self, query, body):
+        text = self._param(query, 'q', required=True)
+        src, tgt = self._direction(query)
+        limit = self._limit(query, 20)
+        dictionary = self.traducteur.dictionnaire(src, tgt)
+        if dictionary is None:
+            raise HTTPError(404, f"aucun dictionnaire hors ligne {src} → {tgt}")
+        return {'query': text, 'words': dictionary.prefix(text, limit)}
+
+    async def api_recherche(self, query, body):
+        text = self._param(query, 'q', required=True)
+        limit = self._limit(query, 30)
+        user = self._user(query)
+
+        def search():
+            ranked = get_search_index(user).search(text, limit)
+            entries = get_history_store(user).get_many(entry_id for entry_id, _ in ranked)
+            return {'query': text, 'results': entries}
+        return await self._run_as(user, search)
+
+    async def api_revision(self, query, body):
+        limit = self._limit(query, 15)
+        user = self._user(query)
+
+        def due():
+            store = get_history_store(user)
+            return {'cards': store.due(int(time.time()), limit) or store.weakest(min(limit, 10))}
+        return await self._run_as(user, due)
+
+    async def api_revision_reponse(self, query, body):
+        try:
+            word, src, answer = body['word'], body['src'], body['answer']
+        except (TypeError, KeyError):
+            raise HTTPError(400, "corps attendu : {\"word\", \"src\", \"answer\"}")
+        version = body.get('version')
+        user = self._user(query)
+
+        def review():
+            store = get_history_store(user)
+            with store.transaction():
+                entry = store.get(word, src)
+                if entry is None:
+                    raise HTTPError(404, f"« {word} » absent de l'historique")
+                if version is not None and version != entry['version']:
+                    raise HTTPError(409, f"« {word} » a été modifié depuis sa lecture "
+                                         f"(version {entry['version']})")
+                is_correct = check_answer(entry, answer)
+                apply_review(entry, is_correct, int(time.time()))
+                store.upsert(entry)
+            return {'correct': is_correct, 'entry': entry}
+        return await self._run_as(user, review)
+
+    async def api_sante(self, query, body):
+        return {'status': 'ok', 'inflight': len(self._inflight),
+                'cache': self.traducteur.cache.stats()}
+
+    async def api_langue(self, query, body):
+        texts = body.get('texts') if isinstance(body, dict) else None
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise HTTPError(400, "corps attendu : {\"texts\": [\"...\", ...]}")
+        results = await self._run(detect_languages, texts)
+        return {'results': [{'src': src, 'tgt': tgt, 'confidence': round(confidence, 4)}
+                            for src, tgt, confidence in results]}
+
+    async def api_metriques(self, query, body):
+        return self.traducteur.metriques(self._param(query, 'format', 'json'))
+
+    # ── Protocole HTTP/1.1 minimal ──
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "ligne de requête invalide")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get('content-length') or '0'
+        # Chiffres ASCII seulement : int() accepterait « +5 », « 1_0 » ou « -1 »
+        if not re.fullmatch(r'[0-9]+', length):
+            raise HTTPError(400, "en-tête Content-Length invalide")
+        length = int(length)
+        if length > SERVER_MAX_BODY:
+            raise HTTPError(413, "requête trop volumineuse")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, version, headers, body
+
+    def _cors_headers(self):
+        if not self.cors_origin:
+            return []
+        return [f"Access-Control-Allow-Origin: {self.cors_origin}",
+                "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+                "Access-Control-Allow-Headers: Content-Type"]
+
+    def _response(self, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+        head = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        head += self._cors_headers()
+        return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+    async def _stream(self, writer, events, keep_alive):
+        """Envoie des (événement, json) en Server-Sent Events, par blocs (chunked)."""
+        head = [
+            f"HTTP/1.1 200 {HTTP_REASONS[200]}",
+            "Content-Type: text/event-stream; charset=utf-8",
+            "Cache-Control: no-cache",
+            "Transfer-Encoding: chunked",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ] + self._cors_headers()
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        try:
+            async for name, data in events:
+                chunk = f"event: {name}\ndata: {data}\n\n".encode('utf-8')
+                writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                await writer.drain()
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        finally:
+            await events.aclose()
+
+    async def _dispatch(self, method, target, body):
+        if method == 'OPTIONS':
+            return 204, None
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                raise HTTPError(405, "méthode non autorisée")
+            raise HTTPError(404, "route inconnue")
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            raise HTTPError(400, "JSON invalide")
+        return 200, await handler(parse_qs(url.query), payload)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    keep_alive = (headers.get('connection', '').lower() != 'close'
+                                  and version != 'HTTP/1.0')
+                    status, payload = await self._dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': e.message}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                if hasattr(payload, '__aiter__'):
+                    try:
+                        await self._stream(writer, payload, keep_alive)
+                    except ConnectionError:
+                        break
+                else:
+                    writer.write(self._response(status, payload, keep_alive))
+                    await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        print(f"  {Fore.GREEN}🌐 API Traducteur Pro sur http://{host}:{port}/api/ "
+              f"{Fore.WHITE}(Ctrl+C pour arrêter){Style.RESET_ALL}")
+        async with server:
+            await server.serve_forever()
+
+
+def server_mode(host, port, max_concurrent=SERVER_MAX_CONCURRENT):
+    """Point d'entrée du mode serveur (--serveur)."""
+    try:
+        asyncio.run(APIServer(max_concurrent=max_concurrent).serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    return 0
 
 
 # ─────────────────────────────────────────────────────────────
 # Boucle principale
 # ─────────────────────────────────────────────────────────────
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Traducteur Pro — Allemand ⇄ Français")
+    parser.add_argument('--fichier', help="traduire un fichier .txt/.md en flux (mode non interactif)")
+    parser.add_argument('--importer', metavar='FICHIER',
+                        help="importer une liste de mots (CSV/TSV ou un mot par ligne) dans l'historique")
+    parser.add_argument('--exporter', choices=sorted(EXPORT_FORMATS), metavar='FORMAT',
+                        help="exporter le vocabulaire : txt, csv, anki ou jsonl")
+    parser.add_argument('--incrementiel', action='store_true',
+                        help="export : seulement les mots modifiés depuis le dernier export")
+    parser.add_argument('--dictionnaire', metavar='FICHIER',
+                        help="indexer un dictionnaire FreeDict (.tei) ou TSV pour la traduction hors ligne")
+    parser.add_argument('--sortie', help="fichier de sortie (défaut : <nom>.<cible><ext>)")
+    parser.add_argument('--source', choices=sorted(LANG_MAP), help="langue source (défaut : détection)")
+    parser.add_argument('--cible', choices=sorted(LANG_MAP), help="langue cible")
+    parser.add_argument('--workers', type=int,
+                        help=f"traductions en parallèle (défaut : {DOCUMENT_WORKERS} pour --fichier, "
+                             f"{IMPORT_WORKERS} pour --importer)")
+    parser.add_argument('--recommencer', action='store_true',
+                        help="ignorer le point de reprise et tout retraduire (import : y compris les mots connus)")
+    parser.add_argument('--utilisateur', default=_current_user,
+                        help="historique de cet utilisateur (défaut : $TRADUCTEUR_UTILISATEUR ou partagé)")
+    parser.add_argument('--serveur', action='store_true', help="lancer l'API HTTP JSON")
+    parser.add_argument('--hote', default='127.0.0.1', help="adresse d'écoute du serveur")
+    parser.add_argument('--port', type=int, default=8000, help="port du serveur (défaut : 8000)")
+    parser.add_argument('--concurrence', type=int, default=SERVER_MAX_CONCURRENT,
+                        help=f"recherches simultanées max vers les sources (défaut : {SERVER_MAX_CONCURRENT})")
+    return parser.parse_args(argv)
+
+
 def main():
+    args = parse_args()
+    try:
+        use_user(args.utilisateur)
+    except ValueError as e:
+        print(f"  {Fore.RED}❌ {e}{Style.RESET_ALL}")
+        sys.exit(2)
+    if args.serveur:
+        sys.exit(server_mode(args.hote, args.port, max(1, args.concurrence)))
+    if args.fichier:
+        sys.exit(document_mode(args.fichier, args.sortie, args.source, args.cible,
+                               workers=max(1, args.workers or DOCUMENT_WORKERS), resume=not args.recommencer))
+    if args.exporter:
+        output = args.sortie or SCRIPT_DIR / (f"export_vocabulaire_{datetime.now().strftime('%Y%m%d_%H%M')}"
+                                              f"{EXPORT_FORMATS[args.exporter][1]}")
+        summary = export_vocabulary(output, args.exporter, args.incrementiel)
+        print(f"  {Fore.GREEN}✅ {summary['entries']} mot(s) exporté(s) vers : "
+              f"{Fore.WHITE}{summary['path']}{Style.RESET_ALL}")
+        sys.exit(0)
+    if args.dictionnaire:
+        try:
+            src, tgt, count = install_dictionary(args.dictionnaire, args.source, args.cible)
+        except (OSError, ValueError, ElementTree.ParseError) as e:
+            print(f"  {Fore.RED}❌ {e}{Style.RESET_ALL}")
+            sys.exit(1)
+        print(f"  {Fore.GREEN}✅ {count} entrée(s) indexée(s) : {LANG_MAP[src]['name']} → "
+              f"{LANG_MAP[tgt]['name']} ({dictionary_path(src, tgt)}){Style.RESET_ALL}")
+        sys.exit(0)
+    if args.importer:
+        sys.exit(import_mode(args.importer, args.source, args.cible,
+                             workers=max(1, args.workers or IMPORT_WORKERS), resume=not args.recommencer))
+
     traducteur = TraducteurPro()
     clear_screen()
     print_header()
@@ -897,8 +4535,7 @@ def main():
             if not word:
                 continue
             print()
-            result = traducteur.traduire_mot(word, src, tgt)
-            display_word_result(result)
+            result = display_word_progressive(traducteur.traduire_mot_flux(word, src, tgt))
             add_to_history(word, result)
             print(f"  {Fore.GREEN}💾 Sauvegardé dans l'historique.{Style.RESET_ALL}")
 